@@ -10,6 +10,76 @@ class Settings(BaseSettings):
     database_url: str = "sqlite:///./intelliplan.db"
     openai_api_key: str | None = None
 
+    # Responses smaller than this (bytes) are sent uncompressed
+    compression_min_size: int = 1024
+
+    # Request/SQL/service timing exported on /metrics (off: no hooks installed)
+    metrics_enabled: bool = False
+    metrics_multiproc_dir: str | None = None  # shared by workers; /metrics sums them
+
+    # Worker processes (gunicorn.conf.py). With more than one, run
+    # `python -m backend.prestart` once first and set PRESTART_IN_LIFESPAN=false
+    web_concurrency: int = 1
+    prestart_in_lifespan: bool = True
+
+    # Admin-only per-request profiling (X-Profile: 1 or ?profile=1)
+    profiling_enabled: bool = False
+    profile_sample_rate: int = 200  # stack samples per second
+    profile_dir: str = "profiles"
+    profile_max_concurrent: int = 2
+
+    # Run action plans on the parallel DAG executor (worth it once actions do real I/O)
+    coordinator_parallel: bool = False
+    coordinator_max_workers: int = 4
+    # Queue plan execution for `python -m backend.worker` (POST /coordinate returns 202)
+    coordinator_queue: bool = False
+
+    # Outbox dispatcher thread (notifications, outbound email/webhooks)
+    outbox_dispatcher_enabled: bool = True
+    outbox_interval_s: float = 1.0  # poll interval; publishing commits also wake it
+    outbox_batch_size: int = 200
+    outbox_delivery: str = "stub"  # outbound adapter, see DELIVERY_ADAPTERS
+
+    # Login sessions: memory (single process), database (shared) or redis
+    session_backend: str = "database"
+    session_ttl_s: int = 8 * 3600  # sliding: extended when used after half of it
+    session_cache_ttl_s: float = 10.0  # per-process token -> user cache
+    session_max_entries: int = 10_000
+    session_invalidation_sync_s: float = 1.0  # other workers' logouts and role changes reach the cache within this
+    redis_url: str = "redis://localhost:6379/0"
+
+    # Access tokens: "session" (opaque, looked up in the session store) or
+    # "signed" (HMAC-signed claims + refresh tokens, no lookup per request)
+    auth_tokens: str = "session"
+    token_secret: str | None = None  # required for signed tokens across workers/restarts
+    access_token_ttl_s: int = 900
+    token_revocation_sync_s: float = 5.0
+
+    # Compliance rules are compiled from the compliance_rules table; other
+    # workers' edits are picked up within this many seconds
+    compliance_rules_sync_s: float = 5.0
+    # check_request results are cached per request, contract, pool and rule
+    # set; the TTL bounds staleness from other workers' consultant edits
+    compliance_cache_size: int = 1024
+    compliance_cache_ttl_s: float = 30.0
+    # Other workers' consultant changes reach this process's pool snapshot
+    # within this many seconds
+    consultant_pool_sync_s: float = 5.0
+    # Directory (ideally on tmpfs, e.g. /dev/shm/intelliplan) where one worker
+    # publishes the columnar consultant pool for all workers to memory-map;
+    # unset: each process builds its own copy
+    shared_pool_dir: str | None = None
+    # Candidate ranking (see backend/services/ranking.py): assessments keep
+    # the best RANKING_TOP_K; the weights need not sum to 1
+    ranking_top_k: int = 20
+    ranking_weight_skills: float = 0.5
+    ranking_weight_rate: float = 0.2
+    ranking_weight_availability: float = 0.2
+    ranking_weight_category: float = 0.1
+    # Weekly-hours buckets are rebuilt from the assignments table this often
+    # (this process's own commits are applied immediately)
+    workload_resync_s: float = 60.0
+
     class Config:
         env_file = ".env"
 
@@ -1,6 +1,8 @@
 """Database setup and session management."""
 
-from sqlalchemy import create_engine
+import json
+
+from sqlalchemy import create_engine, func, inspect, select, text
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from backend.config import settings
@@ -27,3 +29,46 @@ def get_db():
 def init_db():
     """Create all tables."""
     Base.metadata.create_all(bind=engine)
+    _add_missing_columns()
+    _repair_json_text()
+
+
+def _add_missing_columns():
+    """create_all() never alters existing tables — add nullable columns introduced since."""
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                ddl = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN "{column.name}" {ddl}'))
+
+
+def _repair_json_text(bind=engine):
+    """Re-encode JSONText rows written before the column type enforced well-formed JSON."""
+    from backend.models import JSONText
+
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            pk = list(table.primary_key.columns)
+            for column in table.columns:
+                if not isinstance(column.type, JSONText) or len(pk) != 1:
+                    continue
+                query = select(pk[0], column).where(column.is_not(None))
+                if bind.dialect.name == "sqlite":
+                    query = query.where(~func.json_valid(column))
+                rows = conn.execute(query).all()
+                for key, value in rows:
+                    if not _is_json(value):
+                        # The bind processor coerces the stored text into valid JSON.
+                        conn.execute(table.update().where(pk[0] == key).values({column.name: value}))
+
+
+def _is_json(value):
+    try:
+        json.loads(value)
+    except ValueError:
+        return False
+    return True
@@ -7,25 +7,45 @@ Main FastAPI application with static file serving.
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
-
-from backend.database import init_db, SessionLocal
-from backend.routers import requests, customers, dashboard, auth, notifications
+import orjson
+from fastapi import FastAPI, Request, Response
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
+
+from backend.startup import startup_report  # first, so the import phase is timed from here
+from backend.config import settings
+from backend.database import engine, init_db, SessionLocal
+from backend.metrics import MetricsMiddleware, instrument_engine, start_dumping as start_metrics_dump
+from backend.middleware import CompressionMiddleware
+from backend.profiling import ProfilingMiddleware, instrument_engine as instrument_profiler, instrument_threads
+from backend.responses import ORJSONResponse
+from backend.routers import requests, customers, dashboard, auth, notifications, sync, metrics, jobs, health
 from backend.seed_data import seed_database
+from backend.services.outbox import outbox
+from backend.static_assets import StaticAssets
+from backend import warmup
+from backend.warmup import warmup_task
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Initialize database and seed data on startup."""
-    init_db()
-    db = SessionLocal()
-    try:
-        seed_database(db)
-    finally:
-        db.close()
+    """Initialize database, seed data and start the outbox dispatcher, then warm caches in the background."""
+    if settings.prestart_in_lifespan:  # multi-worker deployments run `python -m backend.prestart` instead
+        with startup_report.phase("init_db"):
+            init_db()
+        with startup_report.phase("seed"):
+            db = SessionLocal()
+            try:
+                seed_database(db)
+            finally:
+                db.close()
+    if settings.metrics_enabled and settings.metrics_multiproc_dir:
+        start_metrics_dump(settings.metrics_multiproc_dir)
+    if settings.outbox_dispatcher_enabled:
+        with startup_report.phase("outbox"):
+            outbox.start(settings.outbox_interval_s, settings.outbox_batch_size)
+    warmup.start()  # /readyz turns 200 once this is done
     yield
+    outbox.stop()
 
 
 app = FastAPI(
@@ -33,8 +53,29 @@ app = FastAPI(
     description="AI-Powered Staffing Operations Platform — captures customer needs, assesses feasibility, coordinates actions, and guides decisions.",
     version="2.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+    # Served below from a document generated once at startup
+    openapi_url=None,
+    docs_url=None,
+    redoc_url=None,
 )
 
+app.add_middleware(CompressionMiddleware, minimum_size=settings.compression_min_size)
+
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(engine)
+
+if settings.profiling_enabled:
+    app.add_middleware(
+        ProfilingMiddleware,
+        directory=settings.profile_dir,
+        sample_rate=settings.profile_sample_rate,
+        max_concurrent=settings.profile_max_concurrent,
+    )
+    instrument_profiler(engine)
+    instrument_threads()
+
 # ── Routers ────────────────────────────────────────
 
 app.include_router(auth.router)
@@ -42,30 +83,69 @@ app.include_router(notifications.router)
 app.include_router(requests.router)
 app.include_router(customers.router)
 app.include_router(dashboard.router)
+app.include_router(sync.router)
+app.include_router(metrics.router)
+app.include_router(jobs.router)
+app.include_router(health.router)
+
+# ── API Docs ───────────────────────────────────────
+
+_openapi_body: bytes | None = None
+
+
+@warmup_task("openapi")
+def openapi_document() -> bytes:
+    """The OpenAPI schema, generated and serialized once per process."""
+    global _openapi_body
+    if _openapi_body is None:
+        _openapi_body = orjson.dumps(app.openapi())
+    return _openapi_body
+
+
+@app.get("/openapi.json", include_in_schema=False)
+async def serve_openapi():
+    return Response(openapi_document(), media_type="application/json")
+
+
+@app.get("/docs", include_in_schema=False)
+async def serve_docs():
+    return get_swagger_ui_html(openapi_url="/openapi.json", title=f"{app.title} - Swagger UI")
+
+
+@app.get("/redoc", include_in_schema=False)
+async def serve_redoc():
+    return get_redoc_html(openapi_url="/openapi.json", title=f"{app.title} - ReDoc")
 
 # ── Static Files ───────────────────────────────────
 
 FRONTEND_DIR = Path(__file__).parent.parent / "frontend"
 
-app.mount("/static", StaticFiles(directory=FRONTEND_DIR), name="static")
+static_assets = StaticAssets(FRONTEND_DIR)
+warmup_task("static_assets")(static_assets.build)
+
+
+@app.api_route("/static/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+async def serve_static(path: str, request: Request):
+    """Serve precompressed frontend assets (fingerprinted URLs are immutable)."""
+    return static_assets.response(request, path)
 
 
 @app.get("/")
-async def serve_index():
+async def serve_index(request: Request):
     """Serve the main frontend."""
-    return FileResponse(FRONTEND_DIR / "index.html")
+    return static_assets.index_response(request)
 
 
 @app.get("/login")
-async def serve_login():
-    return FileResponse(FRONTEND_DIR / "index.html")
+async def serve_login(request: Request):
+    return static_assets.index_response(request)
 
 
 @app.get("/dashboard")
-async def serve_dashboard():
-    return FileResponse(FRONTEND_DIR / "index.html")
+async def serve_dashboard(request: Request):
+    return static_assets.index_response(request)
 
 
 @app.get("/portal")
-async def serve_portal():
-    return FileResponse(FRONTEND_DIR / "index.html")
+async def serve_portal(request: Request):
+    return static_assets.index_response(request)
@@ -0,0 +1,324 @@
+"""
+Lightweight in-process metrics with Prometheus text export.
+
+Counters and histograms live in a module-level registry and are rendered on
+``/metrics``. Request timing middleware and SQLAlchemy query hooks are only
+installed when ``settings.metrics_enabled`` is set, and ``timed`` is a no-op
+otherwise, so a deployment that is not scraped pays almost nothing.
+
+With several worker processes, set ``METRICS_MULTIPROC_DIR``: each worker
+dumps its values there every few seconds, and whichever worker answers
+``/metrics`` serves the sum over all of them. A worker's dump is removed when
+it exits (gunicorn's ``child_exit`` hook), and dumps of processes that are no
+longer alive are skipped and deleted when merging, so recycled workers drop
+out of the totals (Prometheus sees a counter reset) and the directory does not
+grow.
+"""
+
+import bisect
+import json
+import os
+import threading
+import time
+from contextlib import ContextDecorator
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.config import settings
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: tuple, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels."""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(labels.get(n, "") for n in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(tuple(labels.get(n, "") for n in self.labelnames), 0)
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+    def merge(self, snapshot: list) -> None:
+        for key, value in snapshot:
+            key = tuple(key)
+            self._values[key] = self._values.get(key, 0) + value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value:g}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram, optionally split by labels."""
+
+    def __init__(self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._series: dict[tuple, list] = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(labels.get(n, "") for n in self.labelnames)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 2)
+            if idx < len(self.buckets):
+                series[idx] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def count(self, **labels) -> int:
+        series = self._series.get(tuple(labels.get(n, "") for n in self.labelnames))
+        return series[-1] if series else 0
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return [[list(key), list(series)] for key, series in self._series.items()]
+
+    def merge(self, snapshot: list) -> None:
+        for key, series in snapshot:
+            key = tuple(key)
+            mine = self._series.get(key)
+            if mine is None:
+                self._series[key] = list(series)
+            else:
+                for i, n in enumerate(series):
+                    mine[i] += n
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, series in sorted(self._series.items()):
+            labels = _format_labels(self.labelnames, key)
+            cumulative = 0
+            for bound, n in zip(self.buckets, series):
+                cumulative += n
+                le = 'le="%g"' % bound
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            inf = _format_labels(self.labelnames, key, 'le="+Inf"')
+            lines.append(f"{self.name}_bucket{inf} {series[-1]}")
+            lines.append(f"{self.name}_sum{labels} {series[-2]:.6f}")
+            lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+class Registry:
+    """Holds every metric and renders them in Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: dict[str, Counter | Histogram] = {}
+
+    def counter(self, name: str, help: str, labelnames: tuple[str, ...] = ()) -> Counter:
+        return self._metrics.setdefault(name, Counter(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: tuple[str, ...] = (), buckets: tuple = LATENCY_BUCKETS) -> Histogram:
+        return self._metrics.setdefault(name, Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def dump(self, directory: str) -> None:
+        """Write this process's raw values to ``<directory>/<pid>.json`` (atomically)."""
+        path = Path(directory) / f"{os.getpid()}.json"
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({name: m.snapshot() for name, m in self._metrics.items()}), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def render_merged(self, directory: str) -> str:
+        """Render the sum of every worker's dump plus this process's live values."""
+        merged = Registry()
+        for name, metric in self._metrics.items():
+            if isinstance(metric, Counter):
+                merged.counter(name, metric.help, metric.labelnames)
+            else:
+                merged.histogram(name, metric.help, metric.labelnames, metric.buckets)
+        own = f"{os.getpid()}.json"
+        snapshots = [{name: m.snapshot() for name, m in self._metrics.items()}]
+        for file in Path(directory).glob("*.json"):
+            if file.name != own:
+                if file.stem.isdigit() and not _alive(int(file.stem)):
+                    remove_dump(directory, int(file.stem))
+                    continue
+                try:
+                    snapshots.append(json.loads(file.read_text(encoding="utf-8")))
+                except (OSError, ValueError):
+                    continue  # being replaced right now; picked up next scrape
+        for snapshot in snapshots:
+            for name, values in snapshot.items():
+                if name in merged._metrics:
+                    merged._metrics[name].merge(values)
+        return merged.render()
+
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # exists, owned by someone else
+    return True
+
+
+def remove_dump(directory: str, pid: int) -> None:
+    """Delete a (dead) worker's dump so its values leave the merged totals."""
+    for suffix in (".json", ".tmp"):
+        (Path(directory) / f"{pid}{suffix}").unlink(missing_ok=True)
+
+
+def start_dumping(directory: str, interval_s: float = 5.0) -> None:
+    """Periodically dump this worker's metrics so any worker can serve the merged /metrics."""
+    Path(directory).mkdir(parents=True, exist_ok=True)
+
+    def loop():
+        while True:
+            registry.dump(directory)
+            time.sleep(interval_s)
+
+    threading.Thread(target=loop, name="metrics-dump", daemon=True).start()
+
+
+registry = Registry()
+
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status"),
+)
+http_request_queries = registry.histogram(
+    "http_request_db_queries", "SQL statements issued per HTTP request", ("route",), buckets=COUNT_BUCKETS,
+)
+http_request_db_time = registry.histogram(
+    "http_request_db_seconds", "Time spent in SQL per HTTP request", ("route",),
+)
+db_query_duration = registry.histogram(
+    "db_query_duration_seconds", "Latency of individual SQL statements",
+)
+service_duration = registry.histogram(
+    "service_operation_duration_seconds", "Latency of service-layer operations", ("operation",),
+)
+cache_lookups = registry.counter(
+    "cache_lookups_total", "Lookups in in-process result caches", ("cache", "result"),
+)
+
+
+# ── Per-request accounting ─────────────────────────────
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+# Shared by reference with threadpool workers (contexts are copied, not the object)
+current_request: ContextVar[RequestStats | None] = ContextVar("current_request", default=None)
+
+
+class timed(ContextDecorator):
+    """Time a block or function into ``service_operation_duration_seconds``."""
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self._start = None
+
+    def _recreate_cm(self):
+        # Fresh instance per call so decorated methods are thread-safe
+        return timed(self.operation)
+
+    def __enter__(self):
+        if settings.metrics_enabled:
+            self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        if self._start is not None:
+            service_duration.observe(time.perf_counter() - self._start, operation=self.operation)
+        return False
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency and per-request SQL usage."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            current_request.reset(token)
+            # The router stores the matched route in the scope
+            route = getattr(scope.get("route"), "path", "unmatched")
+            http_request_duration.observe(elapsed, method=scope["method"], route=route, status=status)
+            http_request_queries.observe(stats.queries, route=route)
+            http_request_db_time.observe(stats.db_seconds, route=route)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Count and time every SQL statement issued through ``engine``."""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        context._query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_start
+        db_query_duration.observe(elapsed)
+        stats = current_request.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
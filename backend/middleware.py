@@ -0,0 +1,166 @@
+"""ASGI middleware for the Intelliplan app."""
+
+import gzip
+import io
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:  # optional dependency
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+
+def _quality(params: list[str]) -> float:
+    """The ``q`` parameter of an Accept-Encoding entry (1 when absent, 0 when malformed)."""
+    for param in params:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return min(max(float(value), 0.0), 1.0)
+            except ValueError:
+                return 0.0
+    return 1.0
+
+
+def accepted_encoding(accept_encoding: str) -> str | None:
+    """
+    Pick the best encoding we support from an Accept-Encoding header.
+
+    Honors q-values (RFC 9110 12.5.3): ``q=0`` rules an encoding out, ``*``
+    covers encodings not listed, and brotli wins ties with gzip.
+    """
+    offered: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, *params = part.split(";")
+        name = name.strip().lower()
+        if name:
+            offered[name] = _quality(params)
+    wildcard = offered.get("*", 0.0)
+    supported = ("br", "gzip") if brotli is not None else ("gzip",)
+    best, best_q = None, 0.0
+    for encoding in supported:
+        q = offered.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with brotli (when installed) or gzip.
+
+    Bodies below ``minimum_size``, non-text content and responses that already
+    carry a Content-Encoding (precompressed static assets) pass through as-is.
+    Dynamic responses use fast compression levels; static assets are
+    precompressed at maximum level once at startup instead.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = accepted_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressionResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    def __init__(self, config: CompressionMiddleware, encoding: str, send: Send) -> None:
+        self.config = config
+        self.encoding = encoding
+        self._send = send
+        self.initial_message: Message = {}
+        self.started = False
+        self.passthrough = False
+        self.buffer = io.BytesIO()
+        self.compressor = None
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Hold the headers back until we know whether to compress
+            self.initial_message = message
+            headers = Headers(raw=message["headers"])
+            content_type = headers.get("content-type", "")
+            self.passthrough = (
+                "content-encoding" in headers
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+            )
+            return
+
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.passthrough:
+            if not self.started:
+                self.started = True
+                await self._send(self.initial_message)
+            await self._send(message)
+            return
+
+        if not self.started:
+            self.started = True
+            if not more_body and len(body) < self.config.minimum_size:
+                await self._send(self.initial_message)
+                await self._send(message)
+                self.passthrough = True
+                return
+
+            headers = MutableHeaders(raw=self.initial_message["headers"])
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if not more_body:
+                message["body"] = self._compress_all(body)
+                headers["Content-Length"] = str(len(message["body"]))
+                await self._send(self.initial_message)
+                await self._send(message)
+                return
+
+            # Streaming response: compress chunk by chunk
+            del headers["Content-Length"]
+            self._start_stream()
+            await self._send(self.initial_message)
+
+        message["body"] = self._compress_chunk(body, final=not more_body)
+        await self._send(message)
+
+    def _compress_all(self, body: bytes) -> bytes:
+        if self.encoding == "br":
+            return brotli.compress(body, quality=self.config.brotli_quality)
+        return gzip.compress(body, compresslevel=self.config.gzip_level)
+
+    def _start_stream(self) -> None:
+        if self.encoding == "br":
+            self.compressor = brotli.Compressor(quality=self.config.brotli_quality)
+        else:
+            self.compressor = gzip.GzipFile(mode="wb", fileobj=self.buffer, compresslevel=self.config.gzip_level)
+
+    def _compress_chunk(self, body: bytes, final: bool) -> bytes:
+        if self.encoding == "br":
+            out = self.compressor.process(body)
+            return out + (self.compressor.finish() if final else self.compressor.flush())
+        self.compressor.write(body)
+        if final:
+            self.compressor.close()
+        else:
+            self.compressor.flush()
+        out = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return out
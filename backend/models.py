@@ -3,6 +3,7 @@
 from datetime import datetime, timezone
 import enum
 import hashlib
+import json
 import uuid
 
 from sqlalchemy import (
@@ -12,9 +13,11 @@ from sqlalchemy import (
     Enum,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    TypeDecorator,
 )
 from sqlalchemy.orm import relationship
 
@@ -29,6 +32,35 @@ def _uuid():
     return str(uuid.uuid4())
 
 
+class JSONText(TypeDecorator):
+    """
+    Text column that only ever stores well-formed JSON.
+
+    Values are normally written pre-encoded with ``json.dumps``; anything else
+    is encoded on the way in, and a string that does not parse is stored as a
+    JSON string (or, with ``wrap_invalid``, as a one-element list). Readers can
+    therefore splice the stored text into a response without parsing it.
+    """
+
+    impl = Text
+    cache_ok = True
+
+    def __init__(self, wrap_invalid: bool = False):
+        super().__init__()
+        self.wrap_invalid = wrap_invalid
+
+    def process_bind_param(self, value, dialect):
+        if value is None:
+            return None
+        if not isinstance(value, str):
+            return json.dumps(value)
+        try:
+            json.loads(value)
+        except ValueError:
+            return json.dumps([value] if self.wrap_invalid else value)
+        return value
+
+
 def hash_password(password: str) -> str:
     """Simple SHA-256 password hashing (demo-grade)."""
     return hashlib.sha256(password.encode()).hexdigest()
@@ -107,6 +139,37 @@ class User(Base):
     notifications = relationship("Notification", back_populates="user")
 
 
+class AuthSession(Base):
+    """Login session for the database session backend (tokens are stored hashed)."""
+
+    __tablename__ = "auth_sessions"
+
+    token_hash = Column(String(64), primary_key=True)  # sha256 hex of the bearer token
+    user_id = Column(String, ForeignKey("users.id"), nullable=False, index=True)
+    created_at = Column(DateTime, default=_utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
+class SessionInvalidation(Base):
+    """Cached session lookups every worker must drop: one logged-out token, or all of a user's."""
+
+    __tablename__ = "session_invalidations"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    token_hash = Column(String(64), nullable=True)
+    user_id = Column(String, nullable=True)
+    created_at = Column(DateTime, nullable=False, index=True)
+
+
+class RevokedToken(Base):
+    """Signed access token revoked before its expiry (kept until it would have expired)."""
+
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(32), primary_key=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+
 class Notification(Base):
     __tablename__ = "notifications"
 
@@ -151,6 +214,7 @@ class Consultant(Base):
     availability_date = Column(DateTime, nullable=True)
     current_customer_id = Column(String, ForeignKey("customers.id"), nullable=True)
     created_at = Column(DateTime, default=_utcnow)
+    updated_at = Column(DateTime, default=_utcnow, onupdate=_utcnow)
 
     assignments = relationship("Assignment", back_populates="consultant")
 
@@ -162,7 +226,7 @@ class StaffingRequest(Base):
     customer_id = Column(String, ForeignKey("customers.id"), nullable=False)
     title = Column(String(300), nullable=False)
     description = Column(Text, nullable=False)
-    required_skills = Column(Text)  # JSON-encoded list
+    required_skills = Column(JSONText(wrap_invalid=True))  # JSON-encoded list
     number_of_consultants = Column(Integer, default=1)
     start_date = Column(DateTime, nullable=True)
     end_date = Column(DateTime, nullable=True)
@@ -203,10 +267,11 @@ class FeasibilityAssessment(Base):
     timeline_score = Column(Float, default=0)
     compliance_score = Column(Float, default=0)
 
-    matching_consultants = Column(Text)  # JSON list of consultant IDs
-    risks = Column(Text)  # JSON list of risk strings
-    recommendations = Column(Text)  # JSON list
-    alternatives = Column(Text)  # JSON list of alternative suggestions
+    matching_consultants = Column(Text)  # JSON list of ranked matches (top K), or of consultant IDs (legacy)
+    matching_total = Column(Integer, nullable=True)  # all matching consultants, not just the stored top K
+    risks = Column(JSONText())  # JSON list of risk strings
+    recommendations = Column(JSONText())  # JSON list
+    alternatives = Column(JSONText())  # JSON list of alternative suggestions
 
     created_at = Column(DateTime, default=_utcnow)
 
@@ -224,6 +289,8 @@ class CoordinationAction(Base):
     assigned_to = Column(String(200), nullable=True)
     result = Column(Text, nullable=True)
     order = Column(Integer, default=0)
+    depends_on = Column(Text, nullable=True)  # JSON list of action IDs that must complete first
+    attempts = Column(Integer, nullable=True, default=0)
     created_at = Column(DateTime, default=_utcnow)
     completed_at = Column(DateTime, nullable=True)
 
@@ -253,6 +320,7 @@ class Assignment(Base):
     start_date = Column(DateTime, nullable=False)
     end_date = Column(DateTime, nullable=True)
     hourly_rate = Column(Float, nullable=False)
+    hours_per_week = Column(Float, nullable=True)  # None: full time (40h)
     status = Column(String(50), default="proposed")  # proposed, confirmed, active, ended
     created_at = Column(DateTime, default=_utcnow)
 
@@ -260,6 +328,56 @@ class Assignment(Base):
     consultant = relationship("Consultant", back_populates="assignments")
 
 
+class ChangeLog(Base):
+    """Append-only log of entity changes, used as the delta sync cursor."""
+
+    __tablename__ = "change_log"
+    __table_args__ = {"sqlite_autoincrement": True}  # never reuse sequence numbers
+
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    entity = Column(String(50), nullable=False)  # requests, assessments, assignments, timeline, notifications
+    entity_id = Column(String, nullable=False)
+    op = Column(String(20), nullable=False)  # upsert, delete
+    created_at = Column(DateTime, default=_utcnow)
+
+
+class Job(Base):
+    """Durable background job, claimed by ``python -m backend.worker`` processes under a lease."""
+
+    __tablename__ = "jobs"
+    __table_args__ = (Index("ix_jobs_claim", "status", "run_after"),)
+
+    id = Column(String, primary_key=True, default=_uuid)
+    kind = Column(String(100), nullable=False)  # e.g. "coordination.execute_plan"
+    payload = Column(Text, nullable=False, default="{}")  # JSON
+    status = Column(String(20), nullable=False, default="queued")  # queued, running, done, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=3)
+    run_after = Column(DateTime, nullable=False, default=_utcnow)  # not visible to workers before this
+    locked_by = Column(String(200), nullable=True)  # worker/claim holding the lease
+    locked_until = Column(DateTime, nullable=True)  # lease expiry; reclaimable after this
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=_utcnow)
+    finished_at = Column(DateTime, nullable=True)
+
+
+class OutboxEvent(Base):
+    """Side effect recorded in the same transaction as the change that caused it."""
+
+    __tablename__ = "outbox"
+    __table_args__ = (Index("ix_outbox_pending", "dispatched_at", "id"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=True)  # dispatch order
+    topic = Column(String(100), nullable=False)  # e.g. "notification"
+    payload = Column(Text, nullable=False)  # JSON
+    attempts = Column(Integer, nullable=False, default=0)
+    locked_by = Column(String(200), nullable=True)  # dispatcher holding the batch
+    locked_until = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=_utcnow)
+    dispatched_at = Column(DateTime, nullable=True)
+
+
 class ComplianceRule(Base):
     __tablename__ = "compliance_rules"
 
@@ -271,3 +389,4 @@ class ComplianceRule(Base):
     severity = Column(String(50), default="warning")  # "info", "warning", "blocking"
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=_utcnow)
+    updated_at = Column(DateTime, default=_utcnow, onupdate=_utcnow)
@@ -0,0 +1,65 @@
+"""
+One-shot startup step for multi-worker deployments.
+
+    python -m backend.prestart && gunicorn -c gunicorn.conf.py backend.main:app
+
+Creates/migrates the tables and seeds demo data once, before any worker
+starts, instead of every worker racing to do it in its lifespan. With
+``SHARED_POOL_DIR`` set it also publishes the first consultant pool
+generation. It refuses settings that only work in a single process.
+"""
+
+import logging
+import shutil
+import sys
+from pathlib import Path
+
+from backend.config import settings
+from backend.database import SessionLocal, init_db
+from backend.seed_data import seed_database
+from backend.services.shared_pool import shared_pool
+
+logger = logging.getLogger(__name__)
+
+
+def check_settings() -> list[str]:
+    """Settings that break once requests are spread over several worker processes."""
+    problems = []
+    if settings.web_concurrency > 1:
+        if settings.session_backend == "memory":
+            problems.append("SESSION_BACKEND=memory keeps sessions in one worker; use database or redis")
+        if settings.auth_tokens == "signed" and not settings.token_secret:
+            problems.append("AUTH_TOKENS=signed needs a shared TOKEN_SECRET, or each worker signs with its own key")
+        if settings.database_url.startswith("sqlite") and ":memory:" in settings.database_url:
+            problems.append("an in-memory SQLite database is private to each worker")
+    return problems
+
+
+def main() -> int:
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
+    problems = check_settings()
+    for problem in problems:
+        logger.error("WEB_CONCURRENCY=%d: %s", settings.web_concurrency, problem)
+    if problems:
+        return 1
+
+    init_db()
+    db = SessionLocal()
+    try:
+        seed_database(db)
+    finally:
+        db.close()
+
+    if settings.shared_pool_dir:
+        shared_pool.publish()  # workers attach to it instead of each building one
+
+    if settings.metrics_multiproc_dir:
+        # Dumps from the previous run's workers would be summed forever
+        shutil.rmtree(settings.metrics_multiproc_dir, ignore_errors=True)
+        Path(settings.metrics_multiproc_dir).mkdir(parents=True)
+    logger.info("Database ready for %d worker(s)", settings.web_concurrency)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+"""
+Opt-in, admin-only profiling of individual requests.
+
+With ``settings.profiling_enabled`` set, an admin can add ``X-Profile: 1`` (or
+``?profile=1``) to any request to run it under a stack sampler. Two files are
+written to ``settings.profile_dir``:
+
+- ``<id>.folded`` — collapsed stacks, one ``frame;frame;frame count`` line per
+  distinct stack, ready for ``flamegraph.pl`` or speedscope
+- ``<id>.json`` — request metadata plus every SQL statement issued and its timing
+
+The sampler only walks threads while they work for the profiled request: a
+threadpool worker from the moment it starts the request's sync endpoint or
+dependency until it returns, and the event loop thread only while it is running
+the request's own async endpoint — samples of other requests' tasks interleaved
+on the loop are counted as ``foreign_samples`` and left out of the stacks.
+Thread enrolment wraps FastAPI internals, so ``instrument_threads`` checks the
+installed FastAPI version first. At most ``settings.profile_max_concurrent`` requests are
+profiled at once; requests over the cap, or from non-admins, run unprofiled.
+"""
+
+import functools
+import json
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from urllib.parse import parse_qs
+
+import fastapi
+import fastapi.concurrency
+import fastapi.dependencies.utils
+import fastapi.routing
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.database import SessionLocal
+from backend.models import UserRole
+from backend.routers.auth import get_current_user
+
+# Innermost Python frames of a thread that is parked waiting for work
+_IDLE_FRAMES = {("selectors.py", "select"), ("threading.py", "wait"), ("queue.py", "get")}
+_MAX_DEPTH = 128
+# FastAPI releases whose routing internals match the wrappers in ``instrument_threads``
+_FASTAPI_VERSIONS = ("0.104.",)
+
+_active: ContextVar["RequestProfile | None"] = ContextVar("active_profile", default=None)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{frame.f_lineno})"
+
+
+def _collapse(thread_name: str, frame) -> tuple[str, bool]:
+    """Render a frame chain root-first; also report whether the thread is idle."""
+    leaf = frame.f_code
+    idle = (Path(leaf.co_filename).name, leaf.co_name) in _IDLE_FRAMES
+    labels = []
+    while frame is not None and len(labels) < _MAX_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name)
+    return ";".join(reversed(labels)), idle
+
+
+def _runs_under(frame, anchor) -> bool:
+    """Whether ``anchor`` is on the stack ending at ``frame`` (i.e. its coroutine is running now)."""
+    while frame is not None:
+        if frame is anchor:
+            return True
+        frame = frame.f_back
+    return False
+
+
+class RequestProfile:
+    """Stack samples and SQL statements collected for one request."""
+
+    def __init__(self, method: str, path: str, sample_rate: int):
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        slug = re.sub(r"[^A-Za-z0-9]+", "-", path).strip("-")[:60] or "root"
+        self.id = f"{stamp}-{method.lower()}-{slug}-{secrets.token_hex(3)}"
+        self.method = method
+        self.path = path
+        self.interval = 1.0 / max(sample_rate, 1)
+        self.threads: Counter[int] = Counter()  # thread ident -> calls it is running for the request
+        self.anchors: dict[int, object] = {}  # event loop thread ident -> frame of the request's endpoint call
+        self._threads_lock = threading.Lock()
+        self.stacks: Counter[str] = Counter()
+        self.idle_samples = 0
+        self.foreign_samples = 0
+        self.sql: list[dict] = []
+        self.status: int | None = None
+        self.duration = 0.0
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def enter_thread(self, anchor=None) -> None:
+        """
+        Sample the current thread until the matching ``leave_thread``.
+
+        On the event loop thread pass the frame of the request's coroutine as
+        ``anchor``: only samples taken while that frame is on the stack count.
+        """
+        ident = threading.get_ident()
+        with self._threads_lock:
+            self.threads[ident] += 1
+            if anchor is not None:
+                self.anchors[ident] = anchor
+
+    def leave_thread(self) -> None:
+        ident = threading.get_ident()
+        with self._threads_lock:
+            self.threads[ident] -= 1
+            if self.threads[ident] <= 0:
+                del self.threads[ident]
+                self.anchors.pop(ident, None)
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._sampler.join()
+        self.duration = time.perf_counter() - self._started
+
+    def _run(self) -> None:
+        names = {}
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for ident in tuple(self.threads):
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                anchor = self.anchors.get(ident)
+                if anchor is not None and not _runs_under(frame, anchor):
+                    self.foreign_samples += 1
+                    continue
+                if ident not in names:
+                    names.update((t.ident, t.name) for t in threading.enumerate())
+                stack, idle = _collapse(names.get(ident, str(ident)), frame)
+                if idle:
+                    self.idle_samples += 1
+                else:
+                    self.stacks[stack] += 1
+
+    def write(self, directory: Path) -> None:
+        directory.mkdir(parents=True, exist_ok=True)
+        folded = "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+        (directory / f"{self.id}.folded").write_text(folded, encoding="utf-8")
+        report = {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status": self.status,
+            "duration_ms": round(self.duration * 1000, 3),
+            "sample_interval_ms": round(self.interval * 1000, 3),
+            "samples": sum(self.stacks.values()),
+            "idle_samples": self.idle_samples,
+            "foreign_samples": self.foreign_samples,
+            "sql_count": len(self.sql),
+            "sql_ms": round(sum(q["duration_ms"] for q in self.sql), 3),
+            "sql": self.sql,
+        }
+        (directory / f"{self.id}.json").write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+
+def _profile_requested(scope: Scope) -> bool:
+    if Headers(scope=scope).get("x-profile", "") in ("1", "true"):
+        return True
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    return query.get("profile", [""])[0] in ("1", "true")
+
+
+def _is_admin(token: str) -> bool:
+    db = SessionLocal()
+    try:
+        user = get_current_user(db, token)
+        return user is not None and user.role == UserRole.ADMIN
+    finally:
+        db.close()
+
+
+class ProfilingMiddleware:
+    """Profile requests that ask for it, when sent by an admin and a slot is free."""
+
+    def __init__(self, app: ASGIApp, directory: str, sample_rate: int = 200, max_concurrent: int = 2) -> None:
+        self.app = app
+        self.directory = Path(directory)
+        self.sample_rate = sample_rate
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _profile_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        auth = Headers(scope=scope).get("authorization", "")
+        token = auth.replace("Bearer ", "") if auth.startswith("Bearer ") else auth
+        if not token or not await run_in_threadpool(_is_admin, token):
+            await self.app(scope, receive, send)
+            return
+        if not self._slots.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"], self.sample_rate)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profile.status = message["status"]
+                MutableHeaders(scope=message)["X-Profile-Id"] = profile.id
+            await send(message)
+
+        ctx_token = _active.set(profile)
+        profile.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile.stop()
+            _active.reset(ctx_token)
+            self._slots.release()
+            await run_in_threadpool(profile.write, self.directory)
+
+
+# ── Thread enrolment ───────────────────────────────────
+
+_run_in_threadpool = fastapi.routing.run_in_threadpool
+_run_endpoint_function = fastapi.routing.run_endpoint_function
+
+
+def _sampled(profile: RequestProfile, func):
+    """``func`` wrapped to enrol the worker thread that runs it for the duration of the call."""
+    @functools.wraps(func)
+    def run(*args, **kwargs):
+        profile.enter_thread()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.leave_thread()
+    return run
+
+
+async def _profiled_run_in_threadpool(func, *args, **kwargs):
+    profile = _active.get()
+    if profile is not None:
+        func = _sampled(profile, func)
+    return await _run_in_threadpool(func, *args, **kwargs)
+
+
+async def _profiled_run_endpoint_function(*, dependant, values, is_coroutine):
+    profile = _active.get()
+    if profile is None or not is_coroutine:
+        # Sync endpoints go through run_in_threadpool, which enrols the worker
+        return await _run_endpoint_function(dependant=dependant, values=values, is_coroutine=is_coroutine)
+    # The loop thread also runs other requests' tasks; sample it only while this frame is on its stack
+    profile.enter_thread(anchor=sys._getframe())
+    try:
+        return await _run_endpoint_function(dependant=dependant, values=values, is_coroutine=is_coroutine)
+    finally:
+        profile.leave_thread()
+
+
+def instrument_threads() -> None:
+    """
+    Route FastAPI's endpoint and threadpool calls through the enrolment wrappers above.
+
+    This replaces module attributes inside FastAPI, so it refuses to run
+    against a release whose internals it has not been checked against.
+    """
+    if not fastapi.__version__.startswith(_FASTAPI_VERSIONS):
+        raise RuntimeError(
+            f"PROFILING_ENABLED supports FastAPI {', '.join(v + 'x' for v in _FASTAPI_VERSIONS)}, "
+            f"not {fastapi.__version__}"
+        )
+    fastapi.routing.run_endpoint_function = _profiled_run_endpoint_function
+    for module in (fastapi.routing, fastapi.dependencies.utils, fastapi.concurrency):
+        module.run_in_threadpool = _profiled_run_in_threadpool
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Record SQL issued by profiled requests."""
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        profile = _active.get()
+        if profile is not None:
+            context._profile_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        profile = _active.get()
+        start = getattr(context, "_profile_start", None)
+        if profile is not None and start is not None:
+            profile.sql.append({
+                "statement": statement,
+                "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                "executemany": executemany,
+            })
@@ -0,0 +1,26 @@
+"""Fast JSON response helpers built on orjson."""
+
+import orjson
+from fastapi.responses import ORJSONResponse
+
+__all__ = ["ORJSONResponse", "json_text"]
+
+
+def json_text(value, wrap_invalid: bool = False):
+    """
+    Embed a JSON-encoded Text column in an orjson payload without parsing it.
+
+    Columns such as ``required_skills`` and ``risks`` are ``JSONText``, which
+    only ever stores well-formed JSON (legacy rows are repaired by
+    ``init_db``), so arrays and objects are spliced in verbatim as an
+    ``orjson.Fragment``. Anything else is decoded; undecodable text is
+    returned as-is, or wrapped in a list when ``wrap_invalid`` is set.
+    """
+    if not isinstance(value, str):
+        return value
+    if value[:1] in ("[", "{"):
+        return orjson.Fragment(value)
+    try:
+        return orjson.loads(value)
+    except orjson.JSONDecodeError:
+        return [value] if wrap_invalid else value
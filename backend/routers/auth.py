@@ -1,39 +1,52 @@
 """Authentication endpoints — login, register, session management."""
 
 import json
-import secrets
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 
+from backend.config import settings
 from backend.database import get_db
 from backend.models import User, Customer, Notification, UserRole, hash_password, verify_password
-from backend.schemas import UserRegister, UserLogin, UserOut, TokenOut
+from backend.schemas import UserRegister, UserLogin, UserOut, TokenOut, RefreshIn
+from backend.sessions import AuthUser, session_store
+from backend.tokens import token_signer
 
 router = APIRouter(prefix="/api/auth", tags=["Auth"])
 
-# Simple token store (demo — in production use JWT or Redis)
-_tokens: dict[str, str] = {}  # token -> user_id
 
+def create_token(user: User) -> str:
+    return session_store.create(user)
 
-def create_token(user_id: str) -> str:
-    token = secrets.token_urlsafe(32)
-    _tokens[token] = user_id
-    return token
 
+def issue_tokens(user: User) -> TokenOut:
+    """Login response: a session token, or a signed access token plus a refresh token."""
+    if settings.auth_tokens != "signed":
+        return TokenOut(token=create_token(user), user=UserOut.model_validate(user))
+    return TokenOut(
+        token=token_signer.issue(user),
+        user=UserOut.model_validate(user),
+        refresh_token=session_store.create(user),
+        expires_in=token_signer.ttl_s,
+    )
 
-def get_current_user(db: Session, token: str) -> User | None:
-    user_id = _tokens.get(token)
-    if not user_id:
-        return None
-    return db.query(User).filter(User.id == user_id).first()
 
+def get_current_user(db: Session, token: str) -> AuthUser | None:
+    """Resolve a bearer token: signature check for signed tokens, else the (cached) session store."""
+    if settings.auth_tokens == "signed":
+        return token_signer.user(token)
+    return session_store.resolve(db, token)
 
-def require_user(request: Request, db: Session = Depends(get_db)) -> User:
-    """Dependency: extract and validate user from Authorization header."""
+
+def _bearer_token(request: Request) -> str:
     auth = request.headers.get("Authorization", "")
-    token = auth.replace("Bearer ", "") if auth.startswith("Bearer ") else auth
+    return auth.replace("Bearer ", "") if auth.startswith("Bearer ") else auth
+
+
+def require_user(request: Request, db: Session = Depends(get_db)) -> AuthUser:
+    """Dependency: extract and validate user from Authorization header."""
+    token = _bearer_token(request)
     if not token:
         raise HTTPException(401, "Not authenticated")
     user = get_current_user(db, token)
@@ -42,9 +55,8 @@ def require_user(request: Request, db: Session = Depends(get_db)) -> User:
     return user
 
 
-def require_handler(request: Request, db: Session = Depends(get_db)) -> User:
-    """Dependency: require handler or admin role."""
-    user = require_user(request, db)
+def require_handler(user: AuthUser = Depends(require_user)) -> AuthUser:
+    """Dependency: require handler or admin role (reuses the request's require_user result)."""
     if user.role not in (UserRole.HANDLER, UserRole.ADMIN):
         raise HTTPException(403, "Handler access required")
     return user
@@ -81,8 +93,7 @@ def register(data: UserRegister, db: Session = Depends(get_db)):
     db.commit()
     db.refresh(user)
 
-    token = create_token(user.id)
-    return TokenOut(token=token, user=UserOut.model_validate(user))
+    return issue_tokens(user)
 
 
 @router.post("/login", response_model=TokenOut)
@@ -95,20 +106,43 @@ def login(data: UserLogin, db: Session = Depends(get_db)):
     user.last_login = datetime.now(timezone.utc)
     db.commit()
 
-    token = create_token(user.id)
-    return TokenOut(token=token, user=UserOut.model_validate(user))
+    return issue_tokens(user)
+
+
+@router.post("/refresh", response_model=TokenOut)
+def refresh(data: RefreshIn, db: Session = Depends(get_db)):
+    """Exchange a refresh token for a new access token (the refresh token is rotated)."""
+    if settings.auth_tokens != "signed":
+        raise HTTPException(400, "Refresh tokens are only issued with signed access tokens")
+    user = session_store.resolve(db, data.refresh_token)
+    if not user:
+        raise HTTPException(401, "Invalid or expired refresh token")
+    session_store.revoke(data.refresh_token)
+    return TokenOut(
+        token=token_signer.issue(user),
+        user=UserOut.model_validate(user),
+        refresh_token=session_store.create(user),
+        expires_in=token_signer.ttl_s,
+    )
 
 
 @router.get("/me", response_model=UserOut)
-def get_me(user: User = Depends(require_user)):
+def get_me(user: AuthUser = Depends(require_user), db: Session = Depends(get_db)):
     """Get current user profile."""
-    return UserOut.model_validate(user)
+    profile = db.get(User, user.id)
+    if not profile:
+        raise HTTPException(401, "Invalid or expired token")
+    return UserOut.model_validate(profile)
 
 
 @router.post("/logout")
-def logout(request: Request):
-    """Logout — invalidate token."""
-    auth = request.headers.get("Authorization", "")
-    token = auth.replace("Bearer ", "") if auth.startswith("Bearer ") else auth
-    _tokens.pop(token, None)
+def logout(request: Request, data: RefreshIn | None = None):
+    """Logout — invalidate the access token (and the refresh token, when sent)."""
+    token = _bearer_token(request)
+    if token and settings.auth_tokens == "signed":
+        token_signer.revoke(token)
+    elif token:
+        session_store.revoke(token)
+    if data is not None:
+        session_store.revoke(data.refresh_token)
     return {"ok": True}
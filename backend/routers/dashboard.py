@@ -1,19 +1,19 @@
 """Dashboard and analytics endpoints."""
 
-import json
-
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from backend.database import get_db
 from backend.models import (
-    Consultant,
     ConsultantStatus,
     FeasibilityRating,
     StaffingRequest,
     RequestStatus,
 )
+from backend.responses import ORJSONResponse
 from backend.schemas import ConsultantOut, DashboardStats
+from backend.services.consultant_pool import consultant_pool
+from backend.services.shared_pool import shared_pool
 
 router = APIRouter(prefix="/api", tags=["Dashboard"])
 
@@ -22,13 +22,13 @@ router = APIRouter(prefix="/api", tags=["Dashboard"])
 def get_dashboard_stats(db: Session = Depends(get_db)):
     """Get overview statistics for the dashboard."""
     requests = db.query(StaffingRequest).all()
-    consultants = db.query(Consultant).all()
+    consultants = shared_pool.columns(db)
 
     total = len(requests)
     pending = len([r for r in requests if r.status in (RequestStatus.SUBMITTED, RequestStatus.ANALYZING)])
     active = len([r for r in requests if r.status in (RequestStatus.ASSESSED, RequestStatus.IN_PROGRESS)])
     completed = len([r for r in requests if r.status == RequestStatus.COMPLETED])
-    available = len([c for c in consultants if c.status == ConsultantStatus.AVAILABLE])
+    available = consultants.status_rows(ConsultantStatus.AVAILABLE).bit_count()
 
     # Calculate average feasibility score as proxy for compliance
     compliance_scores = []
@@ -56,17 +56,6 @@ def get_dashboard_stats(db: Session = Depends(get_db)):
 @router.get("/consultants", response_model=list[ConsultantOut])
 def list_consultants(status: str | None = None, db: Session = Depends(get_db)):
     """List all consultants, optionally filtered by status."""
-    query = db.query(Consultant).order_by(Consultant.name)
-    if status:
-        query = query.filter(Consultant.status == status)
-
-    results = []
-    for c in query.all():
-        data = ConsultantOut.model_validate(c)
-        if isinstance(c.skills, str):
-            try:
-                data.skills = json.loads(c.skills)
-            except (json.JSONDecodeError, TypeError):
-                data.skills = [c.skills]
-        results.append(data)
-    return results
+    pool = consultant_pool.snapshot(db)
+    records = pool.with_status(status) if status else pool.by_name
+    return ORJSONResponse([r.as_dict() for r in records])
@@ -0,0 +1,29 @@
+"""Liveness and readiness probes."""
+
+from fastapi import APIRouter, HTTPException
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+
+from backend.database import engine
+from backend.startup import startup_report
+
+router = APIRouter(tags=["Health"])
+
+
+@router.get("/healthz")
+async def healthz():
+    """Liveness: the process is serving requests (no I/O)."""
+    return {"status": "ok"}
+
+
+@router.get("/readyz")
+def readyz():
+    """Readiness: startup finished (caches warmed) and the database answers."""
+    if not startup_report.ready:
+        raise HTTPException(503, "Starting up")
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+    except SQLAlchemyError:
+        raise HTTPException(503, "Database unavailable")
+    return {"status": "ready", "startup": startup_report.as_dict()}
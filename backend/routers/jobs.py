@@ -0,0 +1,21 @@
+"""Background job status endpoint."""
+
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.orm import Session
+
+from backend.database import get_db
+from backend.models import Job
+from backend.schemas import JobOut
+from backend.routers.auth import require_user
+from backend.sessions import AuthUser
+
+router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
+
+
+@router.get("/{job_id}", response_model=JobOut)
+def get_job(job_id: str, user: AuthUser = Depends(require_user), db: Session = Depends(get_db)):
+    """Poll a queued job (e.g. coordination started with POST /coordinate)."""
+    job = db.get(Job, job_id)
+    if not job:
+        raise HTTPException(404, "Job not found")
+    return job
@@ -0,0 +1,21 @@
+"""Prometheus metrics endpoint."""
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from backend.config import settings
+from backend.metrics import registry
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Export all metrics in Prometheus text format (404 unless metrics are enabled)."""
+    if not settings.metrics_enabled:
+        raise HTTPException(404, "Metrics are disabled")
+    if settings.metrics_multiproc_dir:
+        body = registry.render_merged(settings.metrics_multiproc_dir)
+    else:
+        body = registry.render()
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
@@ -4,15 +4,18 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from backend.database import get_db
-from backend.models import Notification, User
+from backend.models import Notification
 from backend.schemas import NotificationOut
 from backend.routers.auth import require_user
+from backend.sessions import AuthUser
+from backend.services.outbox import publish_notification
+from backend.services.sync import log_changes
 
 router = APIRouter(prefix="/api/notifications", tags=["Notifications"])
 
 
 @router.get("", response_model=list[NotificationOut])
-def list_notifications(user: User = Depends(require_user), db: Session = Depends(get_db)):
+def list_notifications(user: AuthUser = Depends(require_user), db: Session = Depends(get_db)):
     """Get all notifications for the current user."""
     return (
         db.query(Notification)
@@ -24,7 +27,7 @@ def list_notifications(user: User = Depends(require_user), db: Session = Depends
 
 
 @router.get("/unread-count")
-def unread_count(user: User = Depends(require_user), db: Session = Depends(get_db)):
+def unread_count(user: AuthUser = Depends(require_user), db: Session = Depends(get_db)):
     """Get count of unread notifications."""
     count = (
         db.query(Notification)
@@ -35,7 +38,7 @@ def unread_count(user: User = Depends(require_user), db: Session = Depends(get_d
 
 
 @router.patch("/{notification_id}/read")
-def mark_read(notification_id: str, user: User = Depends(require_user), db: Session = Depends(get_db)):
+def mark_read(notification_id: str, user: AuthUser = Depends(require_user), db: Session = Depends(get_db)):
     """Mark a notification as read."""
     n = db.query(Notification).filter(
         Notification.id == notification_id,
@@ -49,38 +52,31 @@ def mark_read(notification_id: str, user: User = Depends(require_user), db: Sess
 
 
 @router.post("/mark-all-read")
-def mark_all_read(user: User = Depends(require_user), db: Session = Depends(get_db)):
+def mark_all_read(user: AuthUser = Depends(require_user), db: Session = Depends(get_db)):
     """Mark all notifications as read."""
-    db.query(Notification).filter(
+    unread = db.query(Notification).filter(
         Notification.user_id == user.id,
         Notification.is_read == False,
-    ).update({"is_read": True})
+    )
+    # The bulk update bypasses the ORM flush hook, so log the rows for delta sync here
+    ids = [nid for (nid,) in unread.with_entities(Notification.id)]
+    if ids:
+        unread.update({"is_read": True}, synchronize_session=False)
+        log_changes(db, "notifications", ids)
     db.commit()
     return {"ok": True}
 
 
 def notify_handlers(db: Session, title: str, message: str, notification_type: str = "info", link: str | None = None):
-    """Send a notification to all handlers/admins."""
-    from backend.models import UserRole
-    handlers = db.query(User).filter(User.role.in_([UserRole.HANDLER, UserRole.ADMIN])).all()
-    for h in handlers:
-        n = Notification(
-            user_id=h.id,
-            title=title,
-            message=message,
-            notification_type=notification_type,
-            link=link,
-        )
-        db.add(n)
+    """Send a notification to all handlers/admins (delivered via the outbox after commit)."""
+    publish_notification(db, title, message, notification_type, link, handlers=True)
 
 
 def notify_user(db: Session, user_id: str, title: str, message: str, notification_type: str = "info", link: str | None = None):
-    """Send a notification to a specific user."""
-    n = Notification(
-        user_id=user_id,
-        title=title,
-        message=message,
-        notification_type=notification_type,
-        link=link,
-    )
-    db.add(n)
+    """Send a notification to a specific user (delivered via the outbox after commit)."""
+    publish_notification(db, title, message, notification_type, link, user_id=user_id)
+
+
+def notify_customer(db: Session, customer_id: str, title: str, message: str, notification_type: str = "info", link: str | None = None):
+    """Send a notification to every user of a customer (delivered via the outbox after commit)."""
+    publish_notification(db, title, message, notification_type, link, customer_id=customer_id)
@@ -4,9 +4,11 @@ import json
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 
+from backend.config import settings
 from backend.database import get_db
+from backend.responses import ORJSONResponse, json_text
 from backend.models import (
     Assignment,
     Customer,
@@ -15,7 +17,6 @@ from backend.models import (
     StaffingRequest,
     RequestStatus,
     TimelineEvent,
-    User,
     UserRole,
 )
 from backend.schemas import (
@@ -23,18 +24,22 @@ from backend.schemas import (
     StaffingRequestOut,
     RequestDetail,
     CustomerOut,
-    FeasibilityAssessmentOut,
     CoordinationActionOut,
     TimelineEventOut,
     AssignmentOut,
     AssignmentDetailOut,
     MatchingConsultantOut,
+    CandidatePage,
 )
 from backend.services.ai_engine import ai_engine
+from backend.services.compliance import compliance_engine
 from backend.services.feasibility import feasibility_service
 from backend.services.coordinator import coordinator
+from backend.services.ranking import Match, ranking_engine, read_matches
+from backend.services.shared_pool import shared_pool
+from backend.services.workload import DEFAULT_HOURS_PER_WEEK
 from backend.routers.auth import require_user
-from backend.routers.notifications import notify_handlers, notify_user
+from backend.routers.notifications import notify_customer, notify_handlers
 
 router = APIRouter(prefix="/api/requests", tags=["Staffing Requests"])
 
@@ -100,30 +105,27 @@ def create_request(data: StaffingRequestCreate, db: Session = Depends(get_db)):
         link=request.id,
     )
 
-    db.commit()
-    db.refresh(request)
-
-    # Auto-trigger feasibility & action plan
+    # Auto-trigger feasibility & action plan in a savepoint, so a failure
+    # there never loses the request itself
     try:
-        feasibility_service.assess(db, request.id)
-        coordinator.create_action_plan(db, request.id)
+        with db.begin_nested():
+            feasibility_service.assess(db, request.id, commit=False)
+            coordinator.create_action_plan(db, request.id, commit=False)
     except Exception:
         pass  # Non-blocking
 
     # Notify customer user(s) that it was received
-    customer_users = db.query(User).filter(User.customer_id == data.customer_id).all()
-    for cu in customer_users:
-        notify_user(
-            db, cu.id,
-            title="Förfrågan mottagen",
-            message=f"Din förfrågan '{data.title}' har tagits emot och AI-analyseras nu.",
-            notification_type="success",
-            link=request.id,
-        )
+    notify_customer(
+        db, data.customer_id,
+        title="Förfrågan mottagen",
+        message=f"Din förfrågan '{data.title}' har tagits emot och AI-analyseras nu.",
+        notification_type="success",
+        link=request.id,
+    )
     db.commit()
 
     db.refresh(request)
-    return _serialize_request(request)
+    return ORJSONResponse(_request_row(request), status_code=201)
 
 
 @router.get("", response_model=list[StaffingRequestOut])
@@ -136,24 +138,18 @@ def list_requests(
 ):
     """List all staffing requests, optionally filtered by status or customer.
     If mine=true and user is a customer, only return their requests."""
-    query = db.query(StaffingRequest).order_by(StaffingRequest.created_at.desc())
+    query = (
+        db.query(StaffingRequest)
+        .options(joinedload(StaffingRequest.customer), joinedload(StaffingRequest.assessment))
+        .order_by(StaffingRequest.created_at.desc())
+    )
 
     if status:
         query = query.filter(StaffingRequest.status == status)
     if customer_id:
         query = query.filter(StaffingRequest.customer_id == customer_id)
 
-    results = []
-    for r in query.all():
-        out = _serialize_request(r)
-        # Enrich with company name
-        if r.customer:
-            out.company_name = r.customer.company
-        # Enrich with feasibility score from assessment
-        if r.assessment:
-            out.feasibility_score = round(r.assessment.confidence_score * 100)
-        results.append(out)
-    return results
+    return ORJSONResponse([_list_row(r) for r in query.all()])
 
 
 @router.get("/{request_id}", response_model=RequestDetail)
@@ -167,12 +163,7 @@ def get_request_detail(request_id: str, db: Session = Depends(get_db)):
     matching_consultants_out = []
     assessment = request.assessment
     if assessment:
-        matching_ids = []
-        if assessment.matching_consultants:
-            try:
-                matching_ids = json.loads(assessment.matching_consultants) if isinstance(assessment.matching_consultants, str) else assessment.matching_consultants
-            except (json.JSONDecodeError, TypeError):
-                matching_ids = []
+        matches = read_matches(assessment.matching_consultants)
 
         # Parse required skills
         required_skills = []
@@ -192,50 +183,45 @@ def get_request_detail(request_id: str, db: Session = Depends(get_db)):
             )
             required_skills = ai_result.get("extracted_skills", [])
 
-        required_lower = [s.lower() for s in required_skills]
+        matching_consultants_out = _matching_rows(db, request, matches, required_skills)
 
-        # Fetch and enrich each matching consultant
-        for cid in matching_ids:
-            consultant = db.query(Consultant).filter(Consultant.id == cid).first()
-            if not consultant:
-                continue
+        # Ranked matches are stored best first; legacy id lists are sorted by skill match
+        if any(m.score is None for m in matches):
+            matching_consultants_out.sort(key=lambda c: c.match_score, reverse=True)
 
-            c_skills = []
-            if consultant.skills:
-                try:
-                    c_skills = json.loads(consultant.skills) if isinstance(consultant.skills, str) else consultant.skills
-                except (json.JSONDecodeError, TypeError):
-                    c_skills = []
-
-            c_skills_lower = [s.lower() for s in c_skills]
-            matching_skills = [s for s in required_skills if s.lower() in c_skills_lower]
-            missing_skills = [s for s in required_skills if s.lower() not in c_skills_lower]
-            match_score = (len(matching_skills) / max(len(required_skills), 1)) * 100
-
-            matching_consultants_out.append(MatchingConsultantOut(
-                id=consultant.id,
-                name=consultant.name,
-                title=consultant.title,
-                skills=c_skills,
-                hourly_rate=consultant.hourly_rate,
-                status=consultant.status.value if hasattr(consultant.status, 'value') else str(consultant.status),
-                match_score=round(match_score, 1),
-                matching_skills=matching_skills,
-                missing_skills=missing_skills,
-            ))
-
-        # Sort by match score descending
-        matching_consultants_out.sort(key=lambda c: c.match_score, reverse=True)
-
-    return RequestDetail(
-        request=_serialize_request(request),
-        customer=CustomerOut.model_validate(request.customer),
-        assessment=_serialize_assessment(assessment) if assessment else None,
-        matching_consultants=matching_consultants_out,
-        actions=[CoordinationActionOut.model_validate(a) for a in sorted(request.actions, key=lambda x: x.order)],
-        timeline=[TimelineEventOut.model_validate(e) for e in sorted(request.timeline_events, key=lambda x: x.created_at, reverse=True)],
-        assignments=_enrich_assignments(db, request.assignments),
-    )
+    return ORJSONResponse({
+        "request": _request_row(request),
+        "customer": CustomerOut.model_validate(request.customer).model_dump(),
+        "assessment": _assessment_row(assessment) if assessment else None,
+        "matching_consultants": [m.model_dump() for m in matching_consultants_out],
+        "actions": [CoordinationActionOut.model_validate(a).model_dump() for a in sorted(request.actions, key=lambda x: x.order)],
+        "timeline": [TimelineEventOut.model_validate(e).model_dump() for e in sorted(request.timeline_events, key=lambda x: x.created_at, reverse=True)],
+        "assignments": [a.model_dump() for a in _enrich_assignments(db, request.assignments)],
+    })
+
+
+@router.get("/{request_id}/candidates", response_model=CandidatePage)
+def list_candidates(request_id: str, offset: int = 0, limit: int = 20, db: Session = Depends(get_db)):
+    """
+    Ranked candidates for a request, a page at a time.
+
+    The assessment keeps only the top candidates; this ranks the current pool
+    again, so it also pages past them (``offset=20``).
+    """
+    if offset < 0 or not 1 <= limit <= 100:
+        raise HTTPException(400, "offset must be >= 0 and limit between 1 and 100")
+    request = db.get(StaffingRequest, request_id)
+    if not request:
+        raise HTTPException(404, "Request not found")
+
+    required_skills = feasibility_service.required_skills(request)
+    page, total = ranking_engine.rank(shared_pool.columns(db), required_skills, request, limit, offset)
+    return ORJSONResponse({
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "candidates": [m.model_dump() for m in _matching_rows(db, request, page, required_skills)],
+    })
 
 
 @router.post("/{request_id}/assess")
@@ -243,17 +229,28 @@ def trigger_assessment(request_id: str, db: Session = Depends(get_db)):
     """Manually trigger a feasibility assessment."""
     try:
         assessment = feasibility_service.assess(db, request_id)
-        return _serialize_assessment(assessment)
+        return ORJSONResponse(_assessment_row(assessment))
     except ValueError as e:
         raise HTTPException(404, str(e))
 
 
 @router.post("/{request_id}/coordinate")
 def trigger_coordination(request_id: str, plan_type: str = "standard_staffing", db: Session = Depends(get_db)):
-    """Create and execute an action plan for the request."""
+    """
+    Create and execute an action plan for the request.
+
+    With ``coordinator_queue`` enabled the plan is executed by a worker
+    process instead: responds 202 with the job to poll at /api/jobs/{job_id}.
+    """
     try:
-        actions = coordinator.create_action_plan(db, request_id, plan_type)
-        executed = coordinator.execute_all_actions(db, request_id)
+        if settings.coordinator_queue:
+            actions, job = coordinator.enqueue_plan(db, request_id, plan_type)
+            return ORJSONResponse({
+                "plan_created": len(actions),
+                "job_id": job.id,
+                "actions": [CoordinationActionOut.model_validate(a).model_dump(mode="json") for a in actions],
+            }, status_code=202)
+        actions, executed = coordinator.run_plan(db, request_id, plan_type)
         return {
             "plan_created": len(actions),
             "actions_executed": len(executed),
@@ -264,8 +261,19 @@ def trigger_coordination(request_id: str, plan_type: str = "standard_staffing",
 
 
 @router.post("/{request_id}/assign/{consultant_id}")
-def assign_consultant(request_id: str, consultant_id: str, db: Session = Depends(get_db)):
-    """Assign a consultant to a request. Sets status to 'sent' and notifies all parties."""
+def assign_consultant(
+    request_id: str, consultant_id: str, hours_per_week: float = DEFAULT_HOURS_PER_WEEK,
+    db: Session = Depends(get_db),
+):
+    """
+    Assign a consultant to a request. Sets status to 'sent' and notifies all parties.
+
+    ``hours_per_week`` is the consultant's time on this request (full time by
+    default). Responds 409 when it would take the consultant over the weekly
+    hours limit in any week of the request.
+    """
+    if not 0 < hours_per_week <= 168:
+        raise HTTPException(400, "hours_per_week must be between 0 and 168")
     try:
         # Guard against duplicate assignments
         existing = db.query(Assignment).filter(
@@ -276,16 +284,21 @@ def assign_consultant(request_id: str, consultant_id: str, db: Session = Depends
         if existing:
             raise HTTPException(400, "Konsulten är redan tilldelad denna förfrågan")
 
-        assignment = coordinator.assign_consultant(db, request_id, consultant_id)
+        request = db.get(StaffingRequest, request_id)
+        consultant = db.get(Consultant, consultant_id)
+        if request and consultant:
+            check = compliance_engine.check_assignment(consultant, request, hours_per_week, db)
+            overload = [i for i in check["issues"] if i["rule"] == "max_hours_weekly" and i["severity"] == "blocking"]
+            if overload:
+                raise HTTPException(409, overload[0]["message"])
+
+        assignment = coordinator.assign_consultant(
+            db, request_id, consultant_id, commit=False, hours_per_week=hours_per_week,
+        )
         # Update assignment status to 'sent' (förfrågan skickad till konsult)
         assignment.status = "sent"
-        db.commit()
-        db.refresh(assignment)
-
-        # Get context for notifications
-        request = db.query(StaffingRequest).filter(StaffingRequest.id == request_id).first()
-        consultant = db.query(Consultant).filter(Consultant.id == consultant_id).first()
 
+        # Context for notifications: already loaded above
         # Notify handlers: förfrågan skickad till konsult
         notify_handlers(
             db,
@@ -296,16 +309,13 @@ def assign_consultant(request_id: str, consultant_id: str, db: Session = Depends
         )
 
         # Notify customer: konsult föreslagen
-        if request:
-            customer_users = db.query(User).filter(User.customer_id == request.customer_id).all()
-            for cu in customer_users:
-                notify_user(
-                    db, cu.id,
-                    title=f"Konsult föreslagen: {consultant.name}",
-                    message=f"{consultant.name} ({consultant.title}) har mottagit förfrågan för '{request.title}'. Vi inväntar konsultens godkännande.",
-                    notification_type="info",
-                    link=request_id,
-                )
+        notify_customer(
+            db, request.customer_id,
+            title=f"Konsult föreslagen: {consultant.name}",
+            message=f"{consultant.name} ({consultant.title}) har mottagit förfrågan för '{request.title}'. Vi inväntar konsultens godkännande.",
+            notification_type="info",
+            link=request_id,
+        )
 
         # Add timeline event
         event = TimelineEvent(
@@ -357,15 +367,13 @@ def approve_assignment(request_id: str, assignment_id: str, db: Session = Depend
 
     # Notify customer
     if request:
-        customer_users = db.query(User).filter(User.customer_id == request.customer_id).all()
-        for cu in customer_users:
-            notify_user(
-                db, cu.id,
-                title=f"Konsult bekräftad: {consultant.name}",
-                message=f"{consultant.name} har accepterat uppdraget '{request.title}'. Tilldelningen är klar!",
-                notification_type="success",
-                link=request_id,
-            )
+        notify_customer(
+            db, request.customer_id,
+            title=f"Konsult bekräftad: {consultant.name}",
+            message=f"{consultant.name} har accepterat uppdraget '{request.title}'. Tilldelningen är klar!",
+            notification_type="success",
+            link=request_id,
+        )
 
     # Check if all needed consultants are confirmed
     confirmed_count = sum(1 for a in request.assignments if a.status == "confirmed")
@@ -423,15 +431,13 @@ def reject_assignment(request_id: str, assignment_id: str, db: Session = Depends
 
     # Notify customer
     if request:
-        customer_users = db.query(User).filter(User.customer_id == request.customer_id).all()
-        for cu in customer_users:
-            notify_user(
-                db, cu.id,
-                title="Konsult avböjde — ny matchning pågår",
-                message=f"Den föreslagna konsulten för '{request.title}' avböjde. Vi söker en ny matchning.",
-                notification_type="warning",
-                link=request_id,
-            )
+        notify_customer(
+            db, request.customer_id,
+            title="Konsult avböjde — ny matchning pågår",
+            message=f"Den föreslagna konsulten för '{request.title}' avböjde. Vi söker en ny matchning.",
+            notification_type="warning",
+            link=request_id,
+        )
 
     db.commit()
     return {"ok": True, "status": assignment.status}
@@ -456,7 +462,51 @@ def update_status(request_id: str, status: str, db: Session = Depends(get_db)):
     db.add(event)
     db.commit()
     db.refresh(request)
-    return _serialize_request(request)
+    return ORJSONResponse(_request_row(request))
+
+
+def _matching_rows(
+    db: Session, request: StaffingRequest, matches: list[Match], required_skills: list[str],
+) -> list[MatchingConsultantOut]:
+    """Enrich ranked matches with consultant details, skill overlap and compliance, in ``matches`` order."""
+    required_lower = [s.lower() for s in required_skills]
+
+    # Fetch the matching consultants in one query, then check them as a batch
+    ids = [m.id for m in matches]
+    by_id = {c.id: c for c in db.query(Consultant).filter(Consultant.id.in_(ids))} if ids else {}
+    found = [(m, by_id[m.id]) for m in matches if m.id in by_id]
+    compliance = compliance_engine.check_assignments(request, [c for _, c in found], db=db)
+
+    rows = []
+    for (match, consultant), check in zip(found, compliance):
+        c_skills = []
+        if consultant.skills:
+            try:
+                c_skills = json.loads(consultant.skills) if isinstance(consultant.skills, str) else consultant.skills
+            except (json.JSONDecodeError, TypeError):
+                c_skills = []
+
+        c_skills_lower = [s.lower() for s in c_skills]
+        matching_skills = [s for s, low in zip(required_skills, required_lower) if low in c_skills_lower]
+        missing_skills = [s for s, low in zip(required_skills, required_lower) if low not in c_skills_lower]
+        match_score = (len(matching_skills) / max(len(required_skills), 1)) * 100
+
+        rows.append(MatchingConsultantOut(
+            id=consultant.id,
+            name=consultant.name,
+            title=consultant.title,
+            skills=c_skills,
+            hourly_rate=consultant.hourly_rate,
+            status=consultant.status.value if hasattr(consultant.status, 'value') else str(consultant.status),
+            match_score=round(match_score, 1),
+            matching_skills=matching_skills,
+            missing_skills=missing_skills,
+            compliant=check["compliant"],
+            compliance_issues=check["issues"],
+            rank_score=match.score,
+            rank_factors=match.factors or {},
+        ))
+    return rows
 
 
 def _enrich_assignments(db: Session, assignments) -> list[AssignmentDetailOut]:
@@ -483,31 +533,70 @@ def _enrich_assignments(db: Session, assignments) -> list[AssignmentDetailOut]:
             start_date=a.start_date,
             end_date=a.end_date,
             hourly_rate=a.hourly_rate,
+            hours_per_week=a.hours_per_week,
             status=a.status,
             created_at=a.created_at,
         ))
     return result
 
 
-def _serialize_request(r: StaffingRequest) -> StaffingRequestOut:
-    """Serialize a request with JSON fields parsed."""
-    data = StaffingRequestOut.model_validate(r)
-    if isinstance(r.required_skills, str):
-        try:
-            data.required_skills = json.loads(r.required_skills)
-        except (json.JSONDecodeError, TypeError):
-            data.required_skills = [r.required_skills]
-    return data
-
+def _request_row(r: StaffingRequest) -> dict:
+    """Serialize a request to a StaffingRequestOut-shaped dict for orjson.
 
-def _serialize_assessment(a) -> FeasibilityAssessmentOut:
-    """Serialize assessment with JSON fields parsed."""
-    data = FeasibilityAssessmentOut.model_validate(a)
-    for field in ["matching_consultants", "risks", "recommendations", "alternatives"]:
-        val = getattr(a, field)
-        if isinstance(val, str):
-            try:
-                setattr(data, field, json.loads(val))
-            except (json.JSONDecodeError, TypeError):
-                pass
-    return data
+    JSON Text columns are spliced into the output as stored, not re-parsed.
+    """
+    return {
+        "id": r.id,
+        "customer_id": r.customer_id,
+        "title": r.title,
+        "description": r.description,
+        "required_skills": json_text(r.required_skills, wrap_invalid=True),
+        "number_of_consultants": r.number_of_consultants,
+        "start_date": r.start_date,
+        "end_date": r.end_date,
+        "budget_max_hourly": r.budget_max_hourly,
+        "location": r.location,
+        "remote_ok": r.remote_ok,
+        "priority": r.priority,
+        "status": r.status,
+        "ai_summary": r.ai_summary,
+        "ai_category": r.ai_category,
+        "ai_complexity_score": r.ai_complexity_score,
+        "created_at": r.created_at,
+        "updated_at": r.updated_at,
+        "company_name": None,
+        "feasibility_score": None,
+    }
+
+
+def _list_row(r: StaffingRequest) -> dict:
+    """Serialize a request with the list-view enrichment fields."""
+    row = _request_row(r)
+    # Enrich with company name
+    if r.customer:
+        row["company_name"] = r.customer.company
+    # Enrich with feasibility score from assessment
+    if r.assessment:
+        row["feasibility_score"] = float(round(r.assessment.confidence_score * 100))
+    return row
+
+
+def _assessment_row(a) -> dict:
+    """Serialize an assessment to a FeasibilityAssessmentOut-shaped dict for orjson."""
+    return {
+        "id": a.id,
+        "request_id": a.request_id,
+        "overall_rating": a.overall_rating,
+        "confidence_score": a.confidence_score,
+        "availability_score": a.availability_score,
+        "skills_match_score": a.skills_match_score,
+        "budget_fit_score": a.budget_fit_score,
+        "timeline_score": a.timeline_score,
+        "compliance_score": a.compliance_score,
+        "matching_consultants": [m.id for m in read_matches(a.matching_consultants)],
+        "matching_total": a.matching_total,
+        "risks": json_text(a.risks),
+        "recommendations": json_text(a.recommendations),
+        "alternatives": json_text(a.alternatives),
+        "created_at": a.created_at,
+    }
@@ -0,0 +1,50 @@
+"""Delta sync endpoint — lets the SPA keep a local store and apply small diffs."""
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from backend.database import get_db
+from backend.responses import ORJSONResponse
+from backend.schemas import (
+    AssignmentOut,
+    NotificationOut,
+    SyncOut,
+    TimelineEventOut,
+)
+from backend.services.sync import sync_service
+from backend.routers.auth import require_user
+from backend.sessions import AuthUser
+from backend.routers.requests import _assessment_row, _list_row
+
+router = APIRouter(prefix="/api", tags=["Sync"])
+
+
+@router.get("/sync", response_model=SyncOut)
+def sync(
+    since: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=5000),
+    user: AuthUser = Depends(require_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Return requests, assessments, assignments, timeline events and notifications
+    changed since the cursor, plus the new cursor.
+    Without a cursor (since=0) a full snapshot is returned instead.
+    Keep calling with the returned cursor while has_more is true.
+    """
+    if since == 0:
+        data = sync_service.snapshot(db, user)
+    else:
+        data = sync_service.changes_since(db, user, since, limit)
+
+    return ORJSONResponse({
+        "cursor": data["cursor"],
+        "has_more": data["has_more"],
+        "full": data["full"],
+        "requests": [_list_row(r) for r in data["requests"]],
+        "assessments": [_assessment_row(a) for a in data["assessments"]],
+        "assignments": [AssignmentOut.model_validate(a).model_dump() for a in data["assignments"]],
+        "timeline": [TimelineEventOut.model_validate(e).model_dump() for e in data["timeline"]],
+        "notifications": [NotificationOut.model_validate(n).model_dump() for n in data["notifications"]],
+        "deleted": data["deleted"],
+    })
@@ -36,6 +36,13 @@ class UserOut(BaseModel):
 class TokenOut(BaseModel):
     token: str
     user: UserOut
+    # Only with signed access tokens: exchange at /api/auth/refresh before `expires_in` runs out
+    refresh_token: str | None = None
+    expires_in: int | None = None
+
+
+class RefreshIn(BaseModel):
+    refresh_token: str
 
 
 # ── Notification ───────────────────────────────────────
@@ -131,7 +138,8 @@ class FeasibilityAssessmentOut(BaseModel):
     budget_fit_score: float
     timeline_score: float
     compliance_score: float
-    matching_consultants: list | str | None = None
+    matching_consultants: list | str | None = None  # consultant ids, best first
+    matching_total: int | None = None
     risks: list | str | None = None
     recommendations: list | str | None = None
     alternatives: list | str | None = None
@@ -160,6 +168,24 @@ class CoordinationActionOut(BaseModel):
         from_attributes = True
 
 
+# ── Background Job ─────────────────────────────────────
+
+
+class JobOut(BaseModel):
+    id: str
+    kind: str
+    status: str
+    attempts: int
+    max_attempts: int
+    run_after: datetime
+    last_error: str | None
+    created_at: datetime
+    finished_at: datetime | None
+
+    class Config:
+        from_attributes = True
+
+
 # ── Timeline Event ─────────────────────────────────────
 
 
@@ -204,6 +230,7 @@ class AssignmentOut(BaseModel):
     start_date: datetime
     end_date: datetime | None
     hourly_rate: float
+    hours_per_week: float | None = None  # None: full time
     status: str
     created_at: datetime
 
@@ -222,6 +249,7 @@ class AssignmentDetailOut(BaseModel):
     start_date: datetime
     end_date: datetime | None
     hourly_rate: float
+    hours_per_week: float | None = None  # None: full time
     status: str  # proposed, sent, confirmed, rejected, active, ended
     created_at: datetime
 
@@ -229,6 +257,12 @@ class AssignmentDetailOut(BaseModel):
 # ── Matching Consultant (enriched) ─────────────────────
 
 
+class ComplianceIssueOut(BaseModel):
+    rule: str
+    severity: str  # blocking, warning
+    message: str
+
+
 class MatchingConsultantOut(BaseModel):
     id: str
     name: str
@@ -239,6 +273,38 @@ class MatchingConsultantOut(BaseModel):
     match_score: float = 0.0  # 0-100 how well they match
     matching_skills: list[str] = []  # which required skills they have
     missing_skills: list[str] = []  # which required skills they lack
+    compliant: bool = True  # no blocking compliance issue for this request
+    compliance_issues: list[ComplianceIssueOut] = []
+    rank_score: float | None = None  # 0-100 weighted ranking score; None for legacy assessments
+    rank_factors: dict[str, float] = {}  # skills, rate, availability, category (0-1 each)
+
+
+class CandidatePage(BaseModel):
+    total: int  # all matching consultants
+    offset: int
+    limit: int
+    candidates: list[MatchingConsultantOut] = []
+
+
+# ── Delta Sync ─────────────────────────────────────
+
+
+class SyncDeletedOut(BaseModel):
+    entity: str
+    id: str
+
+
+class SyncOut(BaseModel):
+    """Changes since a cursor; a full snapshot when ``full`` is set."""
+    cursor: int
+    has_more: bool = False
+    full: bool = False
+    requests: list[StaffingRequestOut] = []
+    assessments: list[FeasibilityAssessmentOut] = []
+    assignments: list[AssignmentOut] = []
+    timeline: list[TimelineEventOut] = []
+    notifications: list[NotificationOut] = []
+    deleted: list[SyncDeletedOut] = []
 
 
 # ── Dashboard / Analytics ──────────────────────────────
@@ -1,10 +1,20 @@
-"""Seed database with realistic sample data for demo/review."""
+"""
+Seed database with realistic sample data for demo/review.
 
+Also a synthetic data generator for load and scale testing:
+
+    python -m backend.seed_data --customers 2000 --consultants 20000 --requests 1000000 --seed 7
+"""
+
+import argparse
 import json
+import random
+import time
 from datetime import datetime, timedelta, timezone
 
 from sqlalchemy.orm import Session
 
+from backend.database import Base, SessionLocal, engine, init_db
 from backend.models import (
     Assignment,
     ComplianceRule,
@@ -24,6 +34,8 @@ from backend.models import (
     UserRole,
     hash_password,
 )
+from backend.services.ai_engine import SKILL_CATEGORIES
+from backend.services.sync import log_changes
 
 now = datetime.now(timezone.utc)
 
@@ -35,7 +47,7 @@ def _ago(**kw):
 def seed_database(db: Session):
     """Populate the database with comprehensive demo data."""
 
-    if db.query(Customer).count() > 0:
+    if db.query(Customer.id).first() is not None:
         return
 
     # ═══════════════════════════════════════════════════
@@ -484,3 +496,293 @@ def seed_database(db: Session):
     print(f"✅ Seeded: {len(customers)} customers, {len(consultants)} consultants, "
           f"{len(requests_data)} requests, {len(assignments)} assignments, "
           f"{len(assessments)} assessments, {len(notifications)} notifications")
+
+
+# ═══════════════════════════════════════════════════
+# SYNTHETIC DATA GENERATOR
+# ═══════════════════════════════════════════════════
+
+# Share of the consultant pool / request volume per skill category
+CATEGORY_WEIGHTS = {
+    "backend": 25, "frontend": 20, "data": 15, "devops": 15,
+    "mobile": 7, "ai_ml": 8, "management": 6, "design": 4,
+}
+CATEGORY_TITLES = {
+    "backend": "Backend Developer", "frontend": "Frontend Developer", "data": "Data Engineer",
+    "devops": "DevOps Engineer", "mobile": "Mobile Developer", "ai_ml": "ML Engineer",
+    "management": "Agile Coach", "design": "UX Designer",
+}
+# Typical hourly rate (SEK) per category; individual rates vary around it
+CATEGORY_RATES = {
+    "backend": 950, "frontend": 900, "data": 975, "devops": 1050,
+    "mobile": 925, "ai_ml": 1150, "management": 875, "design": 850,
+}
+
+CONSULTANT_STATUS_WEIGHTS = {
+    ConsultantStatus.ASSIGNED: 60, ConsultantStatus.AVAILABLE: 25,
+    ConsultantStatus.ENDING_SOON: 10, ConsultantStatus.ON_LEAVE: 5,
+}
+REQUEST_STATUS_WEIGHTS = {
+    RequestStatus.SUBMITTED: 10, RequestStatus.ASSESSED: 20, RequestStatus.IN_PROGRESS: 30,
+    RequestStatus.COMPLETED: 30, RequestStatus.CANCELLED: 8, RequestStatus.REJECTED: 2,
+}
+PRIORITY_WEIGHTS = {
+    RequestPriority.LOW: 15, RequestPriority.MEDIUM: 50, RequestPriority.HIGH: 28, RequestPriority.URGENT: 7,
+}
+RATING_WEIGHTS = {
+    FeasibilityRating.HIGH: 45, FeasibilityRating.MEDIUM: 35,
+    FeasibilityRating.LOW: 15, FeasibilityRating.NOT_FEASIBLE: 5,
+}
+
+FIRST_NAMES = ["Anna", "Erik", "Maria", "Lars", "Sofia", "Johan", "Emma", "Oscar", "Linnea", "Alexander",
+               "Hanna", "Viktor", "Frida", "Daniel", "Maja", "Karin", "Anders", "Elin", "Magnus", "Ida"]
+LAST_NAMES = ["Andersson", "Johansson", "Karlsson", "Nilsson", "Eriksson", "Larsson", "Olsson", "Persson",
+              "Svensson", "Gustafsson", "Pettersson", "Lindström", "Berg", "Holmgren", "Ström", "Öberg"]
+COMPANY_STEMS = ["Nord", "Svea", "Göta", "Vasa", "Fjäll", "Älv", "Skog", "Hav", "Berg", "Sol", "Norr", "Ljus"]
+COMPANY_SUFFIXES = ["Tech", "Data", "Bank", "Energi", "Logistik", "Media", "Försäkring", "Industri", "Retail"]
+INDUSTRIES = ["Automotive & Manufacturing", "Tech / Streaming", "Finance & Banking",
+              "Telecom & 5G", "Retail & E-commerce", "Energy", "Public Sector", "Healthcare"]
+CITIES = ["Stockholm", "Göteborg", "Malmö", "Uppsala", "Linköping", "Umeå"]
+
+GEN_PASSWORD = "kund123"
+
+
+def _weighted(rng: random.Random, weights: dict):
+    return rng.choices(list(weights), list(weights.values()))[0]
+
+
+def _person(rng: random.Random) -> str:
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+
+
+def _insert_chunks(db: Session, model, rows: list[dict], chunk_size: int) -> None:
+    for start in range(0, len(rows), chunk_size):
+        db.execute(model.__table__.insert(), rows[start:start + chunk_size])
+
+
+def _generate_consultants(rng: random.Random, count: int) -> tuple[list[dict], dict[str, list[tuple[str, float]]]]:
+    rows = []
+    by_category: dict[str, list[tuple[str, float]]] = {c: [] for c in CATEGORY_WEIGHTS}
+    for i in range(count):
+        category = _weighted(rng, CATEGORY_WEIGHTS)
+        primary = SKILL_CATEGORIES[category]
+        skills = rng.sample(primary, min(len(primary), rng.randint(3, 6)))
+        other = SKILL_CATEGORIES[_weighted(rng, CATEGORY_WEIGHTS)]
+        skills += [s for s in rng.sample(other, rng.randint(0, 2)) if s not in skills]
+        rate = max(600.0, round(rng.gauss(CATEGORY_RATES[category], 120) / 25) * 25)
+        status = _weighted(rng, CONSULTANT_STATUS_WEIGHTS)
+        cid = f"gen-cons-{i:07d}"
+        rows.append({
+            "id": cid,
+            "name": _person(rng),
+            "email": f"konsult{i}@gen.consultant.se",
+            "title": f"{rng.choice(['', 'Senior ', 'Lead '])}{CATEGORY_TITLES[category]}",
+            "skills": json.dumps(skills),
+            "hourly_rate": rate,
+            "status": status,
+            "availability_date": now + timedelta(days=rng.randint(7, 90)) if status == ConsultantStatus.ON_LEAVE else None,
+            "created_at": now - timedelta(days=rng.randint(30, 1500)),
+        })
+        by_category[category].append((cid, rate))
+    return rows, by_category
+
+
+def generate_database(
+    db: Session,
+    customers: int,
+    consultants: int,
+    requests: int,
+    seed: int = 42,
+    days: int = 730,
+    chunk_size: int = 10_000,
+) -> dict:
+    """
+    Bulk-insert a synthetic dataset on top of whatever is already in ``db``.
+
+    Requests and everything hanging off them (assessments, assignments,
+    timeline events, notifications) are generated and inserted ``chunk_size``
+    requests at a time with Core ``executemany`` inserts, committing per chunk,
+    so memory stays flat regardless of ``requests``.
+    """
+    rng = random.Random(seed)
+    counts = dict.fromkeys(["customers", "consultants", "requests", "assessments",
+                            "assignments", "timeline_events", "notifications"], 0)
+
+    customer_rows, user_rows = [], []
+    password_hash = hash_password(GEN_PASSWORD)
+    for i in range(customers):
+        name = _person(rng)
+        company = f"{rng.choice(COMPANY_STEMS)}{rng.choice(COMPANY_SUFFIXES)} {i} AB"
+        customer_rows.append({
+            "id": f"gen-cust-{i:06d}", "name": name, "company": company,
+            "email": f"kund{i}@gen.intelliplan.se", "industry": rng.choice(INDUSTRIES),
+            "contract_type": rng.choices(["premium", "standard", "none"], [30, 65, 5])[0],
+            "created_at": now - timedelta(days=days + rng.randint(0, 365)),
+        })
+        user_rows.append({
+            "id": f"gen-user-{i:06d}", "email": f"kund{i}@gen.intelliplan.se",
+            "password_hash": password_hash, "full_name": name,
+            "role": UserRole.CUSTOMER, "customer_id": f"gen-cust-{i:06d}", "is_active": True,
+            "created_at": now - timedelta(days=days),
+        })
+    _insert_chunks(db, Customer, customer_rows, chunk_size)
+    _insert_chunks(db, User, user_rows, chunk_size)
+    counts["customers"] = customers
+
+    consultant_rows, pool = _generate_consultants(rng, consultants)
+    _insert_chunks(db, Consultant, consultant_rows, chunk_size)
+    counts["consultants"] = consultants
+    del consultant_rows
+    db.commit()
+
+    span = timedelta(days=days)
+    for chunk_start in range(0, requests, chunk_size):
+        batch = {"requests": [], "assessments": [], "assignments": [], "timeline_events": [], "notifications": []}
+        for i in range(chunk_start, min(chunk_start + chunk_size, requests)):
+            _generate_request(rng, i, requests, span, customers, pool, batch)
+
+        _insert_chunks(db, StaffingRequest, batch["requests"], chunk_size)
+        _insert_chunks(db, FeasibilityAssessment, batch["assessments"], chunk_size)
+        _insert_chunks(db, Assignment, batch["assignments"], chunk_size)
+        _insert_chunks(db, TimelineEvent, batch["timeline_events"], chunk_size)
+        _insert_chunks(db, Notification, batch["notifications"], chunk_size)
+        db.commit()
+        for key, rows in batch.items():
+            counts[key] += len(rows)
+
+    if requests:
+        # Snapshots read the tables directly; one row moves the sync cursor past the bulk load
+        log_changes(db, "requests", [f"gen-req-{requests - 1:07d}"])
+        db.commit()
+    return counts
+
+
+def _generate_request(rng, i, total, span, customers, pool, batch) -> None:
+    rid = f"gen-req-{i:07d}"
+    cust = rng.randrange(customers)
+    created = now - span + span * (i + rng.random()) / total
+    category = _weighted(rng, CATEGORY_WEIGHTS)
+    skills = rng.sample(SKILL_CATEGORIES[category], rng.randint(2, 4))
+    status = _weighted(rng, REQUEST_STATUS_WEIGHTS)
+    priority = _weighted(rng, PRIORITY_WEIGHTS)
+    start = created + timedelta(days=rng.randint(3, 60))
+    candidates = pool[category] or [c for group in pool.values() for c in group]
+    title = f"{CATEGORY_TITLES[category]} — {', '.join(skills[:2])}"
+
+    batch["requests"].append({
+        "id": rid, "customer_id": f"gen-cust-{cust:06d}", "title": title,
+        "description": f"Vi söker {title.lower()} med erfarenhet av {', '.join(skills)}.",
+        "required_skills": json.dumps(skills),
+        "number_of_consultants": rng.choices([1, 2, 3], [70, 22, 8])[0],
+        "start_date": start, "end_date": start + timedelta(days=rng.choice([90, 120, 180, 365])),
+        "budget_max_hourly": float(rng.randrange(750, 1400, 50)) if rng.random() < 0.85 else None,
+        "location": rng.choice(CITIES), "remote_ok": rng.random() < 0.4,
+        "priority": priority, "status": status,
+        "ai_summary": f"Request for {category} resources with focus on {', '.join(skills[:3])}.",
+        "ai_category": category, "ai_complexity_score": round(rng.uniform(0.2, 0.9), 2),
+        "created_at": created, "updated_at": created,
+    })
+
+    events = batch["timeline_events"]
+    first_event = len(events)
+
+    def event(kind, title, at, actor="System"):
+        events.append({
+            "id": f"gen-ev-{i:07d}-{len(events) - first_event}", "request_id": rid, "event_type": kind,
+            "title": title, "description": None, "actor": actor, "created_at": at,
+        })
+
+    event("submitted", "Förfrågan inskickad", created, actor="Customer")
+    batch["notifications"].append({
+        "id": f"gen-notif-{i:07d}-c", "user_id": f"gen-user-{cust:06d}", "title": "Förfrågan mottagen",
+        "message": f"Din förfrågan '{title}' har tagits emot.", "notification_type": "success",
+        "is_read": status != RequestStatus.SUBMITTED, "link": rid, "created_at": created,
+    })
+    if priority == RequestPriority.URGENT:
+        batch["notifications"].append({
+            "id": f"gen-notif-{i:07d}-h", "user_id": "user-handler-1", "title": "🚨 Akut förfrågan",
+            "message": title, "notification_type": "urgent",
+            "is_read": status != RequestStatus.SUBMITTED, "link": rid, "created_at": created,
+        })
+
+    if status in (RequestStatus.SUBMITTED, RequestStatus.REJECTED):
+        return
+
+    assessed_at = created + timedelta(minutes=rng.randint(1, 120))
+    rating = _weighted(rng, RATING_WEIGHTS)
+    batch["assessments"].append({
+        "id": f"gen-fa-{i:07d}", "request_id": rid, "overall_rating": rating,
+        "confidence_score": round(rng.uniform(0.5, 1.0), 2),
+        "availability_score": rng.randint(30, 100), "skills_match_score": rng.randint(30, 100),
+        "budget_fit_score": rng.randint(30, 100), "timeline_score": rng.randint(20, 95),
+        "compliance_score": rng.choice([70, 80, 90, 100]),
+        "matching_consultants": json.dumps([c for c, _ in rng.sample(candidates, min(len(candidates), 4))]),
+        "risks": json.dumps([]), "recommendations": json.dumps([]), "alternatives": json.dumps([]),
+        "created_at": assessed_at,
+    })
+    event("assessment_completed", "Feasibility assessment completed", assessed_at, actor="AI Engine")
+
+    if status == RequestStatus.CANCELLED:
+        event("cancelled", "Förfrågan avbruten", assessed_at + timedelta(days=rng.randint(1, 20)), actor="Customer")
+        return
+
+    if not candidates:
+        return
+    consultant_id, rate = rng.choice(candidates)
+    assignment_status = "pending" if status == RequestStatus.ASSESSED else "confirmed"
+    if status == RequestStatus.ASSESSED and rng.random() < 0.5:
+        return
+    proposed_at = assessed_at + timedelta(days=rng.randint(0, 5))
+    batch["assignments"].append({
+        "id": f"gen-asgn-{i:07d}", "request_id": rid, "consultant_id": consultant_id,
+        "start_date": start, "end_date": start + timedelta(days=180), "hourly_rate": rate,
+        "status": assignment_status, "created_at": proposed_at,
+    })
+    event("consultant_assigned", "Konsult föreslagen", proposed_at, actor="Coordinator")
+    if assignment_status == "confirmed":
+        event("assignment_approved", "Konsult godkänd", proposed_at + timedelta(days=rng.randint(1, 4)), actor="Customer")
+    if status == RequestStatus.COMPLETED:
+        event("completed", "Uppdrag slutfört", start + timedelta(days=180), actor="Coordinator")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic Intelliplan dataset for load and scale testing.")
+    parser.add_argument("--customers", type=int, default=100)
+    parser.add_argument("--consultants", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--days", type=int, default=730, help="spread request creation over this many days")
+    parser.add_argument("--chunk-size", type=int, default=10_000)
+    parser.add_argument("--reset", action="store_true", help="drop and recreate all tables first")
+    args = parser.parse_args()
+    if min(args.customers, args.consultants, args.requests, args.days) < 0:
+        parser.error("--customers, --consultants, --requests and --days must not be negative")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+    if args.requests and args.customers < 1:
+        parser.error("--requests needs at least one customer (--customers >= 1)")
+
+    if args.reset:
+        Base.metadata.drop_all(bind=engine)
+    init_db()
+    db = SessionLocal()
+    try:
+        if db.query(Customer).filter(Customer.id.like("gen-%")).first():
+            parser.error("database already contains generated data; pass --reset to start over")
+        # Demo accounts (admin, handlers) are useful for load tests, so keep them alongside
+        seed_database(db)
+        started = time.perf_counter()
+        counts = generate_database(
+            db, args.customers, args.consultants, args.requests,
+            seed=args.seed, days=args.days, chunk_size=args.chunk_size,
+        )
+    finally:
+        db.close()
+
+    summary = ", ".join(f"{n} {k.replace('_', ' ')}" for k, n in counts.items())
+    print(f"✅ Generated in {time.perf_counter() - started:.1f}s: {summary}")
+    print(f"   Customer logins: kund<N>@gen.intelliplan.se / {GEN_PASSWORD}")
+
+
+if __name__ == "__main__":
+    main()
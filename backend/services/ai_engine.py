@@ -7,9 +7,12 @@ Uses rule-based logic with optional LLM (OpenAI) enhancement.
 
 import json
 import re
+from dataclasses import dataclass
 from datetime import datetime, timezone
 
 from backend.config import settings
+from backend.metrics import timed
+from backend.warmup import warmup_task
 
 # ── Skill taxonomy for matching ────────────────────────
 
@@ -32,9 +35,53 @@ PRIORITY_KEYWORDS = {
 }
 
 
+NICHE_SKILLS = frozenset({"rust", "scala", "computer vision", "deep learning", "flutter"})
+
+
+@dataclass(frozen=True)
+class _Matchers:
+    """The taxonomy tables above, flattened and indexed once for matching."""
+
+    skills: tuple[str, ...]  # every taxonomy skill once, in taxonomy order
+    skill_categories: dict[str, tuple[str, ...]]  # skill -> categories listing it
+    categories: tuple[str, ...]  # taxonomy order, used to break score ties
+    priorities: tuple[tuple[str, tuple[str, ...]], ...]
+    experience: re.Pattern
+    headcount: re.Pattern
+
+
+def _compile_matchers() -> _Matchers:
+    skill_categories: dict[str, list[str]] = {}
+    for category, skills in SKILL_CATEGORIES.items():
+        for skill in skills:
+            skill_categories.setdefault(skill.lower(), []).append(category)
+    return _Matchers(
+        skills=tuple(skill_categories),
+        skill_categories={skill: tuple(cats) for skill, cats in skill_categories.items()},
+        categories=tuple(SKILL_CATEGORIES),
+        priorities=tuple((p, tuple(keywords)) for p, keywords in PRIORITY_KEYWORDS.items()),
+        experience=re.compile(r"(\d+)\+?\s*(?:års?|years?)\s*(?:erfarenhet|experience)"),
+        headcount=re.compile(r"(\d+)\s*(?:konsulter|consultants|personer|people|resources)"),
+    )
+
+
 class AIEngine:
     """Core AI engine for request analysis and decision support."""
 
+    def __init__(self):
+        self._matchers: _Matchers | None = None
+
+    @property
+    def matchers(self) -> _Matchers:
+        if self._matchers is None:
+            self.compile()
+        return self._matchers
+
+    def compile(self) -> None:
+        """(Re)build the keyword matchers, e.g. after editing the taxonomy."""
+        self._matchers = _compile_matchers()
+
+    @timed("ai_engine.analyze_request")
     def analyze_request(self, title: str, description: str, skills: list[str] | None = None) -> dict:
         """
         Analyze a customer request and return AI-enriched data.
@@ -64,16 +111,12 @@ class AIEngine:
 
     def _extract_skills(self, text: str, provided_skills: list[str]) -> list[str]:
         """Extract skills from text and merge with provided skills."""
+        matchers = self.matchers
         found = set(s.lower().strip() for s in provided_skills)
-
-        for category, skills in SKILL_CATEGORIES.items():
-            for skill in skills:
-                if skill.lower() in text:
-                    found.add(skill)
+        found.update(skill for skill in matchers.skills if skill in text)
 
         # Also detect years of experience patterns
-        exp_pattern = r"(\d+)\+?\s*(?:års?|years?)\s*(?:erfarenhet|experience)"
-        matches = re.findall(exp_pattern, text)
+        matches = matchers.experience.findall(text)
         if matches:
             found.add(f"{matches[0]}+ years experience")
 
@@ -81,12 +124,11 @@ class AIEngine:
 
     def _categorize_request(self, skills: list[str], text: str) -> str:
         """Categorize the request based on skills and description."""
+        matchers = self.matchers
         category_scores: dict[str, int] = {}
-
-        for category, cat_skills in SKILL_CATEGORIES.items():
-            score = sum(1 for s in skills if s in cat_skills)
-            if score > 0:
-                category_scores[category] = score
+        for skill in skills:
+            for category in matchers.skill_categories.get(skill, ()):
+                category_scores[category] = category_scores.get(category, 0) + 1
 
         if not category_scores:
             # Fallback: check text for category hints
@@ -98,11 +140,11 @@ class AIEngine:
                 return "management"
             return "general"
 
-        return max(category_scores, key=category_scores.get)
+        return max((c for c in matchers.categories if c in category_scores), key=category_scores.get)
 
     def _detect_priority(self, text: str) -> str:
         """Detect priority from natural language."""
-        for priority, keywords in PRIORITY_KEYWORDS.items():
+        for priority, keywords in self.matchers.priorities:
             if any(kw in text for kw in keywords):
                 return priority
         return "medium"
@@ -122,13 +164,12 @@ class AIEngine:
             score += 0.1
 
         # Multi-person requests
-        numbers = re.findall(r"(\d+)\s*(?:konsulter|consultants|personer|people|resources)", text)
+        numbers = self.matchers.headcount.findall(text)
         if numbers and int(numbers[0]) > 2:
             score += 0.15
 
         # Niche skills increase complexity
-        niche_skills = {"rust", "scala", "computer vision", "deep learning", "flutter"}
-        if any(s in niche_skills for s in skills):
+        if any(s in NICHE_SKILLS for s in skills):
             score += 0.1
 
         return min(round(score, 2), 1.0)
@@ -154,7 +195,7 @@ class AIEngine:
         if len(skills) > 5:
             insights.append("🔍 Many required skills — a senior/lead profile may be needed")
 
-        niche = [s for s in skills if s in {"rust", "scala", "computer vision", "deep learning", "flutter"}]
+        niche = [s for s in skills if s in NICHE_SKILLS]
         if niche:
             insights.append(f"💎 Niche skills detected ({', '.join(niche)}) — limited pool expected")
 
@@ -209,3 +250,4 @@ class AIEngine:
 
 # Singleton
 ai_engine = AIEngine()
+warmup_task("ai_engine.matchers")(ai_engine.compile)
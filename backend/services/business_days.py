@@ -0,0 +1,142 @@
+"""
+Swedish business-day calendar.
+
+Business days are Monday to Friday, except Swedish public holidays (lag
+1989:253 om allmänna helgdagar) and the eves that are days off in practice:
+midsummer, Christmas and New Year's Eve. Holidays are derived from their
+rules, with Easter from the Gregorian computus, so no data file or network
+access is needed.
+
+The calendar precomputes a cumulative count of business days for a range of
+years. The number of business days between two dates is then one array
+subtraction, cheap enough to run for every request in a bulk assessment.
+The table is extended on demand up to ``MIN_YEAR``..``MAX_YEAR``; dates past
+that count weekdays only, in closed form, so an absurd date (year 9999) costs
+nothing and cannot grow the table.
+"""
+
+import threading
+from array import array
+from datetime import date, datetime, timedelta
+
+
+def easter_sunday(year: int) -> date:
+    """Gregorian Easter Sunday (anonymous Gregorian algorithm)."""
+    a = year % 19
+    b, c = divmod(year, 100)
+    d, e = divmod(b, 4)
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = divmod(c, 4)
+    l = (32 + 2 * e + 2 * i - h - k) % 7
+    m = (a + 11 * h + 22 * l) // 451
+    month, day = divmod(h + l - 7 * m + 114, 31)
+    return date(year, month, day + 1)
+
+
+# Bounds for extending the holiday table; beyond them only weekends count
+MIN_YEAR, MAX_YEAR = 1900, 2200
+
+
+def _weekdays_before(ordinal: int) -> int:
+    """Weekdays from 0001-01-01 (a Monday) up to, not including, the day with this ordinal."""
+    weeks, rest = divmod(ordinal - 1, 7)
+    return weeks * 5 + min(rest, 5)
+
+
+def _first_weekday_from(start: date, weekday: int) -> date:
+    return start + timedelta(days=(weekday - start.weekday()) % 7)
+
+
+def swedish_holidays(year: int) -> dict[date, str]:
+    """Days off in ``year``: public holidays plus midsummer, Christmas and New Year's Eve."""
+    easter = easter_sunday(year)
+    midsummer_eve = _first_weekday_from(date(year, 6, 19), 4)  # Friday 19–25 June
+    return {
+        date(year, 1, 1): "Nyårsdagen",
+        date(year, 1, 6): "Trettondedag jul",
+        easter - timedelta(days=2): "Långfredagen",
+        easter: "Påskdagen",
+        easter + timedelta(days=1): "Annandag påsk",
+        date(year, 5, 1): "Första maj",
+        easter + timedelta(days=39): "Kristi himmelsfärdsdag",
+        easter + timedelta(days=49): "Pingstdagen",
+        date(year, 6, 6): "Sveriges nationaldag",
+        midsummer_eve: "Midsommarafton",
+        midsummer_eve + timedelta(days=1): "Midsommardagen",
+        _first_weekday_from(date(year, 10, 31), 5): "Alla helgons dag",  # Saturday 31 Oct – 6 Nov
+        date(year, 12, 24): "Julafton",
+        date(year, 12, 25): "Juldagen",
+        date(year, 12, 26): "Annandag jul",
+        date(year, 12, 31): "Nyårsafton",
+    }
+
+
+def _as_date(value: date | datetime) -> date:
+    return value.date() if isinstance(value, datetime) else value
+
+
+class BusinessCalendar:
+    """Business-day arithmetic over a precomputed range of years (extended on demand)."""
+
+    def __init__(self, first_year: int, last_year: int):
+        self._lock = threading.Lock()
+        self._build(first_year, last_year)
+
+    def _build(self, first_year: int, last_year: int) -> None:
+        holidays: set[date] = set()
+        for year in range(first_year, last_year + 1):
+            holidays.update(swedish_holidays(year))
+        origin = date(first_year, 1, 1)
+        days = (date(last_year + 1, 1, 1) - origin).days
+        # cumulative[i] = business days in [origin, origin + i)
+        cumulative = array("i", [0]) * (days + 1)
+        count = 0
+        day = origin
+        for i in range(days):
+            if day.weekday() < 5 and day not in holidays:
+                count += 1
+            cumulative[i + 1] = count
+            day += timedelta(days=1)
+        # Swap in one assignment so concurrent readers see a consistent table
+        self._table = (origin.toordinal(), first_year, last_year, cumulative)
+
+    def _covering(self, *days: date) -> tuple:
+        table = self._table
+        years = [min(max(d.year, MIN_YEAR), MAX_YEAR) for d in days]
+        if all(table[1] <= y <= table[2] for y in years):
+            return table
+        with self._lock:
+            _, first_year, last_year, _ = self._table
+            self._build(min(first_year, *years), max(last_year, *years))
+            return self._table
+
+    @staticmethod
+    def _count_before(table: tuple, day: date) -> int:
+        """Business days before ``day``, counted from 0001-01-01 (weekdays only outside the table)."""
+        origin, _, _, cumulative = table
+        i = day.toordinal() - origin
+        if i < 0:
+            return _weekdays_before(day.toordinal())
+        end = len(cumulative) - 1
+        if i > end:
+            return _weekdays_before(origin) + cumulative[end] + _weekdays_before(day.toordinal()) - _weekdays_before(origin + end)
+        return _weekdays_before(origin) + cumulative[i]
+
+    def is_business_day(self, day: date | datetime) -> bool:
+        day = _as_date(day)
+        origin, _, _, cumulative = self._covering(day)
+        i = day.toordinal() - origin
+        if not 0 <= i < len(cumulative) - 1:
+            return day.weekday() < 5
+        return cumulative[i + 1] > cumulative[i]
+
+    def business_days_between(self, start: date | datetime, end: date | datetime) -> int:
+        """Business days in [start, end): from ``start`` up to, not including, ``end`` (negative if reversed)."""
+        start, end = _as_date(start), _as_date(end)
+        table = self._covering(start, end)
+        return self._count_before(table, end) - self._count_before(table, start)
+
+# Singleton
+business_calendar = BusinessCalendar(2015, 2045)
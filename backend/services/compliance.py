@@ -2,76 +2,487 @@
 Compliance Engine.
 
 Checks staffing requests against rules, regulations, and contract terms.
+
+Rules live in the ``compliance_rules`` table. A rule's JSON ``condition`` maps
+condition keys to parameters (``{"min_budget_ratio": 0.5}``). Each key is
+compiled once, by the factory registered for it with ``@condition``, into a
+predicate over ``RequestFacts``: aggregates of the request and the consultant
+pool, computed in one pass per check. A key may also have a per-candidate
+check (``@candidate_condition``) that ``check_assignments`` runs over the
+candidate columns, with the rule's severity. The built-in ``DEFAULT_RULES`` apply to
+every condition key the table does not mention, so adding a row for a key (or
+deactivating it) retunes or switches off the built-in rule.
+
+The compiled rule set is rebuilt after a commit in this process changes
+``compliance_rules``. Edits made by other workers are noticed by polling the
+table's (row count, last change) stamp every ``COMPLIANCE_RULES_SYNC_S``
+seconds. Callers working on another database (benchmarks, tests, scripts)
+pass their session, and get that database's rules, compiled fresh and not
+cached.
+
+``check_request`` results are kept in a bounded LRU keyed by the request's
+fingerprint, the customer's contract type, the consultant-pool version and
+the rule-set generation. Commits touching consultants, assignments or rules
+clear it; ``COMPLIANCE_CACHE_TTL_S`` bounds how long another worker's
+consultant edits can go unseen.
 """
 
 import json
-from backend.models import StaffingRequest, Consultant, ConsultantStatus
+import logging
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable
+
+from sqlalchemy import func, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from backend import versioning
+from backend.config import settings
+from backend.database import engine
+from backend.metrics import cache_lookups, timed
+from backend.models import ComplianceRule, StaffingRequest, Consultant, ConsultantStatus
+from backend.services.business_days import business_calendar
+from backend.services.consultant_pool import POOL_VERSION
+from backend.services.shared_pool import PoolColumns
+from backend.services.workload import DEFAULT_HOURS_PER_WEEK, workload
+from backend.warmup import warmup_task
+
+logger = logging.getLogger(__name__)
 
+RULES_VERSION = "compliance_rules"
+versioning.track(RULES_VERSION, ComplianceRule)
 
-# Built-in compliance rules
+# Built-in compliance rules, used for condition keys the table does not define
 DEFAULT_RULES = [
     {
         "id": "max_hours_weekly",
         "name": "Maximum Weekly Hours",
         "description": "EU Working Time Directive — max 48h/week",
         "severity": "blocking",
-        "check": "weekly_hours",
+        "condition": {"max_weekly_hours": 48},
     },
     {
         "id": "notice_period",
         "name": "Minimum Notice Period",
         "description": "Assignments require at least 5 business days notice",
         "severity": "warning",
-        "check": "notice_days",
-        "min_days": 5,
+        "condition": {"min_notice_days": 5},
     },
     {
         "id": "contract_coverage",
         "name": "Contract Coverage",
         "description": "Customer must have an active framework agreement",
         "severity": "blocking",
-        "check": "contract",
+        "condition": {"require_contract": True},
     },
     {
         "id": "rate_cap",
         "name": "Rate Cap Compliance",
         "description": "Hourly rate must not exceed contract maximum",
         "severity": "warning",
-        "check": "rate_cap",
+        "condition": {"min_budget_ratio": 0.5},
     },
     {
         "id": "consultant_availability",
         "name": "Consultant Availability Verification",
         "description": "Consultant must not have conflicting assignments",
         "severity": "blocking",
-        "check": "availability",
+        "condition": {"require_available": True},
     },
 ]
 
+_AVAILABLE = (ConsultantStatus.AVAILABLE, ConsultantStatus.ENDING_SOON)
+_UNAVAILABLE = (
+    (ConsultantStatus.ASSIGNED, "is currently assigned to another customer"),
+    (ConsultantStatus.ON_LEAVE, "is currently on leave"),
+)
+
+
+@dataclass(frozen=True)
+class RequestFacts:
+    """What the rules look at, computed once per check."""
+
+    contract_type: str | None
+    budget_max_hourly: float | None
+    start_date: datetime | None
+    notice_business_days: int | None  # business days from today until the start date
+    pool_size: int
+    available_count: int
+    avg_rate: float
+
+
+def request_facts(request: StaffingRequest, consultants: list[Consultant] | PoolColumns) -> RequestFacts:
+    if isinstance(consultants, PoolColumns):
+        available = consultants.status_rows(*_AVAILABLE).bit_count()
+        total_rate = sum(consultants.rates, 0.0)
+    else:
+        available = 0
+        total_rate = 0.0
+        for c in consultants:
+            if c.status in _AVAILABLE:
+                available += 1
+            total_rate += c.hourly_rate
+    notice = None
+    if request.start_date:
+        notice = business_calendar.business_days_between(datetime.now(timezone.utc), request.start_date)
+    return RequestFacts(
+        contract_type=request.customer.contract_type if request.customer else None,
+        budget_max_hourly=request.budget_max_hourly,
+        start_date=request.start_date,
+        notice_business_days=notice,
+        pool_size=len(consultants),
+        available_count=available,
+        avg_rate=total_rate / max(len(consultants), 1),
+    )
+
+
+Predicate = Callable[[RequestFacts], str | None]  # risk description, or None when the rule holds
+
+CONDITIONS: dict[str, Callable[[Any], Predicate | None]] = {}
+
+
+def condition(key: str):
+    """Decorator: register the factory compiling condition ``key``'s parameter into a predicate."""
+    def decorator(factory: Callable[[Any], Predicate | None]):
+        CONDITIONS[key] = factory
+        return factory
+    return decorator
+
+
+@condition("min_notice_days")
+def _min_notice_days(days) -> Predicate:
+    def check(f: RequestFacts) -> str | None:
+        if f.notice_business_days is not None and f.notice_business_days < days:
+            return f"Start date leaves {max(f.notice_business_days, 0)} business days notice (minimum {days})"
+        return None
+    return check
+
+
+@condition("require_contract")
+def _require_contract(required) -> Predicate | None:
+    if not required:
+        return None
+    return lambda f: "Customer has no active framework agreement" if f.contract_type == "none" else None
+
+
+@condition("min_budget_ratio")
+def _min_budget_ratio(ratio) -> Predicate:
+    def check(f: RequestFacts) -> str | None:
+        if f.budget_max_hourly and f.budget_max_hourly < f.avg_rate * ratio:
+            return "Budget significantly below market rates"
+        return None
+    return check
+
+
+@condition("require_available")
+def _require_available(required) -> Predicate | None:
+    if not required:
+        return None
+    return lambda f: "No consultants available for verification" if f.available_count == 0 else None
+
+
+class CandidateFacts:
+    """The candidate columns ``check_assignments`` evaluates, for one request."""
+
+    def __init__(
+        self, request: StaffingRequest, consultants: list[Consultant], hours_per_week: float,
+        db: Session | None = None,
+    ):
+        self.request = request
+        self.consultants = consultants
+        self.names = [c.name for c in consultants]
+        self.statuses = [c.status for c in consultants]
+        self.rates = array("d", [c.hourly_rate or 0.0 for c in consultants])
+        self.hours_per_week = hours_per_week
+        self._db = db
+        self._workload = None
+
+    @property
+    def workload(self):
+        """Weekly loads of the caller's database, loaded on first use."""
+        if self._workload is None:
+            self._workload = workload.for_session(self._db)
+        return self._workload
+
+
+# (candidate index, message) for each candidate the rule flags
+CandidateCheck = Callable[[CandidateFacts], Iterable[tuple[int, str]]]
+
+# condition key -> (issue name reported per candidate, factory)
+CANDIDATE_CONDITIONS: dict[str, tuple[str, Callable[[Any], CandidateCheck | None]]] = {}
+
+
+def candidate_condition(key: str, issue: str):
+    """Decorator: register the per-candidate check for condition ``key``; its issues are named ``issue``."""
+    def decorator(factory: Callable[[Any], CandidateCheck | None]):
+        CANDIDATE_CONDITIONS[key] = (issue, factory)
+        return factory
+    return decorator
+
+
+@candidate_condition("require_available", "availability")
+def _candidate_available(required) -> CandidateCheck | None:
+    if not required:
+        return None
+
+    def check(f: CandidateFacts):
+        # Already assigned elsewhere / on leave
+        for status, reason in _UNAVAILABLE:
+            for i in [i for i, s in enumerate(f.statuses) if s == status]:
+                yield i, f"{f.names[i]} {reason}"
+    return check
+
+
+@candidate_condition("min_budget_ratio", "rate_cap")
+def _candidate_rate(ratio) -> CandidateCheck:
+    def check(f: CandidateFacts):
+        budget = f.request.budget_max_hourly
+        if budget:
+            for i in [i for i, r in enumerate(f.rates) if r > budget]:
+                yield i, f"Consultant rate ({f.consultants[i].hourly_rate}/h) exceeds budget ({budget}/h)"
+    return check
+
+
+@candidate_condition("max_weekly_hours", "max_hours_weekly")
+def _candidate_weekly_hours(limit) -> CandidateCheck | None:
+    if not isinstance(limit, (int, float)) or isinstance(limit, bool):
+        return None
+
+    def check(f: CandidateFacts):
+        # Reads each candidate's load buckets for just the weeks the request covers
+        if not f.hours_per_week:
+            return
+        request = f.request
+        start = request.start_date or datetime.now(timezone.utc)
+        for i, c in enumerate(f.consultants):
+            total = f.workload.peak(c.id, start, request.end_date, exclude_request=request.id) + f.hours_per_week
+            if total > limit + 1e-6:
+                yield i, f"{f.names[i]} would work {total:g}h in a week (max {limit:g}h)"
+    return check
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    id: str
+    name: str
+    severity: str
+    predicates: tuple[Predicate, ...]
+    operation: str  # timed() label
+    params: dict  # the parsed condition
+    candidate_checks: tuple[tuple[str, CandidateCheck], ...] = ()  # (issue name, check)
+
+    def evaluate(self, facts: RequestFacts) -> str | None:
+        for predicate in self.predicates:
+            message = predicate(facts)
+            if message:
+                return f"{self.name}: {message}"
+        return None
+
+
+_unknown_reported: set[tuple[str, str]] = set()
+
+
+def compile_rule(rule_id: str, name: str, severity: str, condition: dict) -> CompiledRule:
+    predicates = []
+    candidate_checks = []
+    for key, param in condition.items():
+        factory = CONDITIONS.get(key)
+        candidate = CANDIDATE_CONDITIONS.get(key)
+        if factory is None and candidate is None:
+            if (rule_id, key) not in _unknown_reported:
+                _unknown_reported.add((rule_id, key))
+                logger.warning("Compliance rule '%s': no evaluator for condition '%s', ignored", name, key)
+            continue
+        predicate = factory(param) if factory is not None else None
+        if predicate is not None:
+            predicates.append(predicate)
+        check = candidate[1](param) if candidate is not None else None
+        if check is not None:
+            candidate_checks.append((candidate[0], check))
+    return CompiledRule(
+        rule_id, name, severity or "warning", tuple(predicates), f"compliance.rule.{rule_id}", condition,
+        tuple(candidate_checks),
+    )
+
+
+def compile_rules(rows) -> tuple[CompiledRule, ...]:
+    """Compile the table's active rules, plus the defaults for condition keys it leaves out."""
+    defined: set[str] = set()
+    compiled = []
+    for row in rows:
+        try:
+            cond = json.loads(row.condition) if row.condition else {}
+        except ValueError:
+            logger.warning("Compliance rule '%s' has an invalid condition, skipped", row.name)
+            continue
+        defined.update(cond)
+        if row.is_active:
+            compiled.append(compile_rule(row.id, row.name, row.severity, cond))
+    defaults = [
+        compile_rule(rule["id"], rule["name"], rule["severity"], rule["condition"])
+        for rule in DEFAULT_RULES if not defined.intersection(rule["condition"])
+    ]
+    return tuple(defaults + compiled)
+
+
+def _read_rules(conn):
+    return conn.execute(select(
+        ComplianceRule.id, ComplianceRule.name, ComplianceRule.severity,
+        ComplianceRule.condition, ComplianceRule.is_active,
+    ).order_by(ComplianceRule.created_at, ComplianceRule.id)).all()
+
+
+def _copy_result(result: dict) -> dict:
+    return {k: list(v) if isinstance(v, list) else v for k, v in result.items()}
+
+
+class ResultCache:
+    """Bounded LRU of check results; entries expire after ``ttl_s`` seconds."""
+
+    def __init__(self, name: str, max_entries: int = 1024, ttl_s: float = 30.0):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl_s = ttl_s
+        self._entries: OrderedDict[tuple, tuple[dict, float]] = OrderedDict()  # key -> (result, valid until)
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        cache_lookups.inc(cache=self.name, result="miss" if entry is None else "hit")
+        return None if entry is None else _copy_result(entry[0])
+
+    def put(self, key: tuple, result: dict) -> None:
+        with self._lock:
+            self._entries[key] = (_copy_result(result), time.monotonic() + self.ttl_s)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
 
 class ComplianceEngine:
     """Check requests and assignments against compliance rules."""
 
-    def __init__(self):
-        self.rules = DEFAULT_RULES
+    def __init__(self, sync_s: float = 5.0, cache_size: int = 1024, cache_ttl_s: float = 30.0):
+        self.sync_s = sync_s
+        self.results = ResultCache("compliance.check_request", cache_size, cache_ttl_s)
+        self._generation = 0  # bumped on every reload; part of the result cache key
+        self._rules: tuple[CompiledRule, ...] | None = None
+        self._version = -1  # versioning counter the rules were compiled at
+        self._stamp = None  # (row count, last change) of the table at that time
+        self._next_sync = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def rules(self) -> tuple[CompiledRule, ...]:
+        """The compiled rule set, recompiled when the table has changed."""
+        if self._rules is None or self._version != versioning.current(RULES_VERSION):
+            self.reload()
+        elif time.monotonic() >= self._next_sync:
+            self._next_sync = time.monotonic() + self.sync_s
+            if self._read_stamp() != self._stamp:
+                self.reload()
+        return self._rules
+
+    def rules_for(self, db: Session | None = None) -> tuple[CompiledRule, ...]:
+        """
+        The rules of the caller's database: the cached set for the
+        application's, a fresh compile (not kept) for any other bind.
+        """
+        if db is not None and db.get_bind() is not engine:
+            return compile_rules(_read_rules(db.connection()))
+        return self.rules
+
+    def reload(self) -> None:
+        """Load and compile the rules now."""
+        with self._lock:
+            version = versioning.current(RULES_VERSION)  # read first: a commit during the load reloads again
+            try:
+                with engine.connect() as conn:
+                    stamp = self._read_stamp(conn)
+                    rows = _read_rules(conn)
+            except SQLAlchemyError:
+                logger.warning("Could not load compliance rules, keeping the %s set",
+                               "current" if self._rules is not None else "built-in")
+                stamp, rows = self._stamp, None
+            if rows is not None or self._rules is None:
+                self._rules = compile_rules(rows or ())
+                self._generation += 1
+                self.results.clear()
+            self._version = version
+            self._stamp = stamp
+            self._next_sync = time.monotonic() + self.sync_s
+
+    def _read_stamp(self, conn=None):
+        query = select(func.count(), func.max(func.coalesce(ComplianceRule.updated_at, ComplianceRule.created_at)))
+        try:
+            if conn is not None:
+                return tuple(conn.execute(query).one())
+            with engine.connect() as conn:
+                return tuple(conn.execute(query).one())
+        except SQLAlchemyError:
+            return self._stamp
 
-    def check_request(self, request: StaffingRequest, consultants: list[Consultant]) -> dict:
+    def _cache_key(self, request: StaffingRequest, consultants: list[Consultant] | PoolColumns) -> tuple:
+        # Notice is counted from today, so the day is part of the request's fingerprint
+        fingerprint = (
+            request.id, request.budget_max_hourly, request.start_date,
+            datetime.now(timezone.utc).date(), len(consultants),
+        )
+        contract_type = request.customer.contract_type if request.customer else None
+        return fingerprint, contract_type, versioning.current(POOL_VERSION), self._generation
+
+    @timed("compliance.check_request")
+    def check_request(
+        self, request: StaffingRequest, consultants: list[Consultant] | PoolColumns, db: Session | None = None,
+    ) -> dict:
         """
         Run all compliance checks on a request.
 
+        ``consultants`` is the whole consultant pool (a list, or the shared columns). Results are cached per
+        request fingerprint, customer contract type, pool version and rule
+        set; a commit touching consultants, assignments or rules invalidates
+        them. Pass ``db`` to check against another database's rules
+        (uncached).
+
         Returns dict with:
           - score: 0-100
           - risks: list of compliance risk descriptions
           - violations: list of blocking violations
           - warnings: list of non-blocking warnings
         """
+        foreign = db is not None and db.get_bind() is not engine
+        rules = self.rules_for(db)
+        key = None if foreign else self._cache_key(request, consultants)
+        cached = self.results.get(key) if key is not None else None
+        if cached is not None:
+            return cached
+        facts = request_facts(request, consultants)
         violations = []
         warnings = []
 
-        for rule in self.rules:
-            result = self._run_check(rule, request, consultants)
+        for rule in rules:
+            with timed(rule.operation):
+                result = rule.evaluate(facts)
             if result:
-                if rule["severity"] == "blocking":
+                if rule.severity == "blocking":
                     violations.append(result)
                 else:
                     warnings.append(result)
@@ -82,80 +493,59 @@ class ComplianceEngine:
 
         risks = [f"🚫 {v}" for v in violations] + [f"⚠️ {w}" for w in warnings]
 
-        return {
+        result = {
             "score": score,
             "risks": risks,
             "violations": violations,
             "warnings": warnings,
-            "rules_checked": len(self.rules),
+            "rules_checked": len(rules),
             "passed": len(violations) == 0,
         }
+        if key is not None:
+            self.results.put(key, result)
+        return result
 
-    def check_assignment(self, consultant: Consultant, request: StaffingRequest) -> dict:
+    def check_assignment(
+        self, consultant: Consultant, request: StaffingRequest, hours_per_week: float = DEFAULT_HOURS_PER_WEEK,
+        db: Session | None = None,
+    ) -> dict:
         """Check compliance for a specific consultant-request assignment."""
-        issues = []
-
-        # Check if consultant is already assigned elsewhere
-        if consultant.status == ConsultantStatus.ASSIGNED:
-            issues.append({
-                "rule": "availability",
-                "severity": "blocking",
-                "message": f"{consultant.name} is currently assigned to another customer",
-            })
-
-        # Check if consultant is on leave
-        if consultant.status == ConsultantStatus.ON_LEAVE:
-            issues.append({
-                "rule": "availability",
-                "severity": "blocking",
-                "message": f"{consultant.name} is currently on leave",
-            })
-
-        # Rate check
-        if request.budget_max_hourly and consultant.hourly_rate > request.budget_max_hourly:
-            issues.append({
-                "rule": "rate_cap",
-                "severity": "warning",
-                "message": f"Consultant rate ({consultant.hourly_rate}/h) exceeds budget ({request.budget_max_hourly}/h)",
-            })
-
-        return {
-            "compliant": len([i for i in issues if i["severity"] == "blocking"]) == 0,
-            "issues": issues,
-        }
+        return self.check_assignments(request, [consultant], hours_per_week, db)[0]
 
-    def _run_check(self, rule: dict, request: StaffingRequest, consultants: list[Consultant]) -> str | None:
-        """Run a single compliance check. Returns risk description or None."""
-        check_type = rule.get("check")
-
-        if check_type == "notice_days":
-            # Simplified: always pass for now since we don't have exact business day calc
-            return None
-
-        if check_type == "contract":
-            # Check customer contract type
-            if request.customer and hasattr(request.customer, 'contract_type'):
-                if request.customer.contract_type == "none":
-                    return f"{rule['name']}: Customer has no active framework agreement"
-            return None
-
-        if check_type == "availability":
-            available = [c for c in consultants if c.status in (
-                ConsultantStatus.AVAILABLE, ConsultantStatus.ENDING_SOON
-            )]
-            if len(available) == 0:
-                return f"{rule['name']}: No consultants available for verification"
-            return None
-
-        if check_type == "rate_cap":
-            if request.budget_max_hourly:
-                avg_rate = sum(c.hourly_rate for c in consultants) / max(len(consultants), 1)
-                if request.budget_max_hourly < avg_rate * 0.5:
-                    return f"{rule['name']}: Budget significantly below market rates"
-            return None
+    @timed("compliance.check_assignments")
+    def check_assignments(
+        self, request: StaffingRequest, consultants: list[Consultant],
+        hours_per_week: float = DEFAULT_HOURS_PER_WEEK, db: Session | None = None,
+    ) -> list[dict]:
+        """
+        Check a whole candidate list at once; one result per consultant, in order.
 
-        return None
+        Every active rule with a per-candidate check runs it over the whole
+        candidate set, and its issues carry the rule's severity: a blocking
+        one makes the candidate non-compliant. The checks are single passes
+        over the status or rate column, and the weekly-hours check reads each
+        candidate's load buckets for just the weeks the request covers. Pass
+        ``db`` to use another database's rules and assignments.
+        """
+        facts = CandidateFacts(request, consultants, hours_per_week, db)
+        n = len(consultants)
+        issues: list[list[dict]] = [[] for _ in range(n)]
+        blocked = bytearray(n)
+
+        for rule in self.rules_for(db):
+            for issue, check in rule.candidate_checks:
+                with timed(rule.operation):
+                    for i, message in check(facts):
+                        issues[i].append({"rule": issue, "severity": rule.severity, "message": message})
+                        if rule.severity == "blocking":
+                            blocked[i] = 1
 
+        return [{"compliant": not blocked[i], "issues": issues[i]} for i in range(n)]
 
 # Singleton
-compliance_engine = ComplianceEngine()
+compliance_engine = ComplianceEngine(
+    settings.compliance_rules_sync_s, settings.compliance_cache_size, settings.compliance_cache_ttl_s,
+)
+versioning.subscribe(POOL_VERSION, compliance_engine.results.clear)
+versioning.subscribe(RULES_VERSION, compliance_engine.results.clear)
+warmup_task("compliance.rules")(compliance_engine.reload)
@@ -0,0 +1,171 @@
+"""
+Process-wide snapshot of the consultant pool.
+
+The consultant list reads every consultant with all display fields. Instead
+of loading full ORM objects (and re-parsing skills JSON per row) each time, it
+reads one immutable snapshot: a tuple of slotted ``ConsultantRecord`` rows, in
+table order and by name, with skills parsed once into a list for output and a
+lowercased ``skill_set`` for matching. The snapshot is built on first use.
+Matching and assessments need only a few columns and read the much smaller
+``backend.services.shared_pool`` instead.
+
+The snapshot is rebuilt lazily, with a single Core query, when the
+``consultant_pool`` version has moved on: commits in this process that touch
+consultants or assignments bump it (see ``backend.versioning``). Changes made
+by other workers are noticed by polling the table's (row count, last change)
+stamp every ``CONSULTANT_POOL_SYNC_S`` seconds, which bumps the version too.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import orjson
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from backend import versioning
+from backend.config import settings
+from backend.database import engine
+from backend.models import Assignment, Consultant, ConsultantStatus
+
+POOL_VERSION = "consultant_pool"
+versioning.track(POOL_VERSION, Consultant, Assignment)
+
+
+@dataclass(frozen=True, slots=True)
+class ConsultantRecord:
+    """Read-only consultant row; duck-types the ``Consultant`` attributes the services read."""
+
+    id: str
+    name: str
+    email: str
+    title: str | None
+    skills: str | None  # as stored (JSON-encoded list)
+    skill_list: list | str | None  # parsed for output
+    skill_set: frozenset[str]  # lowercased, for matching
+    hourly_rate: float
+    status: ConsultantStatus
+    availability_date: datetime | None
+    current_customer_id: str | None
+    created_at: datetime | None
+
+    def as_dict(self) -> dict:
+        """ConsultantOut-shaped dict for orjson."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "email": self.email,
+            "title": self.title,
+            "skills": self.skill_list,
+            "hourly_rate": self.hourly_rate,
+            "status": self.status.value if self.status is not None else None,
+            "availability_date": self.availability_date,
+            "created_at": self.created_at,
+        }
+
+
+def parse_skills(raw: str | None) -> tuple[list | str | None, frozenset[str]]:
+    """(skills for output, lowercased skill set); text that is not JSON is a comma-separated list."""
+    if raw is None:
+        return None, frozenset()
+    try:
+        parsed = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return [raw], frozenset(s.strip().lower() for s in raw.split(",") if s.strip())
+    try:
+        return parsed, frozenset(map(str.lower, parsed))
+    except TypeError:
+        return parsed, frozenset()
+
+
+_COLUMNS = (
+    Consultant.id, Consultant.name, Consultant.email, Consultant.title, Consultant.skills,
+    Consultant.hourly_rate, Consultant.status, Consultant.availability_date,
+    Consultant.current_customer_id, Consultant.created_at,
+)
+
+
+@dataclass(frozen=True)
+class PoolSnapshot:
+    """All consultants at one pool version."""
+
+    records: tuple[ConsultantRecord, ...]  # table order, as an unordered query returns them
+    by_name: tuple[ConsultantRecord, ...] = field(repr=False)
+    by_id: dict[str, ConsultantRecord] = field(repr=False)
+
+    @classmethod
+    def build(cls, conn) -> "PoolSnapshot":
+        records = []
+        for cid, name, email, title, skills, rate, status, available, customer_id, created in conn.execute(
+            select(*_COLUMNS)
+        ).tuples():
+            records.append(ConsultantRecord(
+                cid, name, email, title, skills, *parse_skills(skills),
+                rate or 0.0, status, available, customer_id, created,
+            ))
+        by_name = tuple(sorted(records, key=lambda r: r.name))
+        return cls(tuple(records), by_name, {r.id: r for r in records})
+
+    def with_status(self, status: str) -> list[ConsultantRecord]:
+        """Records (by name) whose status matches ``status`` by value or by name."""
+        return [r for r in self.by_name if r.status is not None and status in (r.status.value, r.status.name)]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+
+class ConsultantPool:
+    """Holder of the current snapshot, rebuilt when the pool version or table stamp changes."""
+
+    def __init__(self, sync_s: float = 5.0):
+        self.sync_s = sync_s
+        self._snapshot: PoolSnapshot | None = None
+        self._version = -1
+        self._stamp = None
+        self._next_sync = 0.0
+        self._lock = threading.Lock()
+
+    def snapshot(self, db: Session | None = None) -> PoolSnapshot:
+        """
+        The current pool. Pass the caller's session to read a database other
+        than the application's (benchmarks, scripts): that snapshot is built
+        fresh and not kept.
+        """
+        if db is not None and db.get_bind() is not engine:
+            return PoolSnapshot.build(db.connection())
+        if self._snapshot is None or self._version != versioning.current(POOL_VERSION):
+            self.reload()
+        elif time.monotonic() >= self._next_sync:
+            self._next_sync = time.monotonic() + self.sync_s
+            if self._read_stamp() != self._stamp:
+                versioning.bump(POOL_VERSION)  # another worker's change: caches keyed on the pool follow
+                self.reload()
+        return self._snapshot
+
+    def reload(self) -> None:
+        """Build a new snapshot now."""
+        with self._lock:
+            version = versioning.current(POOL_VERSION)  # read first: a commit during the build rebuilds again
+            with engine.connect() as conn:
+                stamp = self._read_stamp(conn)
+                snapshot = PoolSnapshot.build(conn)
+            self._snapshot, self._version, self._stamp = snapshot, version, stamp
+            self._next_sync = time.monotonic() + self.sync_s
+
+    def _read_stamp(self, conn=None):
+        return read_stamp(conn)
+
+
+def read_stamp(conn=None) -> tuple:
+    """(row count, last change) of the consultants table; changes whenever a row does."""
+    query = select(func.count(), func.max(func.coalesce(Consultant.updated_at, Consultant.created_at)))
+    if conn is not None:
+        return tuple(conn.execute(query).one())
+    with engine.connect() as conn:
+        return tuple(conn.execute(query).one())
+
+
+# Singleton
+consultant_pool = ConsultantPool(settings.consultant_pool_sync_s)
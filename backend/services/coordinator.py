@@ -6,13 +6,19 @@ and manages the lifecycle of coordinated actions.
 """
 
 import json
+import uuid
 from datetime import datetime, timezone
+from typing import Callable
 
 from sqlalchemy.orm import Session
 
+from backend.config import settings
+from backend.metrics import timed
 from backend.models import (
     ActionStatus,
+    Job,
     CoordinationAction,
+    RequestPriority,
     RequestStatus,
     StaffingRequest,
     TimelineEvent,
@@ -20,9 +26,17 @@ from backend.models import (
     Consultant,
     ConsultantStatus,
 )
+from backend.services.jobs import job_handler, job_queue
+from backend.services.plan_executor import ActionContext, ActionPolicy, PlanExecutor
+from backend.services.workload import DEFAULT_HOURS_PER_WEEK
 
+COORDINATION_JOB = "coordination.execute_plan"
 
-# Action templates for different scenarios
+
+# Action templates for different scenarios.
+# ``depends_on`` lists action types within the same plan that must complete
+# first; steps without it are ready immediately. ``timeout_s`` / ``retries``
+# override the executor defaults per step.
 ACTION_TEMPLATES = {
     "standard_staffing": [
         {
@@ -32,22 +46,27 @@ ACTION_TEMPLATES = {
         {
             "action_type": "run_feasibility",
             "description": "Run automated feasibility assessment",
+            "depends_on": ["verify_requirements"],
         },
         {
             "action_type": "match_consultants",
             "description": "Match and rank available consultants",
+            "depends_on": ["run_feasibility"],
         },
         {
             "action_type": "compliance_check",
             "description": "Run compliance checks on proposed matches",
+            "depends_on": ["match_consultants"],
         },
         {
             "action_type": "prepare_proposal",
             "description": "Prepare staffing proposal for customer review",
+            "depends_on": ["compliance_check"],
         },
         {
             "action_type": "notify_customer",
             "description": "Send proposal and status update to customer",
+            "depends_on": ["prepare_proposal"],
         },
     ],
     "urgent_staffing": [
@@ -58,14 +77,17 @@ ACTION_TEMPLATES = {
         {
             "action_type": "fast_compliance",
             "description": "Fast-track compliance verification",
+            "depends_on": ["immediate_match"],
         },
         {
             "action_type": "notify_consultants",
             "description": "Notify matched consultants immediately",
+            "depends_on": ["immediate_match"],
         },
         {
             "action_type": "notify_customer",
             "description": "Send immediate status update to customer",
+            "depends_on": ["immediate_match"],
         },
     ],
     "extension": [
@@ -80,26 +102,81 @@ ACTION_TEMPLATES = {
         {
             "action_type": "update_contract",
             "description": "Prepare contract amendment for extension",
+            "depends_on": ["verify_current_assignment", "consultant_availability"],
         },
         {
             "action_type": "notify_all_parties",
             "description": "Notify customer and consultant of extension",
+            "depends_on": ["update_contract"],
         },
     ],
 }
 
+# Simulated outcome per action type, used when no handler is registered
+ACTION_RESULTS = {
+    "verify_requirements": "Requirements verified — AI analysis confirms clarity and completeness",
+    "run_feasibility": "Feasibility assessment triggered — results available in assessment panel",
+    "match_consultants": "Consultant matching completed — candidates ranked by fit score",
+    "compliance_check": "Compliance checks passed — no blocking issues found",
+    "prepare_proposal": "Staffing proposal prepared with top 3 candidate profiles",
+    "notify_customer": "Customer notification sent with current status and next steps",
+    "notify_consultants": "Matched consultants notified of opportunity",
+    "immediate_match": "Urgent matching completed — top available consultants identified",
+    "fast_compliance": "Fast-track compliance check completed",
+    "verify_current_assignment": "Current assignment verified — eligible for extension",
+    "consultant_availability": "Consultant confirmed available for extended period",
+    "update_contract": "Contract amendment prepared for review",
+    "notify_all_parties": "All parties notified of changes",
+}
+
+ACTION_POLICIES = {
+    action_def["action_type"]: ActionPolicy(
+        timeout_s=action_def.get("timeout_s", ActionPolicy.timeout_s),
+        retries=action_def.get("retries", ActionPolicy.retries),
+    )
+    for template in ACTION_TEMPLATES.values()
+    for action_def in template
+}
+
+# action_type -> handler(ActionContext) -> result text. Handlers may run on
+# executor worker threads, so they must not touch the request's DB session.
+ACTION_HANDLERS: dict[str, Callable[[ActionContext], str]] = {}
+
+
+def register_action(action_type: str):
+    """Decorator: register the real implementation of an action type."""
+    def decorator(fn: Callable[[ActionContext], str]):
+        ACTION_HANDLERS[action_type] = fn
+        return fn
+    return decorator
+
+
+def run_action_handler(ctx: ActionContext) -> str:
+    handler = ACTION_HANDLERS.get(ctx.action_type)
+    if handler is not None:
+        return handler(ctx)
+    return ACTION_RESULTS.get(ctx.action_type, f"Action '{ctx.action_type}' completed successfully")
+
 
 class Coordinator:
     """Coordinates actions and workflows for staffing requests."""
 
-    def create_action_plan(self, db: Session, request_id: str, plan_type: str = "standard_staffing") -> list[CoordinationAction]:
+    @timed("coordinator.create_action_plan")
+    def create_action_plan(
+        self, db: Session, request_id: str, plan_type: str = "standard_staffing", commit: bool = True
+    ) -> list[CoordinationAction]:
         """
         Create an action plan for a request based on its type.
 
+        Actions are written with a single Core bulk insert and loaded back with
+        one SELECT. Pass ``commit=False`` to leave the transaction open (see
+        ``run_plan``).
+
         Args:
             db: Database session
             request_id: The staffing request ID
             plan_type: Type of action plan (standard_staffing, urgent_staffing, extension)
+            commit: Commit the plan before returning
 
         Returns:
             List of created CoordinationAction objects
@@ -109,38 +186,41 @@ class Coordinator:
             raise ValueError(f"Request {request_id} not found")
 
         # Auto-detect plan type based on priority
-        if request.priority and request.priority.value == "urgent":
+        if request.priority == RequestPriority.URGENT:  # str until the row is reloaded
             plan_type = "urgent_staffing"
 
         template = ACTION_TEMPLATES.get(plan_type, ACTION_TEMPLATES["standard_staffing"])
-        actions = []
-
-        for i, action_def in enumerate(template):
-            action = CoordinationAction(
-                request_id=request_id,
-                action_type=action_def["action_type"],
-                description=action_def["description"],
-                status=ActionStatus.PENDING,
-                order=i,
-            )
-            db.add(action)
-            actions.append(action)
+        created_at = datetime.now(timezone.utc)
+        ids = {action_def["action_type"]: str(uuid.uuid4()) for action_def in template}
+        rows = [
+            {
+                "id": ids[action_def["action_type"]],
+                "request_id": request_id,
+                "action_type": action_def["action_type"],
+                "description": action_def["description"],
+                "status": ActionStatus.PENDING,
+                "order": i,
+                "depends_on": json.dumps([ids[dep] for dep in action_def.get("depends_on", [])]),
+                "attempts": 0,
+                "created_at": created_at,
+            }
+            for i, action_def in enumerate(template)
+        ]
+        db.execute(CoordinationAction.__table__.insert(), rows)
 
         # Timeline event
         event = TimelineEvent(
             request_id=request_id,
             event_type="action_plan_created",
             title=f"Action plan created ({plan_type})",
-            description=f"{len(actions)} actions planned for execution",
+            description=f"{len(rows)} actions planned for execution",
             actor="Coordinator",
         )
         db.add(event)
-        db.commit()
-
-        for a in actions:
-            db.refresh(a)
+        if commit:
+            db.commit()
 
-        return actions
+        return self._load_actions(db, [r["id"] for r in rows])
 
     def execute_next_action(self, db: Session, request_id: str) -> CoordinationAction | None:
         """Execute the next pending action in the plan."""
@@ -202,20 +282,173 @@ class Coordinator:
         db.refresh(action)
         return action
 
-    def execute_all_actions(self, db: Session, request_id: str) -> list[CoordinationAction]:
-        """Execute all pending actions sequentially."""
-        executed = []
-        while True:
-            action = self.execute_next_action(db, request_id)
-            if not action:
-                break
-            executed.append(action)
-        return executed
+    @timed("coordinator.execute_all_actions")
+    def execute_all_actions(self, db: Session, request_id: str, commit: bool = True) -> list[CoordinationAction]:
+        """
+        Execute all pending actions in one pass.
+
+        Loads the pending plan once, runs every step in memory, and writes the
+        action updates and timeline events in a single flush and commit.
+        ``execute_next_action`` remains available for step-by-step use.
+        """
+        pending = (
+            db.query(CoordinationAction)
+            .filter(
+                CoordinationAction.request_id == request_id,
+                CoordinationAction.status == ActionStatus.PENDING,
+            )
+            .order_by(CoordinationAction.order)
+            .all()
+        )
+        if not pending:
+            return []
+
+        events = []
+        for action in pending:
+            result = self._execute_action(db, action)
+            action.result = result
+            action.status = ActionStatus.COMPLETED
+            action.completed_at = datetime.now(timezone.utc)
+            events.append(TimelineEvent(
+                request_id=request_id,
+                event_type="action_completed",
+                title=f"Action completed: {action.action_type}",
+                description=result,
+                actor="Coordinator",
+            ))
+
+        request = db.get(StaffingRequest, request_id)
+        if request:
+            request.status = RequestStatus.IN_PROGRESS
+            events.append(TimelineEvent(
+                request_id=request_id,
+                event_type="all_actions_completed",
+                title="All coordination actions completed",
+                description="Request is ready for final review and customer communication",
+                actor="Coordinator",
+            ))
+        db.add_all(events)
+
+        if not commit:
+            return pending
+        action_ids = [a.id for a in pending]  # read before the commit expires them
+        db.commit()
+        return self._load_actions(db, action_ids)
+
+    @timed("coordinator.execute_plan")
+    def execute_plan(self, db: Session, request_id: str) -> list[CoordinationAction]:
+        """
+        Execute pending actions as a dependency graph on a bounded worker pool.
+
+        Independent actions run concurrently, each with the timeout and retries
+        from its template. State transitions are committed as results arrive.
+        """
+        pending = (
+            db.query(CoordinationAction)
+            .filter(
+                CoordinationAction.request_id == request_id,
+                CoordinationAction.status == ActionStatus.PENDING,
+            )
+            .order_by(CoordinationAction.order)
+            .all()
+        )
+        if not pending:
+            return []
+
+        executor = PlanExecutor(run_action_handler, ACTION_POLICIES, settings.coordinator_max_workers)
+        completed, failed = executor.execute(db, pending)
+
+        executed_ids = [a.id for a in sorted(completed + failed, key=lambda a: a.order)]
+        if not failed and len(completed) == len(pending):
+            request = db.get(StaffingRequest, request_id)
+            if request:
+                request.status = RequestStatus.IN_PROGRESS
+                db.add(TimelineEvent(
+                    request_id=request_id,
+                    event_type="all_actions_completed",
+                    title="All coordination actions completed",
+                    description="Request is ready for final review and customer communication",
+                    actor="Coordinator",
+                ))
+                db.commit()
+        return self._load_actions(db, executed_ids)
+
+    @timed("coordinator.run_plan")
+    def run_plan(
+        self, db: Session, request_id: str, plan_type: str = "standard_staffing"
+    ) -> tuple[list[CoordinationAction], list[CoordinationAction]]:
+        """
+        Create an action plan and execute every pending action.
+
+        Runs in a single transaction, or on the parallel DAG executor when
+        ``settings.coordinator_parallel`` is set.
+        """
+        if settings.coordinator_parallel:
+            planned = self.create_action_plan(db, request_id, plan_type)
+            return planned, self.execute_plan(db, request_id)
+
+        planned = self.create_action_plan(db, request_id, plan_type, commit=False)
+        executed = self.execute_all_actions(db, request_id, commit=False)
+        executed_ids = [a.id for a in executed]
+        db.commit()
+        return planned, self._load_actions(db, executed_ids)
+
+    def enqueue_plan(
+        self, db: Session, request_id: str, plan_type: str = "standard_staffing"
+    ) -> tuple[list[CoordinationAction], Job]:
+        """
+        Create an action plan and queue its execution for a worker process.
+
+        The plan and the job are committed together, so a plan is never left
+        without a job to run it (or a job without its plan).
+        """
+        planned = self.create_action_plan(db, request_id, plan_type, commit=False)
+        job = job_queue.enqueue(db, COORDINATION_JOB, {"request_id": request_id})
+        planned_ids = [a.id for a in planned]
+        db.commit()
+        return self._load_actions(db, planned_ids), job
+
+    def resume_plan(self, db: Session, request_id: str) -> list[CoordinationAction]:
+        """
+        Execute whatever is left of a request's plan (job handler entry point).
+
+        Actions a crashed worker left IN_PROGRESS are reset to PENDING first, so a
+        retried job picks them up again. Action handlers must therefore be safe
+        to run more than once.
+        """
+        stale = (
+            db.query(CoordinationAction)
+            .filter(
+                CoordinationAction.request_id == request_id,
+                CoordinationAction.status == ActionStatus.IN_PROGRESS,
+            )
+            .all()
+        )
+        for action in stale:
+            action.status = ActionStatus.PENDING
+        if stale:
+            db.commit()
+
+        if settings.coordinator_parallel:
+            return self.execute_plan(db, request_id)
+        return self.execute_all_actions(db, request_id)
+
+    def _load_actions(self, db: Session, action_ids: list[str]) -> list[CoordinationAction]:
+        """Load (or refresh, after a commit expired them) actions with one SELECT."""
+        if not action_ids:
+            return []
+        return (
+            db.query(CoordinationAction)
+            .filter(CoordinationAction.id.in_(action_ids))
+            .order_by(CoordinationAction.created_at, CoordinationAction.order)
+            .all()
+        )
 
     def assign_consultant(
-        self, db: Session, request_id: str, consultant_id: str
+        self, db: Session, request_id: str, consultant_id: str, commit: bool = True,
+        hours_per_week: float = DEFAULT_HOURS_PER_WEEK,
     ) -> Assignment:
-        """Create an assignment for a consultant to a request."""
+        """Create an assignment for a consultant to a request (``commit=False`` only flushes it)."""
         request = db.query(StaffingRequest).filter(StaffingRequest.id == request_id).first()
         consultant = db.query(Consultant).filter(Consultant.id == consultant_id).first()
 
@@ -228,6 +461,7 @@ class Coordinator:
             start_date=request.start_date or datetime.now(timezone.utc),
             end_date=request.end_date,
             hourly_rate=consultant.hourly_rate,
+            hours_per_week=hours_per_week,
             status="proposed",
         )
         db.add(assignment)
@@ -246,29 +480,22 @@ class Coordinator:
         )
         db.add(event)
 
+        if not commit:
+            db.flush()
+            return assignment
         db.commit()
         db.refresh(assignment)
         return assignment
 
     def _execute_action(self, db: Session, action: CoordinationAction) -> str:
-        """Simulate action execution — returns result description."""
-        action_results = {
-            "verify_requirements": "Requirements verified — AI analysis confirms clarity and completeness",
-            "run_feasibility": "Feasibility assessment triggered — results available in assessment panel",
-            "match_consultants": "Consultant matching completed — candidates ranked by fit score",
-            "compliance_check": "Compliance checks passed — no blocking issues found",
-            "prepare_proposal": "Staffing proposal prepared with top 3 candidate profiles",
-            "notify_customer": "Customer notification sent with current status and next steps",
-            "notify_consultants": "Matched consultants notified of opportunity",
-            "immediate_match": "Urgent matching completed — top available consultants identified",
-            "fast_compliance": "Fast-track compliance check completed",
-            "verify_current_assignment": "Current assignment verified — eligible for extension",
-            "consultant_availability": "Consultant confirmed available for extended period",
-            "update_contract": "Contract amendment prepared for review",
-            "notify_all_parties": "All parties notified of changes",
-        }
-        return action_results.get(action.action_type, f"Action '{action.action_type}' completed successfully")
+        """Run the action's handler (or simulate it) — returns result description."""
+        return run_action_handler(ActionContext.of(action))
 
 
 # Singleton
 coordinator = Coordinator()
+
+
+@job_handler(COORDINATION_JOB)
+def _run_coordination_job(db: Session, payload: dict) -> None:
+    coordinator.resume_plan(db, payload["request_id"])
@@ -10,8 +10,8 @@ from datetime import datetime, timezone
 
 from sqlalchemy.orm import Session
 
+from backend.metrics import timed
 from backend.models import (
-    Consultant,
     ConsultantStatus,
     FeasibilityAssessment,
     FeasibilityRating,
@@ -20,14 +20,23 @@ from backend.models import (
     TimelineEvent,
 )
 from backend.services.ai_engine import ai_engine
+from backend.services.business_days import business_calendar
 from backend.services.compliance import compliance_engine
+from backend.services.ranking import dump_matches, ranking_engine
+from backend.services.shared_pool import PoolColumns, shared_pool
 
 
 class FeasibilityService:
     """Assess the feasibility of fulfilling a staffing request."""
 
-    def assess(self, db: Session, request_id: str) -> FeasibilityAssessment:
-        """Run a full feasibility assessment on a staffing request."""
+    @timed("feasibility.assess")
+    def assess(self, db: Session, request_id: str, commit: bool = True) -> FeasibilityAssessment:
+        """
+        Run a full feasibility assessment on a staffing request.
+
+        Pass ``commit=False`` to flush the assessment into the caller's
+        transaction instead of committing it.
+        """
         request = db.query(StaffingRequest).filter(StaffingRequest.id == request_id).first()
         if not request:
             raise ValueError(f"Request {request_id} not found")
@@ -35,38 +44,25 @@ class FeasibilityService:
         # Update status
         request.status = RequestStatus.ANALYZING
 
-        # Parse required skills
-        required_skills = []
-        if request.required_skills:
-            try:
-                required_skills = json.loads(request.required_skills)
-            except (json.JSONDecodeError, TypeError):
-                required_skills = [s.strip() for s in str(request.required_skills).split(",")]
-
-        # If no explicit skills, extract from description using AI
-        if not required_skills:
-            from backend.services.ai_engine import ai_engine as _ai
-            ai_result = _ai.analyze_request(
-                title=request.title,
-                description=request.description,
-                skills=[],
-            )
-            required_skills = [s for s in ai_result.get("extracted_skills", []) if "experience" not in s.lower()]
+        required_skills = self.required_skills(request)
 
-        # Get all consultants
-        all_consultants = db.query(Consultant).all()
+        # All consultants, as the shared read-only columns (no query)
+        columns = shared_pool.columns(db)
 
         # Run sub-assessments
-        availability_result = self._assess_availability(all_consultants, request)
-        skills_result = self._assess_skills_match(all_consultants, required_skills)
-        budget_result = self._assess_budget(all_consultants, request.budget_max_hourly)
-        timeline_result = self._assess_timeline(request)
-        compliance_result = compliance_engine.check_request(request, all_consultants)
-
-        # Find matching consultants (intersection of good matches)
-        matching_ids = self._find_matching_consultants(
-            all_consultants, required_skills, request
-        )
+        with timed("feasibility.availability"):
+            availability_result = self._assess_availability(columns, request)
+        with timed("feasibility.skills_match"):
+            skills_result = self._assess_skills_match(columns, required_skills)
+        with timed("feasibility.budget"):
+            budget_result = self._assess_budget(columns, request.budget_max_hourly)
+        with timed("feasibility.timeline"):
+            timeline_result = self._assess_timeline(request)
+        compliance_result = compliance_engine.check_request(request, columns, db)
+
+        # Rank the matching consultants; keep the top K
+        with timed("feasibility.find_matching"):
+            top_matches, matching_total = ranking_engine.rank(columns, required_skills, request)
 
         # Calculate overall rating
         scores = {
@@ -76,7 +72,7 @@ class FeasibilityService:
             "timeline_score": timeline_result["score"],
             "compliance_score": compliance_result["score"],
         }
-        overall_rating, confidence = self._calculate_overall(scores, len(matching_ids), request.number_of_consultants)
+        overall_rating, confidence = self._calculate_overall(scores, matching_total, request.number_of_consultants)
 
         # Collect risks
         risks = (
@@ -105,7 +101,8 @@ class FeasibilityService:
             budget_fit_score=scores["budget_fit_score"],
             timeline_score=scores["timeline_score"],
             compliance_score=scores["compliance_score"],
-            matching_consultants=json.dumps(matching_ids),
+            matching_consultants=dump_matches(top_matches),
+            matching_total=matching_total,
             risks=json.dumps(risks),
             recommendations=json.dumps(recommendations),
             alternatives=json.dumps(alternatives),
@@ -117,6 +114,9 @@ class FeasibilityService:
         ).first()
         if old:
             db.delete(old)
+            # Flush the delete first: the unit of work would otherwise insert
+            # the new row before deleting the old one (UNIQUE request_id)
+            db.flush()
 
         db.add(assessment)
 
@@ -132,17 +132,39 @@ class FeasibilityService:
             actor="AI Engine",
         )
         db.add(event)
+        if not commit:
+            db.flush()
+            return assessment
         db.commit()
         db.refresh(assessment)
 
         return assessment
 
-    def _assess_availability(self, consultants: list[Consultant], request: StaffingRequest) -> dict:
+    def required_skills(self, request: StaffingRequest) -> list[str]:
+        """The request's skills, or the ones the AI engine extracts from its text."""
+        required_skills = []
+        if request.required_skills:
+            try:
+                required_skills = json.loads(request.required_skills)
+            except (json.JSONDecodeError, TypeError):
+                required_skills = [s.strip() for s in str(request.required_skills).split(",")]
+
+        # If no explicit skills, extract from description using AI
+        if not required_skills:
+            ai_result = ai_engine.analyze_request(
+                title=request.title,
+                description=request.description,
+                skills=[],
+            )
+            required_skills = [s for s in ai_result.get("extracted_skills", []) if "experience" not in s.lower()]
+        return required_skills
+
+    def _assess_availability(self, columns: PoolColumns, request: StaffingRequest) -> dict:
         """Check how many consultants are available."""
-        available = [c for c in consultants if c.status == ConsultantStatus.AVAILABLE]
-        ending_soon = [c for c in consultants if c.status == ConsultantStatus.ENDING_SOON]
+        available = columns.status_rows(ConsultantStatus.AVAILABLE).bit_count()
+        ending_soon = columns.status_rows(ConsultantStatus.ENDING_SOON).bit_count()
 
-        total_available = len(available) + len(ending_soon)
+        total_available = available + ending_soon
         needed = request.number_of_consultants or 1
         ratio = min(total_available / max(needed, 1), 1.0)
         score = ratio * 100
@@ -155,24 +177,14 @@ class FeasibilityService:
 
         return {"score": round(score), "risks": risks}
 
-    def _assess_skills_match(self, consultants: list[Consultant], required_skills: list[str]) -> dict:
+    def _assess_skills_match(self, columns: PoolColumns, required_skills: list[str]) -> dict:
         """Evaluate skills match across available consultants."""
         if not required_skills:
             return {"score": 80, "risks": ["No specific skills requested — broad matching"]}
 
-        best_match = 0
-        for consultant in consultants:
-            c_skills = []
-            if consultant.skills:
-                try:
-                    c_skills = json.loads(consultant.skills)
-                except (json.JSONDecodeError, TypeError):
-                    c_skills = [s.strip().lower() for s in str(consultant.skills).split(",")]
-
-            c_skills_lower = [s.lower() for s in c_skills]
-            match = sum(1 for s in required_skills if s.lower() in c_skills_lower)
-            match_ratio = match / len(required_skills)
-            best_match = max(best_match, match_ratio)
+        # Matched-skill counts of the whole pool at once (bit-sliced), then the highest
+        counts = columns.skill_counts(required_skills)
+        best_match = columns.highest(counts, columns.all_rows) / len(required_skills)
 
         score = best_match * 100
         risks = []
@@ -181,18 +193,19 @@ class FeasibilityService:
 
         return {"score": round(score), "risks": risks}
 
-    def _assess_budget(self, consultants: list[Consultant], max_hourly: float | None) -> dict:
+    def _assess_budget(self, columns: PoolColumns, max_hourly: float | None) -> dict:
         """Evaluate budget fit."""
         if not max_hourly:
             return {"score": 70, "risks": ["No budget specified — assuming flexible"]}
 
-        affordable = [c for c in consultants if c.hourly_rate <= max_hourly]
-        ratio = len(affordable) / max(len(consultants), 1)
+        rates = columns.rates
+        affordable = sum(1 for rate in rates if rate <= max_hourly)
+        ratio = affordable / max(len(rates), 1)
         score = ratio * 100
 
         risks = []
         if ratio < 0.3:
-            avg_rate = sum(c.hourly_rate for c in consultants) / max(len(consultants), 1)
+            avg_rate = sum(rates, 0.0) / max(len(rates), 1)
             risks.append(f"Budget ({max_hourly}/h) below average rate ({avg_rate:.0f}/h)")
 
         return {"score": round(score), "risks": risks}
@@ -204,56 +217,25 @@ class FeasibilityService:
 
         now = datetime.now(timezone.utc)
         start = request.start_date if request.start_date.tzinfo else request.start_date.replace(tzinfo=timezone.utc)
-        days_until_start = (start - now).days
+        business_days = business_calendar.business_days_between(now, start)
 
         risks = []
-        if days_until_start < 0:
+        if start < now:
             score = 20
             risks.append("Start date is in the past")
-        elif days_until_start < 7:
+        elif business_days < 5:
             score = 40
-            risks.append("Very tight timeline — less than 1 week")
-        elif days_until_start < 14:
+            risks.append("Very tight timeline — less than 5 business days")
+        elif business_days < 10:
             score = 60
-            risks.append("Tight timeline — less than 2 weeks")
-        elif days_until_start < 30:
+            risks.append("Tight timeline — less than 10 business days")
+        elif business_days < 21:
             score = 80
         else:
             score = 95
 
         return {"score": score, "risks": risks}
 
-    def _find_matching_consultants(
-        self, consultants: list[Consultant], required_skills: list[str], request: StaffingRequest
-    ) -> list[str]:
-        """Find consultant IDs that match the request."""
-        matches = []
-
-        for c in consultants:
-            if c.status not in (ConsultantStatus.AVAILABLE, ConsultantStatus.ENDING_SOON):
-                continue
-
-            # Skills check
-            c_skills = []
-            if c.skills:
-                try:
-                    c_skills = [s.lower() for s in json.loads(c.skills)]
-                except (json.JSONDecodeError, TypeError):
-                    c_skills = [s.strip().lower() for s in str(c.skills).split(",")]
-
-            if required_skills:
-                match_ratio = sum(1 for s in required_skills if s.lower() in c_skills) / len(required_skills)
-                if match_ratio < 0.3:
-                    continue
-
-            # Budget check
-            if request.budget_max_hourly and c.hourly_rate > request.budget_max_hourly:
-                continue
-
-            matches.append(c.id)
-
-        return matches
-
     def _calculate_overall(self, scores: dict, matching_count: int, needed: int) -> tuple[str, float]:
         """Calculate overall feasibility rating and confidence."""
         avg = sum(scores.values()) / len(scores)
@@ -296,3 +278,4 @@ class FeasibilityService:
 
 # Singleton
 feasibility_service = FeasibilityService()
+
@@ -0,0 +1,169 @@
+"""
+Durable Job Queue.
+
+Jobs live in the ``jobs`` table and are enqueued in the same transaction as
+the state change that needs them. Workers (``python -m backend.worker``)
+claim one job at a time under a lease; a job whose lease expires (the worker
+died) becomes visible again and is retried until ``max_attempts``.
+
+Claiming is safe with many concurrent workers:
+
+- PostgreSQL: ``SELECT ... FOR UPDATE SKIP LOCKED``, so workers never wait on
+  each other's rows
+- SQLite: a single conditional ``UPDATE`` (SQLite serializes writers), then
+  the row is read back by its unique claim token
+"""
+
+import json
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import Session
+
+from backend.models import Job
+
+logger = logging.getLogger(__name__)
+
+# kind -> handler(db, payload). Handlers commit their own work.
+JOB_HANDLERS: dict[str, Callable[[Session, dict], None]] = {}
+
+DEFAULT_LEASE_S = 60
+MAX_BACKOFF_S = 300
+
+
+def job_handler(kind: str):
+    """Decorator: register the handler that executes jobs of ``kind``."""
+    def decorator(fn: Callable[[Session, dict], None]):
+        JOB_HANDLERS[kind] = fn
+        return fn
+    return decorator
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobQueue:
+    """Enqueue, claim, complete and retry jobs."""
+
+    def enqueue(
+        self, db: Session, kind: str, payload: dict | None = None,
+        delay_s: float = 0, max_attempts: int = 3,
+    ) -> Job:
+        """Add a job to the session; it becomes visible when the caller commits."""
+        job = Job(
+            id=str(uuid.uuid4()),
+            kind=kind,
+            payload=json.dumps(payload or {}),
+            status="queued",
+            attempts=0,
+            max_attempts=max_attempts,
+            run_after=_now() + timedelta(seconds=delay_s),
+        )
+        db.add(job)
+        return job
+
+    def claim(self, db: Session, worker: str, lease_s: float = DEFAULT_LEASE_S, kinds: list[str] | None = None) -> Job | None:
+        """Claim the oldest visible job and commit the lease. Returns None when idle."""
+        now = _now()
+        visible = or_(
+            and_(Job.status == "queued", Job.run_after <= now),
+            and_(Job.status == "running", Job.locked_until < now),  # lease expired
+        )
+        if kinds:
+            visible = and_(visible, Job.kind.in_(kinds))
+        claim_token = f"{worker}/{uuid.uuid4().hex[:12]}"
+        lease = {
+            "status": "running",
+            "locked_by": claim_token,
+            "locked_until": now + timedelta(seconds=lease_s),
+            "attempts": Job.attempts + 1,
+        }
+
+        if db.get_bind().dialect.name == "postgresql":
+            job = db.execute(
+                select(Job).where(visible).order_by(Job.run_after).limit(1).with_for_update(skip_locked=True)
+            ).scalar_one_or_none()
+            if job is None:
+                db.rollback()
+                return None
+            db.execute(update(Job).where(Job.id == job.id).values(**lease))
+        else:
+            candidate = select(Job.id).where(visible).order_by(Job.run_after).limit(1).scalar_subquery()
+            result = db.execute(
+                update(Job).where(Job.id == candidate, visible).values(**lease),
+                execution_options={"synchronize_session": False},
+            )
+            if result.rowcount != 1:
+                db.rollback()
+                return None
+        db.commit()
+
+        job = db.execute(select(Job).where(Job.locked_by == claim_token)).scalar_one_or_none()
+        if job is not None and job.attempts > job.max_attempts:
+            # Reclaimed after its last attempt died mid-run
+            self._fail(db, job.id, claim_token, job.attempts, job.max_attempts,
+                       job.last_error or "lease expired on final attempt")
+            return None
+        return job
+
+    def extend(self, db: Session, job_id: str, claim_token: str, lease_s: float = DEFAULT_LEASE_S) -> bool:
+        """Extend the lease of a long-running job. False if the lease was lost."""
+        result = db.execute(
+            update(Job)
+            .where(Job.id == job_id, Job.locked_by == claim_token)
+            .values(locked_until=_now() + timedelta(seconds=lease_s)),
+            execution_options={"synchronize_session": False},
+        )
+        db.commit()
+        return result.rowcount == 1
+
+    def run(self, db: Session, job: Job) -> bool:
+        """Execute a claimed job with its registered handler. Returns True on success."""
+        # Handlers commit, which expires ``job``; keep the claim as it was when we took it
+        job_id, token, attempts, max_attempts = job.id, job.locked_by, job.attempts, job.max_attempts
+        handler = JOB_HANDLERS.get(job.kind)
+        try:
+            if handler is None:
+                raise LookupError(f"No handler registered for job kind '{job.kind}'")
+            handler(db, json.loads(job.payload or "{}"))
+        except Exception as e:
+            db.rollback()
+            logger.exception("Job %s failed on attempt %s", job_id, attempts)
+            self._fail(db, job_id, token, attempts, max_attempts, f"{type(e).__name__}: {e}")
+            return False
+        self._finish(db, job_id, token, status="done", locked_until=None, finished_at=_now())
+        return True
+
+    def _fail(self, db: Session, job_id: str, token: str, attempts: int, max_attempts: int, error: str) -> None:
+        """Record a failed attempt: retry with exponential backoff, or give up."""
+        values = {"last_error": error[:2000], "locked_until": None}
+        if attempts >= max_attempts:
+            values.update(status="failed", finished_at=_now())
+        else:
+            backoff = min(2 ** attempts, MAX_BACKOFF_S)
+            values.update(status="queued", run_after=_now() + timedelta(seconds=backoff))
+        self._finish(db, job_id, token, **values)
+
+    def _finish(self, db: Session, job_id: str, token: str, **values) -> None:
+        # Only the current lease holder may record an outcome
+        result = db.execute(
+            update(Job).where(Job.id == job_id, Job.locked_by == token).values(**values),
+            execution_options={"synchronize_session": False},
+        )
+        db.commit()
+        if result.rowcount != 1:
+            logger.warning("Job %s was reclaimed by another worker; outcome not recorded", job_id)
+
+
+# Singleton
+job_queue = JobQueue()
@@ -0,0 +1,348 @@
+"""
+Transactional Outbox.
+
+Side effects (notifications, outbound email/webhooks) are recorded as rows in
+the ``outbox`` table in the same transaction as the state change that caused
+them, so a request handler commits once and never waits on delivery. A
+background dispatcher drains the outbox in batches:
+
+1. claim a batch under a lease (safe with several app processes)
+2. run the topic handler for the batch — for ``notification`` this resolves
+   recipients, writes the Notification rows and hands each event to the
+   delivery adapter
+3. commit, then push the new notifications to live subscribers
+
+A batch whose handler raises is released and retried, up to
+``MAX_ATTEMPTS``; external delivery is therefore at-least-once.
+"""
+
+import json
+import logging
+import threading
+import uuid
+from abc import ABC, abstractmethod
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+
+from backend.config import settings
+from backend.database import SessionLocal
+from backend.metrics import timed
+from backend.models import Notification, OutboxEvent, User, UserRole
+from backend.services.jobs import worker_id
+from backend.services.sync import log_changes
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+LEASE_S = 30
+
+# topic -> handler(db, events) for a batch of events of that topic.
+# Handlers write in the batch transaction and may return callbacks to run after it commits.
+OUTBOX_HANDLERS: dict[str, Callable[[Session, list[OutboxEvent]], list[Callable[[], None]] | None]] = {}
+
+
+def outbox_handler(topic: str):
+    """Decorator: register the batch handler for ``topic``."""
+    def decorator(fn):
+        OUTBOX_HANDLERS[topic] = fn
+        return fn
+    return decorator
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+# ── Delivery adapters ──────────────────────────────────
+
+
+class DeliveryAdapter(ABC):
+    """Outbound channel (email, webhook) for notification events."""
+
+    @abstractmethod
+    def send(self, recipients: list[User], message: dict) -> None:
+        """Deliver one notification event; raising releases the batch for a retry."""
+
+
+class StubDeliveryAdapter(DeliveryAdapter):
+    """Local stand-in: logs each delivery and keeps the most recent ones for inspection."""
+
+    def __init__(self, keep: int = 100):
+        self.keep = keep
+        self.sent: list[dict] = []
+
+    def send(self, recipients: list[User], message: dict) -> None:
+        emails = [u.email for u in recipients]
+        logger.info("Delivering '%s' to %s", message["title"], ", ".join(emails))
+        self.sent.append({"to": emails, **message})
+        del self.sent[:-self.keep]
+
+
+DELIVERY_ADAPTERS: dict[str, Callable[[], DeliveryAdapter]] = {
+    "stub": StubDeliveryAdapter,
+}
+
+_adapter: DeliveryAdapter | None = None
+
+
+def delivery_adapter() -> DeliveryAdapter:
+    """The adapter selected by ``settings.outbox_delivery`` (created on first use)."""
+    global _adapter
+    if _adapter is None:
+        _adapter = DELIVERY_ADAPTERS[settings.outbox_delivery]()
+    return _adapter
+
+
+# ── Live subscribers ───────────────────────────────────
+
+
+class LiveBroker:
+    """In-process fan-out of committed notifications to connected clients, by user id."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: dict[str, set[Callable[[dict], None]]] = {}
+
+    def subscribe(self, user_id: str, callback: Callable[[dict], None]) -> Callable[[], None]:
+        """Register ``callback`` for the user's notifications. Returns the unsubscribe function."""
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(callback)
+
+        def unsubscribe():
+            with self._lock:
+                callbacks = self._subscribers.get(user_id)
+                if callbacks:
+                    callbacks.discard(callback)
+                    if not callbacks:
+                        del self._subscribers[user_id]
+        return unsubscribe
+
+    def publish(self, user_id: str, notification: dict) -> None:
+        with self._lock:
+            callbacks = list(self._subscribers.get(user_id, ()))
+        for callback in callbacks:
+            try:
+                callback(notification)
+            except Exception:
+                logger.exception("Live subscriber for user %s failed", user_id)
+
+
+# ── Outbox ─────────────────────────────────────────────
+
+
+class Outbox:
+    """Record side effects and dispatch them in batches."""
+
+    def __init__(self):
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def publish(self, db: Session, topic: str, payload: dict) -> None:
+        """Add an event to the caller's transaction; it is dispatched after the commit."""
+        db.add(OutboxEvent(topic=topic, payload=json.dumps(payload, ensure_ascii=False), attempts=0))
+        db.info["outbox_pending"] = True
+
+    @timed("outbox.dispatch")
+    def dispatch(self, db: Session, batch_size: int = 200) -> int:
+        """Claim and dispatch one batch. Returns the number of events dispatched."""
+        events = self._claim(db, batch_size)
+        if not events:
+            return 0
+        token = events[0].locked_by
+        event_ids = [e.id for e in events]
+
+        after_commit: list[Callable[[], None]] = []
+        try:
+            by_topic: dict[str, list[OutboxEvent]] = {}
+            for e in events:
+                by_topic.setdefault(e.topic, []).append(e)
+            for topic, topic_events in by_topic.items():
+                handler = OUTBOX_HANDLERS.get(topic)
+                if handler is None:
+                    raise LookupError(f"No outbox handler registered for topic '{topic}'")
+                after_commit.extend(handler(db, topic_events) or ())
+            db.execute(
+                update(OutboxEvent)
+                .where(OutboxEvent.id.in_(event_ids), OutboxEvent.locked_by == token)
+                .values(dispatched_at=_now(), locked_until=None, last_error=None),
+                execution_options={"synchronize_session": False},
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.exception("Outbox batch of %d events failed", len(event_ids))
+            db.execute(
+                update(OutboxEvent)
+                .where(OutboxEvent.id.in_(event_ids), OutboxEvent.locked_by == token)
+                .values(locked_until=None, last_error=f"{type(e).__name__}: {e}"[:2000]),
+                execution_options={"synchronize_session": False},
+            )
+            db.commit()
+            return 0
+
+        for callback in after_commit:
+            callback()
+        return len(event_ids)
+
+    def _claim(self, db: Session, batch_size: int) -> list[OutboxEvent]:
+        now = _now()
+        token = f"{worker_id()}/{uuid.uuid4().hex[:12]}"
+        batch = (
+            select(OutboxEvent.id)
+            .where(
+                OutboxEvent.dispatched_at.is_(None),
+                OutboxEvent.attempts < MAX_ATTEMPTS,
+                (OutboxEvent.locked_until.is_(None)) | (OutboxEvent.locked_until < now),
+            )
+            .order_by(OutboxEvent.id)
+            .limit(batch_size)
+        )
+        if db.get_bind().dialect.name == "postgresql":
+            batch = batch.with_for_update(skip_locked=True)
+        # SQLite serializes writers, so the single UPDATE claims the batch atomically
+        result = db.execute(
+            update(OutboxEvent)
+            .where(OutboxEvent.id.in_(batch))
+            .values(locked_by=token, locked_until=now + timedelta(seconds=LEASE_S),
+                    attempts=OutboxEvent.attempts + 1),
+            execution_options={"synchronize_session": False},
+        )
+        db.commit()
+        if not result.rowcount:
+            return []
+        return list(db.execute(
+            select(OutboxEvent).where(OutboxEvent.locked_by == token).order_by(OutboxEvent.id)
+        ).scalars())
+
+    # ── Background dispatcher ──
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def start(self, interval_s: float = 1.0, batch_size: int = 200) -> None:
+        """Run the dispatcher on a daemon thread; it also wakes right after every publishing commit."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(interval_s, batch_size), name="outbox-dispatcher", daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def _run(self, interval_s: float, batch_size: int) -> None:
+        db = SessionLocal()
+        try:
+            while not self._stop.is_set():
+                self._wake.clear()
+                try:
+                    # Keep going while batches come back full
+                    while self.dispatch(db, batch_size) == batch_size and not self._stop.is_set():
+                        pass
+                except Exception:
+                    db.rollback()
+                    logger.exception("Outbox dispatcher iteration failed")
+                self._wake.wait(interval_s)
+        finally:
+            db.close()
+
+
+def _wake_after_commit(session: Session) -> None:
+    if session.info.pop("outbox_pending", False):
+        outbox.wake()
+
+
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop("outbox_pending", None)
+
+
+event.listen(SessionLocal, "after_commit", _wake_after_commit)
+event.listen(SessionLocal, "after_rollback", _discard_after_rollback)
+
+
+# ── Notification topic ─────────────────────────────────
+
+
+def publish_notification(
+    db: Session,
+    title: str,
+    message: str,
+    notification_type: str = "info",
+    link: str | None = None,
+    *,
+    user_id: str | None = None,
+    customer_id: str | None = None,
+    handlers: bool = False,
+) -> None:
+    """Queue a notification for a user, all users of a customer, or all handlers/admins."""
+    outbox.publish(db, "notification", {
+        "user_id": user_id,
+        "customer_id": customer_id,
+        "handlers": handlers,
+        "title": title,
+        "message": message,
+        "notification_type": notification_type,
+        "link": link,
+    })
+
+
+@outbox_handler("notification")
+def _materialize_notifications(db: Session, events: list[OutboxEvent]) -> list[Callable[[], None]]:
+    """Resolve recipients for the whole batch with at most three queries and bulk-insert the rows."""
+    payloads = [json.loads(e.payload) for e in events]
+
+    users: dict[str, User] = {}
+    handler_ids: list[str] = []
+    by_customer: dict[str, list[str]] = {}
+    if any(p["handlers"] for p in payloads):
+        for u in db.query(User).filter(User.role.in_([UserRole.HANDLER, UserRole.ADMIN])):
+            users[u.id] = u
+            handler_ids.append(u.id)
+    customer_ids = {p["customer_id"] for p in payloads if p["customer_id"]}
+    if customer_ids:
+        for u in db.query(User).filter(User.customer_id.in_(customer_ids)):
+            users[u.id] = u
+            by_customer.setdefault(u.customer_id, []).append(u.id)
+    direct = {p["user_id"] for p in payloads if p["user_id"]} - users.keys()
+    if direct:
+        users.update((u.id, u) for u in db.query(User).filter(User.id.in_(direct)))
+
+    adapter = delivery_adapter()
+    rows = []
+    for p in payloads:
+        if p["handlers"]:
+            recipients = handler_ids
+        elif p["customer_id"]:
+            recipients = by_customer.get(p["customer_id"], [])
+        else:
+            recipients = [p["user_id"]] if p["user_id"] in users else []
+        message = {k: p[k] for k in ("title", "message", "notification_type", "link")}
+        for uid in recipients:
+            rows.append({"id": str(uuid.uuid4()), "user_id": uid, "is_read": False, "created_at": _now(), **message})
+        if recipients:
+            adapter.send([users[uid] for uid in recipients], message)
+
+    if rows:
+        db.execute(Notification.__table__.insert(), rows)
+        log_changes(db, "notifications", [r["id"] for r in rows])
+
+    def push():
+        for row in rows:
+            broker.publish(row["user_id"], row)
+    return [push]
+
+
+# Singletons
+outbox = Outbox()
+broker = LiveBroker()
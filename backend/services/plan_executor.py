@@ -0,0 +1,204 @@
+"""
+Parallel DAG executor for coordination actions.
+
+Actions whose dependencies have completed run concurrently on a bounded
+thread pool, so a plan finishes in the time of its critical path once actions
+do real I/O (email, LLM calls). Workers only ever see an ``ActionContext``
+snapshot; every state transition (PENDING → IN_PROGRESS → COMPLETED / FAILED,
+SKIPPED for dependents of a failed action) is written by the calling thread,
+which owns the session, and committed as each wave of results comes in.
+"""
+
+import json
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable
+
+from sqlalchemy.orm import Session
+
+from backend.models import ActionStatus, CoordinationAction, TimelineEvent
+
+DEFAULT_TIMEOUT_S = 30.0
+DEFAULT_RETRIES = 1
+
+
+@dataclass(frozen=True)
+class ActionContext:
+    """Plain snapshot of an action handed to worker threads (never an ORM object)."""
+
+    action_id: str
+    request_id: str
+    action_type: str
+    description: str
+    attempt: int = 1
+
+    @classmethod
+    def of(cls, action: CoordinationAction, attempt: int = 1) -> "ActionContext":
+        return cls(action.id, action.request_id, action.action_type, action.description, attempt)
+
+
+@dataclass(frozen=True)
+class ActionPolicy:
+    timeout_s: float = DEFAULT_TIMEOUT_S
+    retries: int = DEFAULT_RETRIES
+
+
+@dataclass
+class _Running:
+    action: CoordinationAction
+    future: Future
+    deadline: float
+
+
+def _dependencies(action: CoordinationAction, previous: CoordinationAction | None) -> list[str]:
+    if action.depends_on is not None:
+        return json.loads(action.depends_on)
+    # Actions planned before dependencies were recorded run in order
+    return [previous.id] if previous is not None else []
+
+
+class PlanExecutor:
+    """Run the pending actions of one request as a dependency graph."""
+
+    def __init__(
+        self,
+        run: Callable[[ActionContext], str],
+        policies: dict[str, ActionPolicy] | None = None,
+        max_workers: int = 4,
+    ):
+        self.run = run
+        self.policies = policies or {}
+        self.max_workers = max_workers
+
+    def execute(self, db: Session, pending: list[CoordinationAction]) -> tuple[list, list]:
+        """
+        Execute ``pending`` (ordered by ``order``) and return (completed, failed).
+
+        Dependencies on actions outside ``pending`` count as satisfied when that
+        action is already completed. A timed-out attempt is abandoned (its
+        thread cannot be interrupted and its result is discarded) and retried
+        like any other failure.
+        """
+        by_id = {a.id: a for a in pending}
+        deps: dict[str, set[str]] = {}
+        previous = None
+        for action in pending:
+            deps[action.id] = set(_dependencies(action, previous))
+            previous = action
+
+        outside = {d for ds in deps.values() for d in ds if d not in by_id}
+        done_outside = {
+            a.id for a in db.query(CoordinationAction).filter(CoordinationAction.id.in_(outside))
+            if a.status == ActionStatus.COMPLETED
+        } if outside else set()
+
+        completed: list[CoordinationAction] = []
+        failed: list[CoordinationAction] = []
+        finished = set(done_outside)
+        blocked = {d for d in outside if d not in done_outside}
+        waiting = dict(deps)
+        running: dict[str, _Running] = {}
+
+        # This thread is the only writer of these rows, so keep them loaded across commits
+        expire_on_commit, db.expire_on_commit = db.expire_on_commit, False
+        pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="coordinator")
+        try:
+            self._run_graph(db, pool, by_id, waiting, running, finished, blocked, completed, failed)
+        finally:
+            # Don't block on abandoned (timed-out) attempts
+            pool.shutdown(wait=False, cancel_futures=True)
+            db.expire_on_commit = expire_on_commit
+        return completed, failed
+
+    def _run_graph(self, db, pool, by_id, waiting, running, finished, blocked, completed, failed) -> None:
+        while waiting or running:
+            # Dependents (direct or transitive) of failed actions will never run
+            changed = True
+            while changed:
+                changed = False
+                for action_id, ds in list(waiting.items()):
+                    if ds & blocked:
+                        del waiting[action_id]
+                        blocked.add(action_id)
+                        self._skip(db, by_id[action_id])
+                        changed = True
+
+            for action_id, ds in list(waiting.items()):
+                if ds <= finished:
+                    del waiting[action_id]
+                    action = by_id[action_id]
+                    action.status = ActionStatus.IN_PROGRESS
+                    running[action_id] = self._submit(pool, action)
+            db.commit()
+
+            if not running:
+                break
+
+            timeout = max(0.0, min(r.deadline for r in running.values()) - time.monotonic())
+            wait([r.future for r in running.values()], timeout=timeout, return_when=FIRST_COMPLETED)
+
+            now = time.monotonic()
+            for action_id, entry in list(running.items()):
+                action = entry.action
+                if entry.future.done():
+                    error = entry.future.exception()
+                    if error is None:
+                        del running[action_id]
+                        self._complete(db, action, entry.future.result())
+                        finished.add(action_id)
+                        completed.append(action)
+                        continue
+                    reason = f"{type(error).__name__}: {error}"
+                elif now >= entry.deadline:
+                    entry.future.cancel()
+                    reason = f"timed out after {self._policy(action).timeout_s:g}s"
+                else:
+                    continue
+
+                del running[action_id]
+                if (action.attempts or 0) <= self._policy(action).retries:
+                    running[action_id] = self._submit(pool, action)
+                else:
+                    self._fail(db, action, reason)
+                    blocked.add(action_id)
+                    failed.append(action)
+            db.commit()
+
+    def _policy(self, action: CoordinationAction) -> ActionPolicy:
+        return self.policies.get(action.action_type, ActionPolicy())
+
+    def _submit(self, pool: ThreadPoolExecutor, action: CoordinationAction) -> _Running:
+        action.attempts = (action.attempts or 0) + 1
+        future = pool.submit(self.run, ActionContext.of(action, action.attempts))
+        return _Running(action, future, time.monotonic() + self._policy(action).timeout_s)
+
+    def _complete(self, db: Session, action: CoordinationAction, result: str) -> None:
+        action.status = ActionStatus.COMPLETED
+        action.result = result
+        action.completed_at = datetime.now(timezone.utc)
+        db.add(TimelineEvent(
+            request_id=action.request_id,
+            event_type="action_completed",
+            title=f"Action completed: {action.action_type}",
+            description=result,
+            actor="Coordinator",
+        ))
+
+    def _fail(self, db: Session, action: CoordinationAction, reason: str) -> None:
+        action.status = ActionStatus.FAILED
+        action.result = f"Failed after {action.attempts} attempt(s) — {reason}"
+        action.completed_at = datetime.now(timezone.utc)
+        db.add(TimelineEvent(
+            request_id=action.request_id,
+            event_type="action_failed",
+            title=f"Action failed: {action.action_type}",
+            description=action.result,
+            actor="Coordinator",
+        ))
+
+    def _skip(self, db: Session, action: CoordinationAction) -> None:
+        action.status = ActionStatus.SKIPPED
+        action.result = "Skipped — a prerequisite action failed"
+        action.completed_at = datetime.now(timezone.utc)
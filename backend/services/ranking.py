@@ -0,0 +1,169 @@
+"""
+Candidate ranking for staffing requests.
+
+A consultant is a candidate when they are available (or ending soon), have
+at least 30% of the required skills and fit the budget. Candidates are
+ranked by a weighted sum of four factors, each between 0 and 1:
+
+- ``skills``        share of the required skills they have
+- ``rate``          headroom under the budget, ``(budget - rate) / budget``
+- ``availability``  1 if free by the start date, falling to 0 at
+                    ``AVAILABILITY_HORIZON_DAYS`` late
+- ``category``      how many skills of the request's category they have
+                    (``CATEGORY_FIT_SKILLS`` or more counts as a full fit)
+
+A factor that cannot be judged (no budget, no known category) is 0.5 for
+everyone. Weights come from the ``RANKING_WEIGHT_*`` settings.
+
+The candidate filter and the skill counts run on the shared pool columns
+(bit-sliced counters, see ``backend.services.shared_pool``). Only candidates
+are scored, and a heap picks the best ``limit`` of them without sorting the
+rest. An assessment persists the top ``RANKING_TOP_K`` with their scores;
+deeper pages are ranked again on demand.
+
+Assessments written before ranking stored a plain list of consultant ids in
+``matching_consultants``. ``read_matches`` accepts both forms.
+"""
+
+import heapq
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from backend.config import settings
+from backend.models import ConsultantStatus, StaffingRequest
+from backend.services.ai_engine import SKILL_CATEGORIES
+from backend.services.shared_pool import STATUSES, PoolColumns
+
+MIN_SKILL_RATIO = 0.3
+AVAILABILITY_HORIZON_DAYS = 60
+CATEGORY_FIT_SKILLS = 3
+NEUTRAL = 0.5
+FACTORS = ("skills", "rate", "availability", "category")
+
+_AVAILABLE, _ENDING_SOON = ConsultantStatus.AVAILABLE, ConsultantStatus.ENDING_SOON
+_AVAILABLE_CODE = STATUSES.index(_AVAILABLE)
+
+
+@dataclass(frozen=True)
+class RankWeights:
+    skills: float = 0.5
+    rate: float = 0.2
+    availability: float = 0.2
+    category: float = 0.1
+
+    @classmethod
+    def from_settings(cls) -> "RankWeights":
+        return cls(
+            settings.ranking_weight_skills, settings.ranking_weight_rate,
+            settings.ranking_weight_availability, settings.ranking_weight_category,
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Match:
+    """A ranked candidate; ``score`` (0-100) and ``factors`` are None for legacy id-only entries."""
+
+    id: str
+    score: float | None = None
+    factors: dict[str, float] | None = None
+
+    def as_dict(self) -> dict:
+        return {"id": self.id, "score": self.score, "factors": self.factors}
+
+
+def read_matches(raw) -> list[Match]:
+    """Parse ``FeasibilityAssessment.matching_consultants``: ranked entries or a legacy list of ids."""
+    if not raw:
+        return []
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            return []
+    if not isinstance(raw, list):
+        return []
+    matches = []
+    for entry in raw:
+        if isinstance(entry, str):
+            matches.append(Match(entry))
+        elif isinstance(entry, dict) and entry.get("id"):
+            matches.append(Match(entry["id"], entry.get("score"), entry.get("factors")))
+    return matches
+
+
+def dump_matches(matches: list[Match]) -> str:
+    return json.dumps([m.as_dict() for m in matches])
+
+
+class RankingEngine:
+    """Select and rank candidates from the pool columns."""
+
+    def __init__(self, weights: RankWeights | None = None, top_k: int = 20):
+        self.weights = weights or RankWeights()
+        self.top_k = top_k
+
+    def candidates(self, columns: PoolColumns, required_skills: list[str], request: StaffingRequest) -> list[int]:
+        """Rows of the consultants that match the request at all, in table order."""
+        rows = columns.status_rows(_AVAILABLE, _ENDING_SOON)
+        if required_skills:
+            k = len(required_skills)
+            threshold = next(t for t in range(k + 1) if t / k >= MIN_SKILL_RATIO)
+            rows &= columns.at_least(columns.skill_counts(required_skills), threshold)
+        budget = request.budget_max_hourly
+        if not budget:
+            return list(columns.iter_rows(rows))
+        rates = columns.rates
+        return [row for row in columns.iter_rows(rows) if not rates[row] > budget]
+
+    def rank(
+        self, columns: PoolColumns, required_skills: list[str], request: StaffingRequest,
+        limit: int | None = None, offset: int = 0,
+    ) -> tuple[list[Match], int]:
+        """The best candidates from ``offset`` on (``limit`` of them, default top K), and how many there are."""
+        limit = self.top_k if limit is None else limit
+        candidates = self.candidates(columns, required_skills, request)
+        factors = self._factors(columns, required_skills, request)
+        w = self.weights
+        weights = (w.skills, w.rate, w.availability, w.category)
+        weight_sum = sum(weights) or 1.0
+
+        def score(row: int) -> float:
+            return sum(wi * fi for wi, fi in zip(weights, factors(row))) / weight_sum
+
+        page = []
+        for row in heapq.nlargest(offset + limit, candidates, key=score)[offset:]:
+            page.append(Match(
+                columns.consultant_id(row), round(score(row) * 100, 1),
+                {name: round(value, 3) for name, value in zip(FACTORS, factors(row))},
+            ))
+        return page, len(candidates)
+
+    @staticmethod
+    def _factors(columns: PoolColumns, required_skills: list[str], request: StaffingRequest):
+        """``factors(row)``: the four factors of one consultant, with everything per request computed once."""
+        k = len(required_skills)
+        skill_count = columns.row_counter(columns.skill_counts(required_skills)) if k else None
+        category_skills = SKILL_CATEGORIES.get(request.ai_category or "")
+        category_count = columns.row_counter(columns.skill_counts(category_skills)) if category_skills else None
+        budget = request.budget_max_hourly
+        start = request.start_date or datetime.now(timezone.utc)
+        start_ordinal = start.date().toordinal()
+        rates, available, status = columns.rates, columns.available, columns.status
+
+        def factors(row: int) -> tuple[float, float, float, float]:
+            skills = skill_count(row) / k if k else 1.0
+            rate = max(0.0, (budget - rates[row]) / budget) if budget else NEUTRAL
+            free_on = available[row]
+            if free_on == 0:
+                availability = 1.0 if status[row] == _AVAILABLE_CODE else NEUTRAL
+            else:
+                availability = max(0.0, 1.0 - max(0, free_on - start_ordinal) / AVAILABILITY_HORIZON_DAYS)
+            category = min(1.0, category_count(row) / CATEGORY_FIT_SKILLS) if category_count else NEUTRAL
+            return skills, rate, availability, category
+
+        return factors
+
+
+# Singleton
+ranking_engine = RankingEngine(RankWeights.from_settings(), settings.ranking_top_k)
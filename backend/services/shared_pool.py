@@ -0,0 +1,325 @@
+"""
+Columnar consultant pool in a memory-mapped file, shared by worker processes.
+
+Matching reads only a few facts per consultant: skills, rate, status and
+availability date. They are packed column by column into one flat buffer:
+
+- ``rates``      float64 per consultant
+- ``available``  int32 date ordinal per consultant (0: no date)
+- ``status``     uint8 index into ``STATUSES`` per consultant
+- ``ids``        uint32 offsets + UTF-8 blob
+- bitsets        one bit per consultant for each (lowercased) skill and each status
+
+With ``SHARED_POOL_DIR`` set, one process builds the buffer and publishes it
+as ``pool-<generation>.bin`` in that directory, then points ``current`` at it.
+Every worker maps the file read-only (zero-copy), so the pool costs the same
+memory for one worker or sixteen. Workers check ``current`` every
+``CONSULTANT_POOL_SYNC_S`` seconds and swap to a newer generation; old files
+stay readable by workers still mapping them until the next publish removes
+them. A worker that commits consultant or assignment changes, or sees the
+table's stamp move, republishes under an exclusive file lock. Without a
+directory the same buffer is built in process memory.
+
+Bitset queries return Python ints (bit ``i`` is consultant row ``i``), so
+counting how many required skills each consultant has takes a handful of
+big-integer operations for the whole pool (a bit-sliced counter), not a loop
+over consultants.
+"""
+
+import fcntl
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from datetime import date
+from pathlib import Path
+
+import orjson
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from backend import versioning
+from backend.config import settings
+from backend.database import engine
+from backend.models import Consultant, ConsultantStatus
+from backend.services.consultant_pool import POOL_VERSION, parse_skills, read_stamp
+from backend.warmup import warmup_task
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"IPPOOL1\0"
+_HEADER = struct.Struct("<8sQII")  # magic, generation, rows, meta length
+STATUSES = tuple(ConsultantStatus)
+_STATUS_CODE = {s: i for i, s in enumerate(STATUSES)}
+
+# Set-bit positions of every byte value, for walking a bitset row by row
+_BYTE_BITS = tuple(tuple(b for b in range(8) if v >> b & 1) for v in range(256))
+
+
+def _stamp_key(stamp: tuple) -> list:
+    return [stamp[0], str(stamp[1])]
+
+
+def _align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def build_buffer(conn, generation: int = 0) -> bytes:
+    """Read the consultants table and pack it into the columnar layout."""
+    stamp = read_stamp(conn)
+    ids, rates, available, status = [], array("d"), array("i"), bytearray()
+    skill_rows: dict[str, list[int]] = {}
+    status_rows: dict[int, list[int]] = {}
+    rows = conn.execute(select(
+        Consultant.id, Consultant.skills, Consultant.hourly_rate, Consultant.status, Consultant.availability_date,
+    )).tuples()
+    for row, (cid, skills, rate, st, avail) in enumerate(rows):
+        ids.append(cid.encode())
+        rates.append(rate or 0.0)
+        available.append(avail.toordinal() if avail is not None else 0)
+        code = _STATUS_CODE.get(st, 255)
+        status.append(code)
+        status_rows.setdefault(code, []).append(row)
+        for skill in parse_skills(skills)[1]:
+            skill_rows.setdefault(skill, []).append(row)
+
+    n = len(ids)
+    nbytes = (n + 7) // 8
+    id_offsets = array("I", [0])
+    for value in ids:
+        id_offsets.append(id_offsets[-1] + len(value))
+
+    def bitset(rows_: list[int]) -> bytes:
+        bits = bytearray(nbytes)
+        for r in rows_:
+            bits[r >> 3] |= 1 << (r & 7)
+        return bytes(bits)
+
+    skills = sorted(skill_rows)
+    sections = [
+        ("rates", rates.tobytes()),
+        ("available", available.tobytes()),
+        ("status", bytes(status)),
+        ("id_offsets", id_offsets.tobytes()),
+        ("id_blob", b"".join(ids)),
+        ("skill_bits", b"".join(bitset(skill_rows[s]) for s in skills)),
+        ("status_bits", b"".join(bitset(status_rows.get(i, [])) for i in range(len(STATUSES)))),
+    ]
+    # Offsets are relative to the end of the (padded) meta block
+    offsets, position = {}, 0
+    for name, data in sections:
+        offsets[name] = position
+        position = _align(position + len(data))
+    meta = orjson.dumps({"skills": skills, "stamp": _stamp_key(stamp), "offsets": offsets})
+    head = _HEADER.pack(MAGIC, generation, n, len(meta)) + meta
+    out = bytearray(head + b"\0" * (_align(len(head)) - len(head)))
+    for name, data in sections:
+        out += data
+        out += b"\0" * (_align(len(data)) - len(data))
+    return bytes(out)
+
+
+class PoolColumns:
+    """Read-only view over one published buffer (``bytes`` or an ``mmap``); nothing is copied."""
+
+    def __init__(self, buffer):
+        magic, self.generation, self.rows, meta_len = _HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a consultant pool file")
+        meta = orjson.loads(bytes(buffer[_HEADER.size:_HEADER.size + meta_len]))
+        self.stamp = meta["stamp"]
+        self._skill_index = {s: i for i, s in enumerate(meta["skills"])}
+        self._nbytes = (self.rows + 7) // 8
+        view = memoryview(buffer)[_align(_HEADER.size + meta_len):]
+        o, n = meta["offsets"], self.rows
+        self.rates = view[o["rates"]:o["rates"] + 8 * n].cast("d")
+        self.available = view[o["available"]:o["available"] + 4 * n].cast("i")
+        self.status = view[o["status"]:o["status"] + n]
+        self._id_offsets = view[o["id_offsets"]:o["id_offsets"] + 4 * (n + 1)].cast("I")
+        self._id_blob = view[o["id_blob"]:]
+        self._skill_bits = view[o["skill_bits"]:]
+        self._status_bits = view[o["status_bits"]:]
+        self.all_rows = (1 << n) - 1
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def consultant_id(self, row: int) -> str:
+        return bytes(self._id_blob[self._id_offsets[row]:self._id_offsets[row + 1]]).decode()
+
+    def available_on(self, row: int) -> date | None:
+        ordinal = self.available[row]
+        return date.fromordinal(ordinal) if ordinal else None
+
+    def _bits(self, view: memoryview, index: int) -> int:
+        start = index * self._nbytes
+        return int.from_bytes(view[start:start + self._nbytes], "little")
+
+    def skill_rows(self, skill: str) -> int:
+        """Bitset of consultants with ``skill`` (case-insensitive)."""
+        index = self._skill_index.get(skill.lower())
+        return 0 if index is None else self._bits(self._skill_bits, index)
+
+    def status_rows(self, *statuses: ConsultantStatus) -> int:
+        """Bitset of consultants in any of ``statuses``."""
+        bits = 0
+        for s in statuses:
+            bits |= self._bits(self._status_bits, _STATUS_CODE[s])
+        return bits
+
+    def skill_counts(self, skills: list[str]) -> list[int]:
+        """
+        Bit-sliced count of ``skills`` per consultant: ``planes[j]`` holds bit
+        ``j`` of every consultant's count. Repeated skills count repeatedly.
+        """
+        planes: list[int] = []
+        for skill in skills:
+            carry = self.skill_rows(skill)
+            j = 0
+            while carry:
+                if j == len(planes):
+                    planes.append(0)
+                planes[j], carry = planes[j] ^ carry, planes[j] & carry
+                j += 1
+        return planes
+
+    def at_least(self, planes: list[int], threshold: int) -> int:
+        """Bitset of consultants whose count in ``planes`` is ``>= threshold``."""
+        if threshold <= 0:
+            return self.all_rows
+        greater, equal = 0, self.all_rows
+        for j in range(max(len(planes), threshold.bit_length()) - 1, -1, -1):
+            plane = planes[j] if j < len(planes) else 0
+            if threshold >> j & 1:
+                equal &= plane
+            else:
+                greater |= equal & plane
+                equal &= self.all_rows ^ plane
+        return greater | equal
+
+    @staticmethod
+    def highest(planes: list[int], within: int) -> int:
+        """The largest count in ``planes`` among the consultants in ``within``."""
+        best = 0
+        for j in range(len(planes) - 1, -1, -1):
+            if within & planes[j]:
+                within &= planes[j]
+                best |= 1 << j
+        return best
+
+    def row_counter(self, planes: list[int]):
+        """``count(row)`` reading one consultant's count from ``planes`` (for scoring candidates one by one)."""
+        unpacked = [plane.to_bytes(self._nbytes, "little") for plane in planes]
+
+        def count(row: int) -> int:
+            i, bit = row >> 3, row & 7
+            return sum(((plane[i] >> bit) & 1) << j for j, plane in enumerate(unpacked))
+
+        return count
+
+    def iter_rows(self, bits: int):
+        """Row numbers set in ``bits``, ascending."""
+        for i, byte in enumerate(bits.to_bytes(self._nbytes, "little")):
+            if byte:
+                base = i * 8
+                for b in _BYTE_BITS[byte]:
+                    yield base + b
+
+
+class SharedPool:
+    """The current ``PoolColumns``, published to ``directory`` or built in process."""
+
+    def __init__(self, directory: str | None = None, sync_s: float = 5.0):
+        self.directory = Path(directory) if directory else None
+        self.sync_s = sync_s
+        self._columns: PoolColumns | None = None
+        self._version = -1
+        self._next_sync = 0.0
+        self._lock = threading.Lock()
+
+    def columns(self, db: Session | None = None) -> PoolColumns:
+        """
+        The current pool; checked against the table after local commits and
+        every ``sync_s`` seconds. Pass the caller's session to read a database
+        other than the application's: those columns are built fresh, not kept.
+        """
+        if db is not None and db.get_bind() is not engine:
+            return PoolColumns(build_buffer(db.connection()))
+        if (self._columns is None or self._version != versioning.current(POOL_VERSION)
+                or time.monotonic() >= self._next_sync):
+            self.refresh()
+        return self._columns
+
+    def refresh(self) -> None:
+        """Attach the newest published generation, rebuilding it first if the table has moved on."""
+        with self._lock:
+            version = versioning.current(POOL_VERSION)
+            self._next_sync = time.monotonic() + self.sync_s
+            if self.directory is None:
+                with engine.connect() as conn:
+                    if self._columns is None or self._columns.stamp != _stamp_key(read_stamp(conn)):
+                        generation = self._columns.generation + 1 if self._columns else 1
+                        self._columns = PoolColumns(build_buffer(conn, generation))
+            else:
+                columns = self._attach()
+                if columns is None or columns.stamp != _stamp_key(read_stamp()):
+                    columns = self.publish()
+                self._columns = columns
+            self._version = version
+
+    def publish(self) -> PoolColumns:
+        """Build a new generation and point ``current`` at it (one builder at a time)."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / "lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                current = self._attach()
+                with engine.connect() as conn:
+                    if current is not None and current.stamp == _stamp_key(read_stamp(conn)):
+                        return current  # another worker published it while we waited for the lock
+                    generation = self._current_generation() + 1
+                    data = build_buffer(conn, generation)
+                path = self.directory / f"pool-{generation}.bin"
+                tmp = path.with_suffix(".tmp")
+                tmp.write_bytes(data)
+                os.replace(tmp, path)
+                pointer = self.directory / "current.tmp"
+                pointer.write_text(str(generation), encoding="utf-8")
+                os.replace(pointer, self.directory / "current")
+                # Workers still mapping generation - 1 keep it until the next publish
+                for old in self.directory.glob("pool-*.bin"):
+                    if int(old.stem.split("-")[1]) < generation - 1:
+                        old.unlink(missing_ok=True)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+        logger.info("Published consultant pool generation %d (%d bytes)", generation, len(data))
+        return self._map(generation)
+
+    def _current_generation(self) -> int:
+        try:
+            return int((self.directory / "current").read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return 0
+
+    def _attach(self) -> PoolColumns | None:
+        generation = self._current_generation()
+        if not generation:
+            return None
+        if self._columns is not None and self._columns.generation == generation:
+            return self._columns
+        try:
+            return self._map(generation)
+        except (OSError, ValueError):
+            return None  # removed or half-written: rebuild instead
+
+    def _map(self, generation: int) -> PoolColumns:
+        with open(self.directory / f"pool-{generation}.bin", "rb") as f:
+            return PoolColumns(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+# Singleton
+shared_pool = SharedPool(settings.shared_pool_dir, settings.consultant_pool_sync_s)
+warmup_task("shared_pool")(shared_pool.refresh)
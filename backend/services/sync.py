@@ -0,0 +1,189 @@
+"""
+Delta Sync Service.
+
+Records every change to the entities the SPA keeps in its local store in an
+append-only change log, written in the same transaction as the change, and
+collects what a client has not seen yet since its cursor.
+"""
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from backend.database import SessionLocal
+from backend.models import (
+    Assignment,
+    ChangeLog,
+    FeasibilityAssessment,
+    Notification,
+    StaffingRequest,
+    TimelineEvent,
+    UserRole,
+)
+from backend.sessions import AuthUser
+
+
+# Entity name (as exposed by /api/sync) -> ORM model
+TRACKED_MODELS = {
+    "requests": StaffingRequest,
+    "assessments": FeasibilityAssessment,
+    "assignments": Assignment,
+    "timeline": TimelineEvent,
+    "notifications": Notification,
+}
+
+_ENTITY_BY_MODEL = {model: name for name, model in TRACKED_MODELS.items()}
+
+# Keep IN (...) lists well below SQLite's bound-parameter limit
+_CHUNK = 500
+
+# Cap for the notification part of a full snapshot
+SNAPSHOT_NOTIFICATIONS = 200
+
+# PostgreSQL advisory lock serializing change_log writers (arbitrary, app-wide key)
+CHANGE_LOG_LOCK = 0x1A7E11_5C
+
+
+def _serialize_writers(connection) -> None:
+    """
+    Make change_log sequence numbers visible in commit order.
+
+    The cursor protocol needs a row with a lower ``seq`` never to commit after
+    one with a higher ``seq``, or a client that synced past it would skip it
+    for good. SQLite serializes writers by itself. On PostgreSQL every writer
+    takes a transaction-level advisory lock before its first change_log row
+    and holds it until commit or rollback.
+    """
+    if connection.dialect.name == "postgresql":
+        connection.execute(select(func.pg_advisory_xact_lock(CHANGE_LOG_LOCK)))
+
+
+def log_changes(db: Session, entity: str, entity_ids: list[str], op: str = "upsert") -> None:
+    """Append change-log rows for writes that bypass the ORM unit of work (Core bulk inserts)."""
+    if not entity_ids:
+        return
+    _serialize_writers(db.connection())
+    db.execute(
+        ChangeLog.__table__.insert(),
+        [{"entity": entity, "entity_id": eid, "op": op} for eid in entity_ids],
+    )
+
+
+def _record_flush(session: Session, flush_context) -> None:
+    """after_flush hook — log tracked entities touched by this flush."""
+    rows = []
+    for obj in session.new:
+        entity = _ENTITY_BY_MODEL.get(type(obj))
+        if entity:
+            rows.append({"entity": entity, "entity_id": obj.id, "op": "upsert"})
+    for obj in session.dirty:
+        entity = _ENTITY_BY_MODEL.get(type(obj))
+        if entity and session.is_modified(obj, include_collections=False):
+            rows.append({"entity": entity, "entity_id": obj.id, "op": "upsert"})
+    for obj in session.deleted:
+        entity = _ENTITY_BY_MODEL.get(type(obj))
+        if entity:
+            rows.append({"entity": entity, "entity_id": obj.id, "op": "delete"})
+
+    if rows:
+        connection = session.connection()
+        _serialize_writers(connection)
+        connection.execute(ChangeLog.__table__.insert(), rows)
+
+
+event.listen(SessionLocal, "after_flush", _record_flush)
+
+
+class SyncService:
+    """Collect entity changes for a user since a change-log cursor.
+
+    The cursor is the highest ``change_log.seq`` a client has applied. Writers
+    of change_log rows are serialized until commit (by SQLite itself, by an
+    advisory lock on PostgreSQL; see ``_serialize_writers``), so sequence
+    numbers become visible in commit order.
+    """
+
+    def current_cursor(self, db: Session) -> int:
+        return db.query(func.max(ChangeLog.seq)).scalar() or 0
+
+    def snapshot(self, db: Session, user: AuthUser) -> dict:
+        """Everything visible to the user, for clients without a cursor."""
+        # Read the cursor first: anything committed afterwards is re-sent next time
+        cursor = self.current_cursor(db)
+        result = {"cursor": cursor, "has_more": False, "full": True, "deleted": []}
+        for entity, model in TRACKED_MODELS.items():
+            query = self._scoped(db, entity, user)
+            if entity == "notifications":
+                query = query.order_by(Notification.created_at.desc()).limit(SNAPSHOT_NOTIFICATIONS)
+            result[entity] = query.all()
+        return result
+
+    def changes_since(self, db: Session, user: AuthUser, since: int, limit: int = 1000) -> dict:
+        """Entities created, changed or deleted after ``since``, at most ``limit`` log rows."""
+        rows = (
+            db.query(ChangeLog)
+            .filter(ChangeLog.seq > since)
+            .order_by(ChangeLog.seq)
+            .limit(limit)
+            .all()
+        )
+
+        # Collapse to the last operation per entity
+        latest: dict[tuple[str, str], str] = {}
+        for row in rows:
+            latest[(row.entity, row.entity_id)] = row.op
+
+        upserts: dict[str, set[str]] = {entity: set() for entity in TRACKED_MODELS}
+        deleted = []
+        for (entity, entity_id), op in latest.items():
+            if entity not in upserts:
+                continue
+            if op == "delete":
+                deleted.append({"entity": entity, "id": entity_id})
+            else:
+                upserts[entity].add(entity_id)
+
+        result = {
+            "cursor": rows[-1].seq if rows else since,
+            "has_more": len(rows) == limit,
+            "full": False,
+            "deleted": deleted,
+        }
+        for entity, model in TRACKED_MODELS.items():
+            result[entity] = self._fetch(db, entity, user, upserts[entity])
+
+        # A changed assessment changes the parent request's list enrichment too
+        parent_ids = {a.request_id for a in result["assessments"]} - upserts["requests"]
+        if parent_ids:
+            result["requests"] += self._fetch(db, "requests", user, parent_ids)
+
+        return result
+
+    def _fetch(self, db: Session, entity: str, user: AuthUser, ids: set[str]) -> list:
+        if not ids:
+            return []
+        model = TRACKED_MODELS[entity]
+        ids = sorted(ids)
+        found = []
+        for i in range(0, len(ids), _CHUNK):
+            found += self._scoped(db, entity, user).filter(model.id.in_(ids[i:i + _CHUNK])).all()
+        return found
+
+    def _scoped(self, db: Session, entity: str, user: AuthUser):
+        """Base query restricted to what the user may see."""
+        model = TRACKED_MODELS[entity]
+        query = db.query(model)
+
+        if entity == "notifications":
+            return query.filter(Notification.user_id == user.id)
+        if user.role in (UserRole.HANDLER, UserRole.ADMIN):
+            return query
+
+        # Customers only see their own company's requests
+        if entity == "requests":
+            return query.filter(StaffingRequest.customer_id == user.customer_id)
+        own_requests = select(StaffingRequest.id).where(StaffingRequest.customer_id == user.customer_id)
+        return query.filter(model.request_id.in_(own_requests))
+
+
+# Singleton
+sync_service = SyncService()
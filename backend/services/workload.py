@@ -0,0 +1,207 @@
+"""
+Weekly working-hours load per consultant.
+
+Every assignment that still holds its consultant (any status but rejected or
+ended) adds its ``hours_per_week`` to each week it covers. Loads are kept per
+consultant as a compact ``array('f')`` of week buckets, with a running tail
+value for open-ended assignments, so checking a proposed assignment touches
+only the weeks it covers.
+
+The index is loaded from the ``assignments`` table on first use and then kept
+current by session hooks: every commit that adds, changes or removes an
+assignment (assign, approve, reject, ...) re-applies just that assignment.
+Changes committed by other worker processes are picked up by a full reload
+every ``WORKLOAD_RESYNC_S`` seconds.
+"""
+
+import threading
+import time
+from array import array
+from datetime import date, datetime
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from backend.config import settings
+from backend.database import SessionLocal, engine
+from backend.models import Assignment
+from backend.warmup import warmup_task
+
+DEFAULT_HOURS_PER_WEEK = 40.0
+RELEASED_STATUSES = ("rejected", "ended")
+
+
+def week_of(value: date | datetime) -> int:
+    """Monday-based week number (date.toordinal() 1 is a Monday)."""
+    if isinstance(value, datetime):
+        value = value.date()
+    return (value.toordinal() - 1) // 7
+
+
+class WeeklyLoad:
+    """Hours per week for one consultant, from week ``base`` on; weeks past the array carry ``tail``."""
+
+    __slots__ = ("base", "loads", "tail")
+
+    def __init__(self, base: int):
+        self.base = base
+        self.loads = array("f")
+        self.tail = 0.0  # hours of open-ended assignments, for every week after the array
+
+    def _cover(self, first: int, last: int) -> None:
+        if not self.loads:
+            self.base = first
+        elif first < self.base:
+            self.loads = array("f", [0.0]) * (self.base - first) + self.loads
+            self.base = first
+        missing = last - self.base + 1 - len(self.loads)
+        if missing > 0:
+            self.loads.extend([self.tail] * missing)
+
+    def add(self, first: int, last: int | None, hours: float) -> None:
+        """Add ``hours`` to weeks first..last (open-ended when ``last`` is None); negative to remove."""
+        self._cover(first, first if last is None else last)
+        loads = self.loads
+        stop = len(loads) if last is None else last - self.base + 1
+        for i in range(first - self.base, stop):
+            loads[i] += hours
+        if last is None:
+            self.tail += hours
+
+    def weekly(self, first: int, last: int | None) -> list[float]:
+        """Load of each week first..last; for open-ended ranges, up to the first week at the tail value."""
+        end = self.base + len(self.loads)
+        if last is None:
+            last = max(first, end)
+        return [
+            0.0 if w < self.base else self.tail if w >= end else self.loads[w - self.base]
+            for w in range(first, last + 1)
+        ]
+
+
+class WorkloadIndex:
+    """Weekly loads of all consultants, with the contribution of each assignment."""
+
+    def __init__(self, resync_s: float = 60.0):
+        self.resync_s = resync_s
+        self._loads: dict[str, WeeklyLoad] = {}
+        # assignment id -> (consultant id, request id, first week, last week or None, hours)
+        self._contributions: dict[str, tuple[str, str, int, int | None, float]] = {}
+        # (consultant id, request id) -> ids of its assignments in _contributions
+        self._by_request: dict[tuple[str, str], set[str]] = {}
+        self._next_resync = 0.0
+        self._lock = threading.Lock()
+
+    def reload(self, conn=None) -> None:
+        """Rebuild every consultant's buckets from the assignments table (of ``conn``'s database if given)."""
+        query = select(
+            Assignment.id, Assignment.consultant_id, Assignment.request_id, Assignment.start_date,
+            Assignment.end_date, func.coalesce(Assignment.hours_per_week, DEFAULT_HOURS_PER_WEEK),
+        ).where(Assignment.status.notin_(RELEASED_STATUSES))
+        with self._lock:
+            if conn is not None:
+                rows = conn.execute(query).all()
+            else:
+                with engine.connect() as conn:
+                    rows = conn.execute(query).all()
+            self._loads, self._contributions, self._by_request = {}, {}, {}
+            for row in rows:
+                self._apply(*row, holding=True)
+            self._next_resync = time.monotonic() + self.resync_s
+
+    def for_session(self, db: Session | None) -> "WorkloadIndex":
+        """This index, or for another database (benchmarks, tests, scripts) a fresh one loaded from it."""
+        if db is None or db.get_bind() is engine:
+            return self
+        index = WorkloadIndex(resync_s=float("inf"))
+        index.reload(db.connection())
+        return index
+
+    def _ensure_loaded(self) -> None:
+        if time.monotonic() >= self._next_resync:
+            self.reload()
+
+    def _apply(self, assignment_id, consultant_id, request_id, start, end, hours, holding: bool) -> None:
+        old = self._contributions.pop(assignment_id, None)
+        if old is not None:
+            self._loads[old[0]].add(old[2], old[3], -old[4])
+            ids = self._by_request[old[0], old[1]]
+            ids.discard(assignment_id)
+            if not ids:
+                del self._by_request[old[0], old[1]]
+        if holding and start is not None and hours:
+            first = week_of(start)
+            last = week_of(end) if end is not None else None
+            if last is not None and last < first:
+                return
+            load = self._loads.get(consultant_id)
+            if load is None:
+                load = self._loads[consultant_id] = WeeklyLoad(first)
+            load.add(first, last, hours)
+            self._contributions[assignment_id] = (consultant_id, request_id, first, last, hours)
+            self._by_request.setdefault((consultant_id, request_id), set()).add(assignment_id)
+
+    def apply(self, changes: list[tuple]) -> None:
+        """Re-apply committed assignments: (id, consultant, request, start, end, hours, holding)."""
+        with self._lock:
+            if self._next_resync == 0.0:
+                return  # not loaded yet; the first reload reads them from the table
+            for change in changes:
+                self._apply(*change[:6], holding=change[6])
+
+    def peak(
+        self, consultant_id: str, start: date | datetime, end: date | datetime | None,
+        exclude_request: str | None = None,
+    ) -> float:
+        """Highest weekly load of the consultant over [start, end], ignoring one request's assignments."""
+        self._ensure_loaded()
+        first = week_of(start)
+        last = week_of(end) if end is not None else None
+        with self._lock:
+            load = self._loads.get(consultant_id)
+            if load is None:
+                return 0.0
+            weekly = load.weekly(first, last)
+            if exclude_request is not None:
+                for assignment_id in self._by_request.get((consultant_id, exclude_request), ()):
+                    _, _, c_first, c_last, hours = self._contributions[assignment_id]
+                    stop = len(weekly) if c_last is None else min(len(weekly), c_last - first + 1)
+                    for i in range(max(0, c_first - first), stop):
+                        weekly[i] -= hours
+        return max(weekly, default=0.0)
+
+
+# Singleton
+workload = WorkloadIndex(settings.workload_resync_s)
+warmup_task("workload")(workload.reload)
+
+
+def _collect_assignments(session: Session, flush_context) -> None:
+    changes = []
+    for obj in (*session.new, *session.dirty):
+        if isinstance(obj, Assignment):
+            changes.append((
+                obj.id, obj.consultant_id, obj.request_id, obj.start_date, obj.end_date,
+                obj.hours_per_week if obj.hours_per_week is not None else DEFAULT_HOURS_PER_WEEK,
+                obj.status not in RELEASED_STATUSES,
+            ))
+    for obj in session.deleted:
+        if isinstance(obj, Assignment):
+            changes.append((obj.id, None, None, None, None, 0.0, False))
+    if changes:
+        session.info.setdefault("workload_changes", []).extend(changes)
+
+
+def _apply_after_commit(session: Session) -> None:
+    changes = session.info.pop("workload_changes", None)
+    if changes:
+        workload.apply(changes)
+
+
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop("workload_changes", None)
+
+
+event.listen(SessionLocal, "after_flush", _collect_assignments)
+event.listen(SessionLocal, "after_commit", _apply_after_commit)
+event.listen(SessionLocal, "after_rollback", _discard_after_rollback)
@@ -0,0 +1,420 @@
+"""
+Login sessions: pluggable TTL store plus an in-process user cache.
+
+A bearer token maps to a session record (user id + expiry) in one of the
+backends below, selected with ``SESSION_BACKEND``:
+
+- ``memory``   — LRU dict in this process (single worker, lost on restart)
+- ``database`` — ``auth_sessions`` table, shared by every worker (default)
+- ``redis``    — any Redis-compatible server at ``REDIS_URL`` (needs ``redis``)
+
+Expiry is sliding: a session used after half its TTL is extended by a full
+TTL. Resolved users are cached per token for ``SESSION_CACHE_TTL_S`` seconds,
+so authenticated requests normally touch neither the backend nor the users
+table. Logging out, or changing a user's role or active flag, drops the cached
+entries in this process at once and records the change in the
+``session_invalidations`` table; every other worker reads that table every
+``SESSION_INVALIDATION_SYNC_S`` seconds and drops the same entries.
+"""
+
+import hashlib
+import secrets
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, event, inspect, select, update
+from sqlalchemy.orm import Session
+
+from backend.config import settings
+from backend.database import SessionLocal, engine
+from backend.models import AuthSession, SessionInvalidation, User, UserRole
+
+try:
+    import redis
+except ImportError:  # optional: only needed for SESSION_BACKEND=redis
+    redis = None
+
+
+@dataclass(frozen=True)
+class AuthUser:
+    """
+    Detached snapshot of the authenticated user (safe to cache across requests).
+
+    Users resolved from a signed access token only carry ``id``, ``role`` and
+    ``customer_id``; load the ``User`` row when the profile is needed.
+    """
+
+    id: str
+    role: UserRole
+    customer_id: str | None
+    email: str | None = None
+    full_name: str | None = None
+    is_active: bool = True
+    created_at: datetime | None = None
+    last_login: datetime | None = None
+
+    @classmethod
+    def of(cls, user: User) -> "AuthUser":
+        return cls(
+            id=user.id, role=user.role, customer_id=user.customer_id, email=user.email,
+            full_name=user.full_name, is_active=user.is_active, created_at=user.created_at,
+            last_login=user.last_login,
+        )
+
+
+@dataclass(frozen=True)
+class SessionRecord:
+    user_id: str
+    expires_at: datetime
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(value: datetime) -> datetime:
+    # SQLite hands back naive datetimes; everything here is UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def token_hash(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+# ── Backends ───────────────────────────────────────────
+
+
+class SessionBackend(ABC):
+    """Storage for session records, keyed by token hash."""
+
+    @abstractmethod
+    def get(self, key: str) -> SessionRecord | None:
+        """The record, or None when missing or expired."""
+
+    @abstractmethod
+    def set(self, key: str, record: SessionRecord) -> None:
+        """Store a new record."""
+
+    @abstractmethod
+    def touch(self, key: str, expires_at: datetime) -> None:
+        """Move a record's expiry (sliding TTL)."""
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """Remove one record; missing keys are ignored."""
+
+    @abstractmethod
+    def delete_user(self, user_id: str) -> None:
+        """Remove every record of a user."""
+
+
+class MemorySessionBackend(SessionBackend):
+    """Bounded LRU of session records in this process."""
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._records: OrderedDict[str, SessionRecord] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> SessionRecord | None:
+        with self._lock:
+            record = self._records.get(key)
+            if record is None:
+                return None
+            if record.expires_at <= _now():
+                del self._records[key]
+                return None
+            self._records.move_to_end(key)
+            return record
+
+    def set(self, key: str, record: SessionRecord) -> None:
+        with self._lock:
+            self._records[key] = record
+            self._records.move_to_end(key)
+            while len(self._records) > self.max_entries:
+                self._records.popitem(last=False)
+
+    def touch(self, key: str, expires_at: datetime) -> None:
+        with self._lock:
+            record = self._records.get(key)
+            if record is not None:
+                self._records[key] = SessionRecord(record.user_id, expires_at)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._records.pop(key, None)
+
+    def delete_user(self, user_id: str) -> None:
+        with self._lock:
+            for key in [k for k, r in self._records.items() if r.user_id == user_id]:
+                del self._records[key]
+
+
+class DatabaseSessionBackend(SessionBackend):
+    """Session records in the ``auth_sessions`` table; expired rows are purged every few minutes."""
+
+    PURGE_INTERVAL_S = 600
+
+    def __init__(self):
+        self._next_purge = 0.0
+
+    def get(self, key: str) -> SessionRecord | None:
+        with engine.connect() as conn:
+            row = conn.execute(
+                select(AuthSession.user_id, AuthSession.expires_at).where(AuthSession.token_hash == key)
+            ).first()
+        if row is None or _aware(row.expires_at) <= _now():
+            return None
+        return SessionRecord(row.user_id, _aware(row.expires_at))
+
+    def set(self, key: str, record: SessionRecord) -> None:
+        with engine.begin() as conn:
+            if time.monotonic() >= self._next_purge:
+                self._next_purge = time.monotonic() + self.PURGE_INTERVAL_S
+                conn.execute(delete(AuthSession).where(AuthSession.expires_at <= _now()))
+            conn.execute(AuthSession.__table__.insert().values(
+                token_hash=key, user_id=record.user_id, created_at=_now(), expires_at=record.expires_at,
+            ))
+
+    def touch(self, key: str, expires_at: datetime) -> None:
+        with engine.begin() as conn:
+            conn.execute(update(AuthSession).where(AuthSession.token_hash == key).values(expires_at=expires_at))
+
+    def delete(self, key: str) -> None:
+        with engine.begin() as conn:
+            conn.execute(delete(AuthSession).where(AuthSession.token_hash == key))
+
+    def delete_user(self, user_id: str) -> None:
+        with engine.begin() as conn:
+            conn.execute(delete(AuthSession).where(AuthSession.user_id == user_id))
+
+
+class RedisSessionBackend(SessionBackend):
+    """Session records as Redis keys with native TTLs, plus a per-user key set for bulk revocation."""
+
+    def __init__(self, url: str, prefix: str = "intelliplan:session:"):
+        if redis is None:
+            raise RuntimeError("SESSION_BACKEND=redis requires the 'redis' package")
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+
+    def get(self, key: str) -> SessionRecord | None:
+        value = self.client.get(self.prefix + key)
+        if value is None:
+            return None
+        user_id, expires = value.split("|", 1)
+        return SessionRecord(user_id, datetime.fromtimestamp(float(expires), timezone.utc))
+
+    def set(self, key: str, record: SessionRecord) -> None:
+        ttl = max(1, int((record.expires_at - _now()).total_seconds()))
+        user_key = f"{self.prefix}user:{record.user_id}"
+        with self.client.pipeline() as pipe:
+            pipe.set(self.prefix + key, f"{record.user_id}|{record.expires_at.timestamp()}", ex=ttl)
+            pipe.sadd(user_key, key)
+            pipe.expire(user_key, ttl)
+            pipe.execute()
+
+    def touch(self, key: str, expires_at: datetime) -> None:
+        record = self.get(key)
+        if record is not None:
+            self.set(key, SessionRecord(record.user_id, expires_at))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(self.prefix + key)
+
+    def delete_user(self, user_id: str) -> None:
+        user_key = f"{self.prefix}user:{user_id}"
+        keys = self.client.smembers(user_key)
+        self.client.delete(user_key, *(self.prefix + k for k in keys))
+
+
+def _create_backend() -> SessionBackend:
+    if settings.session_backend == "memory":
+        return MemorySessionBackend(settings.session_max_entries)
+    if settings.session_backend == "database":
+        return DatabaseSessionBackend()
+    if settings.session_backend == "redis":
+        return RedisSessionBackend(settings.redis_url)
+    raise ValueError(f"Unknown session backend '{settings.session_backend}'")
+
+
+# ── Cross-worker cache invalidation ───────────────────
+
+# Invalidations are kept (and re-read) this long past the cache TTL, to cover
+# slow commits and clock skew between hosts
+_INVALIDATION_SLACK_S = 60.0
+
+
+class SessionInvalidations:
+    """Logouts and user changes from every worker, read from the ``session_invalidations`` table."""
+
+    def __init__(self, sync_s: float, keep_s: float):
+        self.sync_s = sync_s
+        self.keep_s = keep_s + _INVALIDATION_SLACK_S
+        self._applied: set[int] = set()  # ids already handed out by ``due``
+        self._next_sync = 0.0
+        self._lock = threading.Lock()
+
+    def publish(self, token_hash: str | None = None, user_id: str | None = None) -> None:
+        now = _now()
+        with engine.begin() as conn:
+            conn.execute(delete(SessionInvalidation).where(
+                SessionInvalidation.created_at <= now - timedelta(seconds=self.keep_s)
+            ))
+            result = conn.execute(SessionInvalidation.__table__.insert().values(
+                token_hash=token_hash, user_id=user_id, created_at=now,
+            ))
+        with self._lock:
+            self._applied.add(result.inserted_primary_key[0])
+
+    def due(self) -> list[tuple[str | None, str | None]]:
+        """``(token_hash, user_id)`` of invalidations not seen yet, once every ``sync_s`` seconds."""
+        if time.monotonic() < self._next_sync:
+            return []
+        self._next_sync = time.monotonic() + self.sync_s
+        # Read by age rather than by id: ids are allocated before commit, so a
+        # cursor on them could step over a transaction that commits late
+        since = _now() - timedelta(seconds=self.keep_s)
+        with engine.connect() as conn:
+            rows = conn.execute(
+                select(SessionInvalidation.id, SessionInvalidation.token_hash, SessionInvalidation.user_id)
+                .where(SessionInvalidation.created_at > since)
+            ).all()
+        with self._lock:
+            fresh = [(row.token_hash, row.user_id) for row in rows if row.id not in self._applied]
+            self._applied = {row.id for row in rows}
+        return fresh
+
+
+# ── Session store ──────────────────────────────────────
+
+
+class SessionStore:
+    """Create, resolve and revoke login sessions."""
+
+    def __init__(
+        self,
+        backend: SessionBackend,
+        ttl_s: float,
+        cache_ttl_s: float,
+        cache_size: int = 10_000,
+        invalidations: SessionInvalidations | None = None,
+    ):
+        self.backend = backend
+        self.invalidations = invalidations
+        self.ttl = timedelta(seconds=ttl_s)
+        self.cache_ttl_s = cache_ttl_s
+        self.cache_size = cache_size
+        self._cache: OrderedDict[str, tuple[AuthUser, float]] = OrderedDict()  # key -> (user, valid until)
+        self._lock = threading.Lock()
+
+    def create(self, user: User | AuthUser) -> str:
+        """Start a session for ``user``; its first authenticated request is already a cache hit."""
+        auth_user = user if isinstance(user, AuthUser) else AuthUser.of(user)
+        token = secrets.token_urlsafe(32)
+        key = token_hash(token)
+        self.backend.set(key, SessionRecord(user.id, _now() + self.ttl))
+        self._remember(key, auth_user, self.cache_ttl_s)
+        return token
+
+    def resolve(self, db: Session, token: str) -> AuthUser | None:
+        """The user behind ``token``, from the cache when possible (no queries)."""
+        key = token_hash(token)
+        if self.invalidations is not None:
+            for revoked_key, user_id in self.invalidations.due():
+                self._forget(revoked_key, user_id)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                if cached[1] > time.monotonic():
+                    self._cache.move_to_end(key)
+                    return cached[0]
+                del self._cache[key]
+
+        record = self.backend.get(key)
+        if record is None:
+            return None
+        user = db.get(User, record.user_id)
+        if user is None or not user.is_active:
+            return None
+        auth_user = AuthUser.of(user)
+
+        now = _now()
+        if record.expires_at - now < self.ttl / 2:
+            record = SessionRecord(record.user_id, now + self.ttl)
+            self.backend.touch(key, record.expires_at)
+
+        self._remember(key, auth_user, min(self.cache_ttl_s, (record.expires_at - now).total_seconds()))
+        return auth_user
+
+    def _remember(self, key: str, auth_user: AuthUser, valid_s: float) -> None:
+        with self._lock:
+            self._cache[key] = (auth_user, time.monotonic() + valid_s)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _forget(self, key: str | None = None, user_id: str | None = None) -> None:
+        with self._lock:
+            if key is not None:
+                self._cache.pop(key, None)
+            if user_id is not None:
+                for k in [k for k, (u, _) in self._cache.items() if u.id == user_id]:
+                    del self._cache[k]
+
+    def revoke(self, token: str) -> None:
+        key = token_hash(token)
+        self.backend.delete(key)
+        self._forget(key)
+        if self.invalidations is not None:
+            self.invalidations.publish(token_hash=key)
+
+    def revoke_user(self, user_id: str) -> None:
+        """End every session of a user (e.g. after a password change)."""
+        self.backend.delete_user(user_id)
+        self.invalidate_user(user_id)
+
+    def invalidate_user(self, user_id: str) -> None:
+        """Drop cached lookups for a user in every worker, so their next request reloads them."""
+        self._forget(user_id=user_id)
+        if self.invalidations is not None:
+            self.invalidations.publish(user_id=user_id)
+
+
+session_store = SessionStore(
+    _create_backend(),
+    settings.session_ttl_s,
+    settings.session_cache_ttl_s,
+    settings.session_max_entries,
+    SessionInvalidations(settings.session_invalidation_sync_s, settings.session_cache_ttl_s),
+)
+
+
+# Changes to a user's role or active flag take effect on their next request
+_CACHED_FIELDS = ("role", "is_active", "email", "full_name", "customer_id")
+
+
+def _collect_changed_users(session: Session, flush_context, instances) -> None:
+    for obj in session.dirty:
+        if isinstance(obj, User):
+            attrs = inspect(obj).attrs
+            if any(attrs[f].history.has_changes() for f in _CACHED_FIELDS):
+                session.info.setdefault("auth_changed_users", set()).add(obj.id)
+
+
+def _invalidate_after_commit(session: Session) -> None:
+    for user_id in session.info.pop("auth_changed_users", ()):
+        session_store.invalidate_user(user_id)
+
+
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop("auth_changed_users", None)
+
+
+event.listen(SessionLocal, "before_flush", _collect_changed_users)
+event.listen(SessionLocal, "after_commit", _invalidate_after_commit)
+event.listen(SessionLocal, "after_rollback", _discard_after_rollback)
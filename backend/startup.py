@@ -0,0 +1,58 @@
+"""
+Startup phase timing and the readiness flag behind ``/readyz``.
+
+The lifespan wraps each startup step in ``startup_report.phase(name)``, and
+the warm-up tasks (``backend.warmup``) add one phase each. Once warm-up is done
+``mark_ready()`` logs one line with the time spent per phase. ``/readyz``
+reports the same numbers.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Taken when the app module is first imported, so "imports" covers loading the app
+_IMPORTED_AT = time.perf_counter()
+
+
+class StartupReport:
+    """Durations of the startup phases of this process."""
+
+    def __init__(self):
+        self.phases: dict[str, float] = {}
+        self.failed: list[str] = []  # warm-up tasks that raised
+        self.ready = False
+        self._started = _IMPORTED_AT
+
+    @contextmanager
+    def phase(self, name: str):
+        if not self.phases:
+            self.phases["imports"] = time.perf_counter() - self._started
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - started
+
+    @property
+    def total_s(self) -> float:
+        return sum(self.phases.values())
+
+    def mark_ready(self) -> None:
+        self.ready = True
+        logger.info(
+            "Ready in %.3fs (%s)", self.total_s,
+            ", ".join(f"{name} {seconds:.3f}s" for name, seconds in self.phases.items()),
+        )
+
+    def as_dict(self) -> dict:
+        return {
+            "total_s": round(self.total_s, 4),
+            "phases": {name: round(seconds, 4) for name, seconds in self.phases.items()},
+            "failed": self.failed,
+        }
+
+
+startup_report = StartupReport()
@@ -0,0 +1,117 @@
+"""
+Precompressed, fingerprinted static assets.
+
+Every file under ``frontend/`` is read once, hashed and compressed at maximum
+level (gzip, plus brotli when installed). Assets are published under
+content-hash URLs (``/static/js/app.3f9c2a1b7d.js``) with
+``Cache-Control: immutable``, and ``index.html`` is rewritten to reference
+them, so repeat page loads only revalidate the HTML.
+"""
+
+import gzip
+import hashlib
+import mimetypes
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from fastapi import Request, Response
+
+from backend.middleware import accepted_encoding, brotli
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# Only worth compressing text formats above a few hundred bytes
+_COMPRESSIBLE_SUFFIXES = {".css", ".js", ".html", ".json", ".svg", ".txt", ".map"}
+_MIN_COMPRESS_SIZE = 256
+
+_STATIC_REF = re.compile(r'(?P<attr>href|src)="/static/(?P<path>[^"?#]+)"')
+
+
+@dataclass
+class Asset:
+    media_type: str
+    etag: str
+    body: bytes
+    encoded: dict[str, bytes] = field(default_factory=dict)  # encoding -> body
+
+
+def _build_asset(body: bytes, path: str) -> Asset:
+    digest = hashlib.sha256(body).hexdigest()
+    media_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    asset = Asset(media_type=media_type, etag=digest[:16], body=body)
+
+    if Path(path).suffix in _COMPRESSIBLE_SUFFIXES and len(body) >= _MIN_COMPRESS_SIZE:
+        asset.encoded["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+        if brotli is not None:
+            asset.encoded["br"] = brotli.compress(body, quality=11)
+    return asset
+
+
+def _fingerprint(path: str, digest: str) -> str:
+    p = Path(path)
+    return str(p.with_name(f"{p.stem}.{digest[:10]}{p.suffix}"))
+
+
+class StaticAssets:
+    """In-memory catalog of the frontend files, keyed by URL path under /static/."""
+
+    def __init__(self, directory: Path, index_name: str = "index.html"):
+        self.directory = directory
+        self.index_name = index_name
+        self.assets: dict[str, Asset] = {}
+        self.immutable: set[str] = set()
+        self.manifest: dict[str, str] = {}  # original path -> fingerprinted path
+        self.index: Asset | None = None
+
+    def build(self) -> None:
+        """Read, hash and precompress every asset, then rewrite index.html."""
+        assets, immutable, manifest = {}, set(), {}
+        for file in sorted(self.directory.rglob("*")):
+            if not file.is_file():
+                continue
+            path = file.relative_to(self.directory).as_posix()
+            asset = _build_asset(file.read_bytes(), path)
+            fingerprinted = _fingerprint(path, asset.etag)
+            assets[path] = asset
+            assets[fingerprinted] = asset
+            immutable.add(fingerprinted)
+            manifest[path] = fingerprinted
+
+        html = (self.directory / self.index_name).read_text(encoding="utf-8")
+        html = _STATIC_REF.sub(
+            lambda m: f'{m["attr"]}="/static/{manifest.get(m["path"], m["path"])}"',
+            html,
+        )
+        self.index = _build_asset(html.encode("utf-8"), self.index_name)
+        self.assets, self.immutable, self.manifest = assets, immutable, manifest
+
+    def response(self, request: Request, path: str) -> Response:
+        if self.index is None:
+            self.build()
+        asset = self.assets.get(path)
+        if asset is None:
+            return Response(status_code=404)
+        return self._respond(request, asset, IMMUTABLE if path in self.immutable else REVALIDATE)
+
+    def index_response(self, request: Request) -> Response:
+        if self.index is None:
+            self.build()
+        return self._respond(request, self.index, REVALIDATE)
+
+    def _respond(self, request: Request, asset: Asset, cache_control: str) -> Response:
+        headers = {"Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+        encoding = accepted_encoding(request.headers.get("accept-encoding", ""))
+        body = asset.body
+        etag = asset.etag
+        if encoding in asset.encoded:
+            body = asset.encoded[encoding]
+            etag = f"{asset.etag}-{encoding}"
+            headers["Content-Encoding"] = encoding
+        headers["ETag"] = f'"{etag}"'
+
+        if asset.etag in request.headers.get("if-none-match", ""):
+            headers.pop("Content-Encoding", None)
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type=asset.media_type, headers=headers)
@@ -0,0 +1,147 @@
+"""
+Stateless signed access tokens (``AUTH_TOKENS=signed``).
+
+An access token is ``v1.<claims>.<signature>``: base64url JSON claims (user id,
+role, customer id, expiry, token id) signed with HMAC-SHA256. Verifying one is
+a signature check and a set lookup — no database or session store.
+
+- Access tokens are short-lived (``ACCESS_TOKEN_TTL_S``). Long sessions use a
+  refresh token, which is an ordinary session from ``backend.sessions`` and is
+  rotated on every refresh.
+- Logout adds the token id to a small revocation list (``revoked_tokens``).
+  Each process reloads the unexpired entries every ``TOKEN_REVOCATION_SYNC_S``
+  seconds, so a revoked token stops working everywhere within that window.
+- A role change reaches the client with its next access token.
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import secrets
+import threading
+import time
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, select
+
+from backend.config import settings
+from backend.database import engine
+from backend.models import RevokedToken, User, UserRole
+from backend.sessions import AuthUser
+
+logger = logging.getLogger(__name__)
+
+VERSION = "v1"
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _secret() -> bytes:
+    if settings.token_secret:
+        return settings.token_secret.encode()
+    logger.warning("TOKEN_SECRET is not set: signed tokens are only valid in this process until it restarts")
+    return secrets.token_bytes(32)
+
+
+class RevocationList:
+    """Revoked token ids until their expiry, mirrored from the ``revoked_tokens`` table."""
+
+    def __init__(self, sync_s: float):
+        self.sync_s = sync_s
+        self._revoked: dict[str, float] = {}  # jti -> exp (unix time)
+        self._next_sync = 0.0
+        self._lock = threading.Lock()
+
+    def revoke(self, jti: str, exp: float) -> None:
+        with self._lock:
+            self._revoked[jti] = exp
+        with engine.begin() as conn:
+            conn.execute(delete(RevokedToken).where(RevokedToken.expires_at <= datetime.now(timezone.utc)))
+            conn.execute(RevokedToken.__table__.insert().values(
+                jti=jti, expires_at=datetime.fromtimestamp(exp, timezone.utc),
+            ))
+
+    def __contains__(self, jti: str) -> bool:
+        if time.monotonic() >= self._next_sync:
+            self._sync()
+        return jti in self._revoked
+
+    def _sync(self) -> None:
+        self._next_sync = time.monotonic() + self.sync_s
+        with engine.connect() as conn:
+            rows = conn.execute(
+                select(RevokedToken.jti, RevokedToken.expires_at)
+                .where(RevokedToken.expires_at > datetime.now(timezone.utc))
+            ).all()
+        revoked = {
+            jti: (exp if exp.tzinfo else exp.replace(tzinfo=timezone.utc)).timestamp()
+            for jti, exp in rows
+        }
+        with self._lock:
+            self._revoked = revoked
+
+
+class TokenSigner:
+    """Issue and verify signed access tokens."""
+
+    def __init__(self, secret: bytes, ttl_s: int, revoked: RevocationList):
+        self.secret = secret
+        self.ttl_s = ttl_s
+        self.revoked = revoked
+
+    def issue(self, user: User | AuthUser) -> str:
+        claims = {
+            "sub": user.id,
+            "role": user.role.value if isinstance(user.role, UserRole) else user.role,
+            "cid": user.customer_id,
+            "exp": int(time.time()) + self.ttl_s,
+            "jti": secrets.token_hex(8),
+        }
+        body = f"{VERSION}.{_b64encode(json.dumps(claims, separators=(',', ':')).encode())}"
+        return f"{body}.{self._sign(body)}"
+
+    def verify(self, token: str) -> dict | None:
+        """Claims of a valid, unexpired, unrevoked token; None otherwise."""
+        try:
+            version, payload, signature = token.split(".")
+        except ValueError:
+            return None
+        expected = self._sign(f"{version}.{payload}")
+        if version != VERSION or not hmac.compare_digest(signature.encode(), expected.encode()):
+            return None
+        try:
+            claims = json.loads(_b64decode(payload))
+        except ValueError:
+            return None
+        if claims["exp"] <= time.time() or claims["jti"] in self.revoked:
+            return None
+        return claims
+
+    def user(self, token: str) -> AuthUser | None:
+        claims = self.verify(token)
+        if claims is None:
+            return None
+        return AuthUser(id=claims["sub"], role=UserRole(claims["role"]), customer_id=claims["cid"])
+
+    def revoke(self, token: str) -> None:
+        claims = self.verify(token)
+        if claims is not None:
+            self.revoked.revoke(claims["jti"], claims["exp"])
+
+    def _sign(self, body: str) -> str:
+        return _b64encode(hmac.new(self.secret, body.encode(), hashlib.sha256).digest())
+
+
+token_signer = TokenSigner(
+    _secret() if settings.auth_tokens == "signed" else b"",
+    settings.access_token_ttl_s,
+    RevocationList(settings.token_revocation_sync_s),
+)
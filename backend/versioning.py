@@ -0,0 +1,70 @@
+"""
+Version counters for caches derived from database tables.
+
+``track(name, *models)`` bumps the counter ``name`` after every commit of a
+``SessionLocal`` session that inserted, updated or deleted one of ``models``.
+A cache remembers the version it was built at and rebuilds once
+``current(name)`` has moved on. Counters only see this process's commits;
+caches that must follow writes made by other workers also poll a cheap stamp
+from the database (see the compliance rule set). ``subscribe(name, callback)``
+runs a callback on every bump, for caches that drop stale entries eagerly.
+"""
+
+import threading
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from backend.database import SessionLocal
+
+_versions: dict[str, int] = {}
+_tracked: dict[type, set[str]] = {}  # model -> counters it bumps
+_subscribers: dict[str, list[Callable[[], None]]] = {}
+_lock = threading.Lock()
+
+
+def current(name: str) -> int:
+    return _versions.get(name, 0)
+
+
+def bump(name: str) -> int:
+    """Invalidate everything built at the current version (e.g. after a Core write)."""
+    with _lock:
+        _versions[name] = _versions.get(name, 0) + 1
+        version = _versions[name]
+    for callback in _subscribers.get(name, ()):
+        callback()
+    return version
+
+
+def subscribe(name: str, callback: Callable[[], None]) -> None:
+    """Call ``callback()`` after every bump of ``name``."""
+    _subscribers.setdefault(name, []).append(callback)
+
+
+def track(name: str, *models: type) -> None:
+    """Bump ``name`` whenever a commit changes rows of ``models``."""
+    for model in models:
+        _tracked.setdefault(model, set()).add(name)
+
+
+def _collect(session: Session, flush_context) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        names = _tracked.get(type(obj))
+        if names:
+            session.info.setdefault("version_bumps", set()).update(names)
+
+
+def _bump_after_commit(session: Session) -> None:
+    for name in session.info.pop("version_bumps", ()):
+        bump(name)
+
+
+def _discard_after_rollback(session: Session) -> None:
+    session.info.pop("version_bumps", None)
+
+
+event.listen(SessionLocal, "after_flush", _collect)
+event.listen(SessionLocal, "after_commit", _bump_after_commit)
+event.listen(SessionLocal, "after_rollback", _discard_after_rollback)
@@ -0,0 +1,46 @@
+"""
+Startup warm-up: fill caches before the instance takes traffic.
+
+Modules register tasks with ``@warmup_task(name)``; after the lifespan's own
+phases, ``start()`` runs them one by one on a background thread, each timed as
+a ``warmup.<name>`` phase of the startup report. ``/readyz`` stays 503 until the
+last task has run, so a load balancer only routes to a warm instance. A failing
+task is logged and skipped: the cache it was meant to fill is then built by the
+first request that needs it.
+"""
+
+import logging
+import threading
+from typing import Callable
+
+from backend.startup import startup_report
+
+logger = logging.getLogger(__name__)
+
+WARMUP_TASKS: dict[str, Callable[[], None]] = {}
+
+
+def warmup_task(name: str):
+    """Decorator: run ``fn()`` during startup warm-up."""
+    def decorator(fn: Callable[[], None]):
+        WARMUP_TASKS[name] = fn
+        return fn
+    return decorator
+
+
+def run() -> None:
+    """Run every registered task, then mark the process ready."""
+    for name, task in list(WARMUP_TASKS.items()):
+        try:
+            with startup_report.phase(f"warmup.{name}"):
+                task()
+        except Exception:
+            startup_report.failed.append(name)
+            logger.exception("Warm-up task '%s' failed", name)
+    startup_report.mark_ready()
+
+
+def start() -> threading.Thread:
+    thread = threading.Thread(target=run, name="warmup", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,112 @@
+"""
+Background job worker.
+
+    python -m backend.worker --processes 2
+
+Each process claims jobs from the ``jobs`` table one at a time, keeps the
+lease alive from a heartbeat thread while the handler runs, and records the
+outcome. SIGTERM/SIGINT stop the workers after their current job; a job whose
+worker was killed outright becomes visible again once its lease expires.
+"""
+
+import argparse
+import logging
+import multiprocessing
+import signal
+import threading
+import time
+
+from backend.database import SessionLocal, engine, init_db
+from backend.services.jobs import DEFAULT_LEASE_S, job_queue, worker_id
+import backend.services.coordinator  # noqa: F401  registers the coordination job handler
+import backend.services.sync  # noqa: F401  registers the change-log flush hook on SessionLocal
+
+logger = logging.getLogger("backend.worker")
+
+
+class _Heartbeat(threading.Thread):
+    """Extend a job's lease every third of the lease period until stopped."""
+
+    def __init__(self, job, lease_s: float):
+        super().__init__(name="job-heartbeat", daemon=True)
+        self.job_id = job.id
+        self.claim_token = job.locked_by
+        self.lease_s = lease_s
+        self.stopped = threading.Event()
+
+    def run(self) -> None:
+        db = SessionLocal()
+        try:
+            while not self.stopped.wait(self.lease_s / 3):
+                if not job_queue.extend(db, self.job_id, self.claim_token, self.lease_s):
+                    logger.warning("Lost the lease on job %s", self.job_id)
+                    return
+        finally:
+            db.close()
+
+
+def work(poll_s: float, lease_s: float, kinds: list[str] | None) -> None:
+    """Claim and run jobs until SIGTERM/SIGINT."""
+    # Never share connections inherited from the parent process
+    engine.dispose(close=False)
+    stopping = threading.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(sig, lambda *_: stopping.set())
+
+    worker = worker_id()
+    logger.info("Worker %s started", worker)
+    db = SessionLocal()
+    try:
+        while not stopping.is_set():
+            job = job_queue.claim(db, worker, lease_s, kinds)
+            if job is None:
+                stopping.wait(poll_s)
+                continue
+            heartbeat = _Heartbeat(job, lease_s)
+            heartbeat.start()
+            job_id, kind, started = job.id, job.kind, time.perf_counter()
+            try:
+                ok = job_queue.run(db, job)
+            finally:
+                heartbeat.stopped.set()
+            logger.info("Job %s (%s) %s in %.2fs", job_id, kind,
+                        "done" if ok else "failed", time.perf_counter() - started)
+    finally:
+        db.close()
+    logger.info("Worker %s stopped", worker)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run background job workers.")
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--poll", type=float, default=1.0, help="seconds to sleep when the queue is empty")
+    parser.add_argument("--lease", type=float, default=DEFAULT_LEASE_S, help="lease (visibility timeout) in seconds")
+    parser.add_argument("--kinds", nargs="*", help="only run jobs of these kinds")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(message)s")
+    init_db()
+    if args.processes == 1:
+        work(args.poll, args.lease, args.kinds)
+        return
+
+    processes = [
+        multiprocessing.Process(target=work, args=(args.poll, args.lease, args.kinds), name=f"worker-{i}")
+        for i in range(args.processes)
+    ]
+    for p in processes:
+        p.start()
+
+    def stop(*_):
+        for p in processes:
+            if p.is_alive():
+                p.terminate()  # SIGTERM: finish the current job, then exit
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    for p in processes:
+        p.join()
+
+
+if __name__ == "__main__":
+    main()
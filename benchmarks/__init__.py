@@ -0,0 +1,7 @@
+"""
+Performance benchmarks for Intelliplan.
+
+Run suites and check for regressions with ``python -m benchmarks run|compare``;
+individual scripts such as ``python -m benchmarks.bench_serialization`` can
+still be run on their own.
+"""
@@ -0,0 +1,82 @@
+"""
+Benchmark CLI.
+
+    python -m benchmarks run [--suite services] [--quick] [--save PATH | --baseline]
+    python -m benchmarks compare [--suite services] [--baseline PATH] [--current PATH] [--threshold 0.15]
+
+``run --baseline`` records ``benchmarks/baselines/<suite>.json``. ``compare``
+runs the suite (unless ``--current`` is given) and exits with status 1 when any
+case's median is slower than the baseline by more than the threshold.
+"""
+
+import argparse
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks import bench_serialization, bench_services
+from benchmarks.runner import BASELINE_DIR, compare, load, print_results, save, time_case
+
+SUITES = {
+    "services": bench_services.cases,
+    "serialization": bench_serialization.cases,
+}
+
+
+def _run_suite(suite: str, quick: bool, pattern: str | None):
+    results = []
+    for case in SUITES[suite](quick=quick):
+        if pattern and pattern not in case.name:
+            continue
+        results.append(time_case(case))
+        print(f"  {case.name} done", file=sys.stderr)
+    return results
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Intelliplan benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run_p = sub.add_parser("run", help="run a suite and print (optionally save) the results")
+    compare_p = sub.add_parser("compare", help="compare results against a baseline")
+    for p in (run_p, compare_p):
+        p.add_argument("--suite", choices=sorted(SUITES), default="services")
+        p.add_argument("--quick", action="store_true", help="skip the largest data sizes")
+        p.add_argument("-k", dest="pattern", help="only run cases whose name contains this")
+    run_p.add_argument("--save", type=Path, help="write results to this JSON file")
+    run_p.add_argument("--baseline", action="store_true", help="write results as the suite baseline")
+    compare_p.add_argument("--baseline", type=Path, help="baseline JSON (default: baselines/<suite>.json)")
+    compare_p.add_argument("--current", type=Path, help="results JSON to compare instead of running now")
+    compare_p.add_argument("--threshold", type=float, default=0.15, help="allowed slowdown, 0.15 = 15%%")
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        results = _run_suite(args.suite, args.quick, args.pattern)
+        print_results(results)
+        target = BASELINE_DIR / f"{args.suite}.json" if args.baseline else args.save
+        if target:
+            save(results, target)
+            print(f"saved {target}")
+        return 0
+
+    baseline_path = args.baseline or BASELINE_DIR / f"{args.suite}.json"
+    if not baseline_path.exists():
+        parser.error(f"no baseline at {baseline_path}; record one with `run --suite {args.suite} --baseline`")
+    if args.current:
+        current = load(args.current)
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "current.json"
+            save(_run_suite(args.suite, args.quick, args.pattern), path)
+            current = load(path)
+
+    lines, regressed = compare(load(baseline_path), current, args.threshold)
+    print("\n".join(lines))
+    if regressed:
+        print(f"FAIL: regression beyond {args.threshold:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
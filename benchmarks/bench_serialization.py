@@ -0,0 +1,169 @@
+"""
+Serialization share of GET /api/requests, before and after the orjson fast path.
+
+"before" replays what the endpoint used to do: ``StaffingRequestOut.model_validate``
+plus ``json.loads`` per row, FastAPI's response-model validation and dump, and
+Starlette's ``json.dumps``. "after" is the current ``_list_row`` + orjson path.
+
+    python -m benchmarks.bench_serialization --rows 10000
+"""
+
+import argparse
+import json
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import joinedload, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.database import Base
+from backend.models import Customer, FeasibilityAssessment, StaffingRequest
+from backend.routers.requests import _list_row
+from backend.schemas import StaffingRequestOut
+from backend.services.ai_engine import SKILL_CATEGORIES
+from benchmarks.runner import Case
+
+
+def build_session(rows: int, seed: int = 42):
+    """In-memory SQLite with ``rows`` assessed requests spread over 50 customers."""
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    rng = random.Random(seed)
+    skills = sorted({s for group in SKILL_CATEGORIES.values() for s in group})
+    now = datetime.now(timezone.utc)
+
+    customers = [
+        {"id": f"cust-{i:03d}", "name": f"Kund {i}", "company": f"Företag {i} AB", "email": f"kund{i}@example.se"}
+        for i in range(50)
+    ]
+    requests, assessments = [], []
+    for i in range(rows):
+        rid = f"req-{i:06d}"
+        requests.append({
+            "id": rid,
+            "customer_id": rng.choice(customers)["id"],
+            "title": f"Konsult {i}",
+            "description": "Vi söker en erfaren konsult för ett längre uppdrag. " * 3,
+            "required_skills": json.dumps(rng.sample(skills, rng.randint(2, 6))),
+            "number_of_consultants": rng.randint(1, 3),
+            "start_date": now + timedelta(days=rng.randint(1, 90)),
+            "budget_max_hourly": float(rng.randrange(700, 1400, 50)),
+            "location": "Stockholm",
+            "remote_ok": rng.random() < 0.5,
+            "priority": rng.choice(["LOW", "MEDIUM", "HIGH", "URGENT"]),
+            "status": "ASSESSED",
+            "ai_summary": "Request for backend resources with focus on python, docker.",
+            "ai_category": "backend",
+            "ai_complexity_score": round(rng.random(), 2),
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now,
+        })
+        assessments.append({
+            "id": f"fa-{i:06d}",
+            "request_id": rid,
+            "overall_rating": "HIGH",
+            "confidence_score": round(rng.random(), 2),
+            "matching_consultants": json.dumps([f"cons-{rng.randint(1, 999):03d}" for _ in range(5)]),
+            "risks": json.dumps(["Tight timeline — less than 2 weeks"]),
+            "recommendations": json.dumps(["👍 Balanced assessment — proceed with standard matching process"]),
+            "alternatives": json.dumps([]),
+        })
+
+    with engine.begin() as conn:
+        conn.execute(Customer.__table__.insert(), customers)
+        conn.execute(StaffingRequest.__table__.insert(), requests)
+        conn.execute(FeasibilityAssessment.__table__.insert(), assessments)
+
+    return sessionmaker(bind=engine)()
+
+
+def load_rows(db):
+    return (
+        db.query(StaffingRequest)
+        .options(joinedload(StaffingRequest.customer), joinedload(StaffingRequest.assessment))
+        .order_by(StaffingRequest.created_at.desc())
+        .all()
+    )
+
+
+_adapter = TypeAdapter(list[StaffingRequestOut])
+
+
+def serialize_before(rows) -> bytes:
+    results = []
+    for r in rows:
+        out = StaffingRequestOut.model_validate(r)
+        out.required_skills = json.loads(r.required_skills)
+        if r.customer:
+            out.company_name = r.customer.company
+        if r.assessment:
+            out.feasibility_score = round(r.assessment.confidence_score * 100)
+        results.append(out)
+    # FastAPI response_model handling, then Starlette's JSONResponse.render
+    content = [m.model_dump() for m in results]
+    content = _adapter.dump_python(_adapter.validate_python(content), mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+def serialize_after(rows) -> bytes:
+    return orjson.dumps([_list_row(r) for r in rows])
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def run(rows: int = 10_000, repeat: int = 5) -> dict:
+    db = build_session(rows)
+    loaded = load_rows(db)
+
+    def query():
+        db.expunge_all()
+        load_rows(db)
+
+    results = {
+        "rows": rows,
+        "query_s": _best(query, repeat),
+        "before_s": _best(lambda: serialize_before(loaded), repeat),
+        "after_s": _best(lambda: serialize_after(loaded), repeat),
+    }
+    for phase in ("before", "after"):
+        total = results["query_s"] + results[f"{phase}_s"]
+        results[f"{phase}_share"] = results[f"{phase}_s"] / total
+    db.close()
+    return results
+
+
+def cases(quick: bool = False):
+    """Serialization cases for the ``python -m benchmarks`` runner."""
+    db = build_session(1_000 if quick else 10_000)
+    loaded = load_rows(db)
+    yield Case(f"serialize.requests_list[{len(loaded)}]", lambda: serialize_after(loaded), repeat=10)
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    r = run(args.rows, args.repeat)
+    print(f"GET /api/requests — {r['rows']} rows (best of {args.repeat})")
+    print(f"  query + hydrate      {r['query_s'] * 1000:8.1f} ms")
+    print(f"  serialize (before)   {r['before_s'] * 1000:8.1f} ms   {r['before_share']:.0%} of request")
+    print(f"  serialize (after)    {r['after_s'] * 1000:8.1f} ms   {r['after_share']:.0%} of request")
+    print(f"  speedup              {r['before_s'] / r['after_s']:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
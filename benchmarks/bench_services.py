@@ -0,0 +1,114 @@
+"""
+Service-layer microbenchmarks against in-memory SQLite.
+
+Covers ``AIEngine.analyze_request`` on short/long Swedish/English texts,
+``FeasibilityService.assess``, ``ComplianceEngine.check_request`` and the
+consultant pool snapshot and column builds at 100 / 10k / 100k consultants,
+and ``Coordinator.execute_all_actions`` / ``run_plan``. The in-memory databases
+are not the application's, so ``assess`` builds fresh pool columns and
+compiles the compliance rules every time here: it measures the cold path.
+
+    python -m benchmarks run --suite services
+"""
+
+from backend.models import Consultant, StaffingRequest
+from backend.services.ai_engine import ai_engine
+from backend.services.compliance import compliance_engine
+from backend.services.consultant_pool import PoolSnapshot
+from backend.services.shared_pool import build_buffer
+from backend.services.coordinator import coordinator
+from backend.services.feasibility import feasibility_service
+from benchmarks.fixtures import add_consultants, add_customers, add_request, memory_session
+from benchmarks.runner import Case
+
+POOL_SIZES = (100, 10_000, 100_000)
+QUICK_POOL_SIZES = (100, 10_000)
+
+_SV_PARAGRAPH = (
+    "Vi söker en senior backend-utvecklare till vårt plattformsteam i Göteborg. "
+    "Du kommer att arbeta med Python, FastAPI och PostgreSQL i en mikrotjänstarkitektur "
+    "som körs på Kubernetes i AWS. Erfarenhet av CI/CD, Terraform och observability är meriterande. "
+    "Uppdraget är på heltid med start så snart som möjligt, minst 5 års erfarenhet krävs. "
+)
+_EN_PARAGRAPH = (
+    "We are looking for a senior backend developer to join our platform team in Stockholm. "
+    "You will work with Python, FastAPI and PostgreSQL in a microservice architecture "
+    "running on Kubernetes in AWS. Experience with CI/CD, Terraform and observability is a plus. "
+    "The engagement is full time, starting as soon as possible; 5+ years of experience required. "
+)
+
+TEXTS = {
+    "short_en": ("Backend developer", "Python developer for an urgent API project."),
+    "long_en": ("Senior backend developer", _EN_PARAGRAPH * 12),
+    "short_sv": ("Backend-utvecklare", "Python-utvecklare till ett akut API-projekt."),
+    "long_sv": ("Senior backend-utvecklare", _SV_PARAGRAPH * 12),
+}
+
+
+def _repeat_for(pool_size: int) -> int:
+    return 3 if pool_size >= 100_000 else 5 if pool_size >= 10_000 else 20
+
+
+def cases(quick: bool = False):
+    """Yield benchmark cases; databases are built lazily and dropped per pool size."""
+    for name, (title, description) in TEXTS.items():
+        yield Case(
+            f"ai_engine.analyze_request[{name}]",
+            lambda t=title, d=description: ai_engine.analyze_request(t, d, []),
+            repeat=200,
+        )
+
+    for size in QUICK_POOL_SIZES if quick else POOL_SIZES:
+        db = memory_session()
+        customer_id = add_customers(db, 5)[0]
+        add_consultants(db, size)
+        request_id = add_request(db, customer_id).id
+        repeat = _repeat_for(size)
+
+        # Empty identity map each time, as in a fresh request-scoped session
+        yield Case(
+            f"feasibility.assess[{size}]",
+            lambda db=db, rid=request_id: feasibility_service.assess(db, rid),
+            setup=db.expunge_all,
+            repeat=repeat,
+        )
+
+        yield Case(
+            f"consultant_pool.build[{size}]",
+            lambda db=db: PoolSnapshot.build(db.connection()),
+            repeat=repeat,
+        )
+        yield Case(
+            f"shared_pool.build[{size}]",
+            lambda db=db: build_buffer(db.connection()),
+            repeat=repeat,
+        )
+
+        request = db.get(StaffingRequest, request_id)
+        request.customer  # loaded up front, the contract rule reads it
+        consultants = db.query(Consultant).all()
+        # Against the benchmark database's own rules, which are compiled fresh and never cached
+        yield Case(
+            f"compliance.check_request[{size}]",
+            lambda r=request, c=consultants, db=db: compliance_engine.check_request(r, c, db),
+            repeat=repeat * 4,
+        )
+        db.close()
+        db.get_bind().dispose()
+
+    db = memory_session()
+    customer_id = add_customers(db, 5)[0]
+    add_consultants(db, 100)
+    request = add_request(db, customer_id)
+    yield Case(
+        "coordinator.execute_all_actions",
+        lambda: coordinator.execute_all_actions(db, request.id),
+        setup=lambda: coordinator.create_action_plan(db, request.id),
+        repeat=20,
+    )
+    yield Case(
+        "coordinator.run_plan",
+        lambda: coordinator.run_plan(db, request.id),
+        repeat=20,
+    )
+    db.close()
@@ -0,0 +1,83 @@
+"""Synthetic data for benchmarks, loaded into in-memory SQLite via Core bulk inserts."""
+
+import json
+import random
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+import backend.services.sync  # noqa: F401  registers the change-log flush hook on SessionLocal
+from backend.database import Base, SessionLocal
+from backend.models import Consultant, ConsultantStatus, Customer, StaffingRequest
+from backend.services.ai_engine import SKILL_CATEGORIES
+
+SKILLS = sorted({s for group in SKILL_CATEGORIES.values() for s in group})
+
+# Rough shape of the real pool: most consultants are out on assignments
+_STATUS_WEIGHTS = [
+    (ConsultantStatus.ASSIGNED, 0.6),
+    (ConsultantStatus.AVAILABLE, 0.25),
+    (ConsultantStatus.ENDING_SOON, 0.1),
+    (ConsultantStatus.ON_LEAVE, 0.05),
+]
+
+
+def memory_session():
+    """
+    Fresh in-memory SQLite session with all tables created.
+
+    Built from ``SessionLocal`` so the app's session hooks (change log) run
+    exactly as they do in production.
+    """
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    return SessionLocal(bind=engine)
+
+
+def add_customers(db, count: int = 50) -> list[str]:
+    rows = [
+        {"id": f"cust-{i:03d}", "name": f"Kund {i}", "company": f"Företag {i} AB",
+         "email": f"kund{i}@example.se", "contract_type": "standard"}
+        for i in range(count)
+    ]
+    db.execute(Customer.__table__.insert(), rows)
+    db.commit()
+    return [r["id"] for r in rows]
+
+
+def add_consultants(db, count: int, seed: int = 42) -> None:
+    rng = random.Random(seed)
+    statuses, weights = zip(*_STATUS_WEIGHTS)
+    rows = [
+        {
+            "id": f"cons-{i:06d}",
+            "name": f"Konsult {i}",
+            "email": f"konsult{i}@consultant.se",
+            "title": "Developer",
+            "skills": json.dumps(rng.sample(SKILLS, rng.randint(3, 8))),
+            "hourly_rate": float(rng.randrange(650, 1500, 25)),
+            "status": rng.choices(statuses, weights)[0].name,
+        }
+        for i in range(count)
+    ]
+    for start in range(0, len(rows), 5000):
+        db.execute(Consultant.__table__.insert(), rows[start:start + 5000])
+    db.commit()
+
+
+def add_request(db, customer_id: str, request_id: str = "req-bench", skills: list[str] | None = None) -> StaffingRequest:
+    request = StaffingRequest(
+        id=request_id,
+        customer_id=customer_id,
+        title="Senior Python-utvecklare till plattformsteam",
+        description="Vi söker en erfaren backend-utvecklare med Python, Docker och AWS för ett längre uppdrag.",
+        required_skills=json.dumps(skills or ["python", "docker", "aws"]),
+        number_of_consultants=2,
+        start_date=datetime.now(timezone.utc) + timedelta(days=21),
+        budget_max_hourly=1100,
+        location="Stockholm",
+    )
+    db.add(request)
+    db.commit()
+    return request
@@ -0,0 +1,248 @@
+"""
+HTTP load generator replaying the staffing workflow against a running server.
+
+Virtual customers log in, submit requests and poll their notifications.
+Virtual handlers pick up submitted requests and run
+assess → coordinate → assign → approve/reject, polling notifications while idle.
+Everything is driven by a scenario file (see ``benchmarks/scenarios/``), and
+each virtual user draws from its own RNG seeded from the scenario, so the same
+scenario replays the same sequence of actions.
+
+    python -m benchmarks.loadtest benchmarks/scenarios/workflow.json --base-url http://127.0.0.1:8000
+
+Reports throughput, latency percentiles per endpoint and error rates.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import httpx
+
+
+@dataclass
+class EndpointStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    statuses: dict[int, int] = field(default_factory=dict)
+
+
+class Recorder:
+    """Collects per-endpoint latencies and failures."""
+
+    def __init__(self):
+        self.endpoints: dict[str, EndpointStats] = {}
+        self.started = time.perf_counter()
+        self.finished: float | None = None
+
+    def record(self, name: str, elapsed: float, status: int | None) -> None:
+        stats = self.endpoints.setdefault(name, EndpointStats())
+        stats.latencies.append(elapsed)
+        if status is None or status >= 400:
+            stats.errors += 1
+        key = status if status is not None else 0  # 0 = transport error
+        stats.statuses[key] = stats.statuses.get(key, 0) + 1
+
+    def summary(self) -> dict:
+        wall = (self.finished or time.perf_counter()) - self.started
+        endpoints = {}
+        for name, stats in sorted(self.endpoints.items()):
+            lat = sorted(stats.latencies)
+            endpoints[name] = {
+                "count": len(lat),
+                "rps": len(lat) / wall,
+                "errors": stats.errors,
+                "error_rate": stats.errors / len(lat),
+                "p50_ms": _percentile(lat, 50) * 1000,
+                "p90_ms": _percentile(lat, 90) * 1000,
+                "p95_ms": _percentile(lat, 95) * 1000,
+                "p99_ms": _percentile(lat, 99) * 1000,
+                "max_ms": lat[-1] * 1000,
+                "mean_ms": statistics.fmean(lat) * 1000,
+                "statuses": stats.statuses,
+            }
+        total = sum(e["count"] for e in endpoints.values())
+        errors = sum(e["errors"] for e in endpoints.values())
+        return {
+            "wall_s": wall,
+            "requests": total,
+            "rps": total / wall if wall else 0.0,
+            "errors": errors,
+            "error_rate": errors / total if total else 0.0,
+            "endpoints": endpoints,
+        }
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+class VirtualUser:
+    def __init__(self, client: httpx.AsyncClient, recorder: Recorder, rng: random.Random):
+        self.client = client
+        self.recorder = recorder
+        self.rng = rng
+        self.headers: dict[str, str] = {}
+        self.user: dict = {}
+
+    async def call(self, name: str, method: str, url: str, **kwargs) -> httpx.Response | None:
+        start = time.perf_counter()
+        try:
+            resp = await self.client.request(method, url, headers=self.headers, **kwargs)
+        except httpx.HTTPError:
+            self.recorder.record(name, time.perf_counter() - start, None)
+            return None
+        self.recorder.record(name, time.perf_counter() - start, resp.status_code)
+        return resp
+
+    async def login(self, account: dict) -> bool:
+        resp = await self.call("POST /api/auth/login", "POST", "/api/auth/login", json=account)
+        if resp is None or resp.status_code != 200:
+            return False
+        body = resp.json()
+        self.headers = {"Authorization": f"Bearer {body['token']}"}
+        self.user = body["user"]
+        return True
+
+    async def think(self, bounds: list[float]) -> None:
+        await asyncio.sleep(self.rng.uniform(*bounds))
+
+    async def poll_notifications(self) -> None:
+        await self.call("GET /api/notifications/unread-count", "GET", "/api/notifications/unread-count")
+        await self.call("GET /api/notifications", "GET", "/api/notifications")
+
+
+async def customer(vu: VirtualUser, account: dict, cfg: dict, templates: list[dict],
+                   submitted: asyncio.Queue, deadline: float) -> None:
+    if not await vu.login(account):
+        return
+    while time.perf_counter() < deadline:
+        payload = dict(vu.rng.choice(templates))
+        payload["customer_id"] = vu.user["customer_id"]
+        payload["start_date"] = (datetime.now(timezone.utc) + timedelta(days=vu.rng.randint(7, 60))).isoformat()
+        resp = await vu.call("POST /api/requests", "POST", "/api/requests", json=payload)
+        if resp is not None and resp.status_code == 201:
+            request_id = resp.json()["id"]
+            submitted.put_nowait(request_id)
+            await vu.call("GET /api/requests/{id}", "GET", f"/api/requests/{request_id}")
+        for _ in range(cfg.get("polls_per_submit", 3)):
+            if time.perf_counter() >= deadline:
+                return
+            await vu.think(cfg["think_time_s"])
+            await vu.poll_notifications()
+
+
+async def handler(vu: VirtualUser, account: dict, cfg: dict, submitted: asyncio.Queue, deadline: float) -> None:
+    if not await vu.login(account):
+        return
+    while time.perf_counter() < deadline:
+        try:
+            request_id = await asyncio.wait_for(submitted.get(), timeout=cfg.get("idle_poll_s", 2.0))
+        except asyncio.TimeoutError:
+            await vu.poll_notifications()
+            continue
+
+        base = f"/api/requests/{request_id}"
+        await vu.call("POST /api/requests/{id}/assess", "POST", f"{base}/assess")
+        await vu.think(cfg["think_time_s"])
+        await vu.call("POST /api/requests/{id}/coordinate", "POST", f"{base}/coordinate")
+        detail = await vu.call("GET /api/requests/{id}", "GET", base)
+        if detail is None or detail.status_code != 200:
+            continue
+        candidates = detail.json().get("matching_consultants") or []
+        if not candidates:
+            continue
+        await vu.think(cfg["think_time_s"])
+        consultant_id = vu.rng.choice(candidates[:3])["id"]
+        resp = await vu.call("POST /api/requests/{id}/assign/{consultant}", "POST", f"{base}/assign/{consultant_id}")
+        if resp is None or resp.status_code != 200:
+            continue
+        assignment_id = resp.json()["id"]
+        decision = "reject" if vu.rng.random() < cfg.get("reject_ratio", 0.2) else "approve"
+        await vu.call(f"PATCH /api/requests/{{id}}/assignments/{{aid}}/{decision}", "PATCH",
+                      f"{base}/assignments/{assignment_id}/{decision}")
+        await vu.poll_notifications()
+
+
+async def run_scenario(scenario: dict, base_url: str, duration: float | None = None) -> dict:
+    duration = duration or scenario.get("duration_s", 60)
+    ramp_up = scenario.get("ramp_up_s", 0)
+    seed = scenario.get("seed", 0)
+    customers_cfg, handlers_cfg = scenario["customers"], scenario["handlers"]
+    total_users = customers_cfg["users"] + handlers_cfg["users"]
+
+    recorder = Recorder()
+    submitted: asyncio.Queue = asyncio.Queue()
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=total_users, max_keepalive_connections=total_users)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        async def start(index: int, coro_factory):
+            # Spread logins evenly over the ramp-up period
+            await asyncio.sleep(ramp_up * index / max(total_users, 1))
+            vu = VirtualUser(client, recorder, random.Random(f"{seed}-{index}"))
+            await coro_factory(vu)
+
+        tasks = []
+        for i in range(customers_cfg["users"]):
+            account = customers_cfg["accounts"][i % len(customers_cfg["accounts"])]
+            tasks.append(start(len(tasks), lambda vu, a=account: customer(
+                vu, a, customers_cfg, scenario["requests"], submitted, deadline)))
+        for i in range(handlers_cfg["users"]):
+            account = handlers_cfg["accounts"][i % len(handlers_cfg["accounts"])]
+            tasks.append(start(len(tasks), lambda vu, a=account: handler(
+                vu, a, handlers_cfg, submitted, deadline)))
+        await asyncio.gather(*tasks)
+
+    recorder.finished = time.perf_counter()
+    result = recorder.summary()
+    result["scenario"] = scenario.get("name", "unnamed")
+    result["users"] = {"customers": customers_cfg["users"], "handlers": handlers_cfg["users"]}
+    result["backlog"] = submitted.qsize()
+    return result
+
+
+def print_report(result: dict, out=sys.stdout) -> None:
+    users = result["users"]
+    print(f"Scenario {result['scenario']}: {users['customers']} customers, {users['handlers']} handlers, "
+          f"{result['wall_s']:.1f}s", file=out)
+    print(f"  {result['requests']} requests, {result['rps']:.1f} req/s, "
+          f"{result['errors']} errors ({result['error_rate']:.2%}), "
+          f"{result['backlog']} submitted requests left unhandled", file=out)
+    print(f"\n{'endpoint':<52} {'count':>6} {'req/s':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8} {'err%':>6}",
+          file=out)
+    for name, e in result["endpoints"].items():
+        print(f"{name:<52} {e['count']:>6} {e['rps']:>7.2f} {e['p50_ms']:>7.1f}ms {e['p95_ms']:>7.1f}ms "
+              f"{e['p99_ms']:>7.1f}ms {e['max_ms']:>7.1f}ms {e['error_rate']:>6.1%}", file=out)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Replay the staffing workflow against a running server.")
+    parser.add_argument("scenario", type=Path, help="scenario JSON file")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--duration", type=float, help="override the scenario duration (seconds)")
+    parser.add_argument("--json", type=Path, dest="json_out", help="also write the full report as JSON")
+    args = parser.parse_args(argv)
+
+    scenario = json.loads(args.scenario.read_text(encoding="utf-8"))
+    result = asyncio.run(run_scenario(scenario, args.base_url, args.duration))
+    print_report(result)
+    if args.json_out:
+        args.json_out.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+    return 1 if result["requests"] == 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Minimal benchmark runner: timed cases, JSON baselines and regression checks.
+
+A case is a zero-argument callable plus an optional untimed ``setup`` that runs
+before every repetition (e.g. to reset pending actions). Each case reports the
+min and median of its repetitions; comparisons use the median.
+"""
+
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+
+@dataclass
+class Case:
+    name: str
+    fn: Callable[[], object]
+    setup: Callable[[], object] | None = None
+    repeat: int = 5
+    warmup: int = 1
+
+
+@dataclass
+class Result:
+    name: str
+    repeat: int
+    min_s: float
+    median_s: float
+    samples: list[float] = field(default_factory=list)
+
+
+def time_case(case: Case) -> Result:
+    for _ in range(case.warmup):
+        if case.setup:
+            case.setup()
+        case.fn()
+
+    samples = []
+    for _ in range(case.repeat):
+        if case.setup:
+            case.setup()
+        start = time.perf_counter()
+        case.fn()
+        samples.append(time.perf_counter() - start)
+    return Result(case.name, case.repeat, min(samples), statistics.median(samples), samples)
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def save(results: list[Result], path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": environment(),
+        "results": {
+            r.name: {"repeat": r.repeat, "min_s": r.min_s, "median_s": r.median_s}
+            for r in results
+        },
+    }
+    path.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def load(path: Path) -> dict:
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> tuple[list[str], bool]:
+    """
+    Compare two result files by median.
+
+    Returns printable lines and whether any case is slower than the baseline
+    by more than ``threshold`` (0.10 = 10%).
+    """
+    lines = [f"{'case':<44} {'baseline':>10} {'current':>10} {'change':>8}"]
+    regressed = False
+    base_results = baseline["results"]
+    for name, cur in current["results"].items():
+        base = base_results.get(name)
+        if base is None:
+            lines.append(f"{name:<44} {'—':>10} {_ms(cur['median_s']):>10} {'new':>8}")
+            continue
+        change = cur["median_s"] / base["median_s"] - 1
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressed = True
+        elif change < -threshold:
+            flag = "  faster"
+        lines.append(
+            f"{name:<44} {_ms(base['median_s']):>10} {_ms(cur['median_s']):>10} {change:>+7.1%}{flag}"
+        )
+    for name in sorted(base_results.keys() - current["results"].keys()):
+        lines.append(f"{name:<44} {_ms(base_results[name]['median_s']):>10} {'—':>10} {'not run':>8}")
+    if baseline.get("environment") != current.get("environment"):
+        lines.append("note: baseline was recorded on a different interpreter/platform")
+    return lines, regressed
+
+
+def print_results(results: list[Result], out=sys.stdout) -> None:
+    print(f"{'case':<44} {'min':>10} {'median':>10}  reps", file=out)
+    for r in results:
+        print(f"{r.name:<44} {_ms(r.min_s):>10} {_ms(r.median_s):>10}  {r.repeat}", file=out)
+
+
+def _ms(seconds: float) -> str:
+    return f"{seconds * 1000:.2f}ms"
@@ -0,0 +1,104 @@
+"""
+Throughput scaling across worker processes.
+
+Starts the app under gunicorn with 1, 2, … workers, replays a load-test
+scenario against each, and prints requests per second relative to a single
+worker. Each run gets a fresh SQLite database unless ``--database-url`` points
+at a server (PostgreSQL is what a multi-worker deployment should use: SQLite
+serialises every write behind one file lock).
+
+    python -m benchmarks.scaling benchmarks/scenarios/saturate.json --workers 1 2 4
+
+Run it on a machine with at least as many free cores as the largest worker
+count (the load generator needs a core of its own too); otherwise the workers
+only time-slice the same cores and the table shows no scaling at all.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+from benchmarks.loadtest import run_scenario
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _wait_ready(base_url: str, proc: subprocess.Popen, timeout_s: float = 60) -> None:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with status {proc.returncode}")
+        try:
+            if httpx.get(f"{base_url}/readyz", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError("server did not become ready")
+
+
+def measure(scenario: dict, workers: int, port: int, duration: float | None, database_url: str | None) -> dict:
+    """One load-test run against ``workers`` gunicorn workers."""
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "APP_ENV": "benchmark",
+            "DATABASE_URL": database_url or f"sqlite:///{tmp}/scaling.db",
+            "WEB_CONCURRENCY": str(workers),
+            "PORT": str(port),
+        }
+        subprocess.run([sys.executable, "-m", "backend.prestart"], cwd=ROOT, env=env, check=True)
+        proc = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "backend.main:app"],
+            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            base_url = f"http://127.0.0.1:{port}"
+            _wait_ready(base_url, proc)
+            return asyncio.run(run_scenario(scenario, base_url, duration))
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure throughput for increasing worker counts.")
+    parser.add_argument("scenario", type=Path, help="scenario JSON file")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--duration", type=float, help="override the scenario duration (seconds)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--database-url", help="use this database instead of a fresh SQLite file per run")
+    parser.add_argument("--json", type=Path, dest="json_out", help="also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    scenario = json.loads(args.scenario.read_text(encoding="utf-8"))
+    print(f"{os.cpu_count()} CPUs available", file=sys.stderr)
+    rows = []
+    for workers in args.workers:
+        result = measure(scenario, workers, args.port, args.duration, args.database_url)
+        rows.append({"workers": workers, "rps": result["rps"], "requests": result["requests"],
+                     "error_rate": result["error_rate"]})
+        print(f"  {workers} worker(s): {result['rps']:.1f} req/s", file=sys.stderr)
+
+    base = rows[0]["rps"] or 1.0
+    print(f"{'workers':>7} {'req/s':>9} {'speedup':>8} {'efficiency':>10} {'err%':>6}")
+    for row in rows:
+        speedup = row["rps"] / base
+        efficiency = speedup * rows[0]["workers"] / row["workers"]
+        print(f"{row['workers']:>7} {row['rps']:>9.1f} {speedup:>7.2f}x {efficiency:>10.0%} {row['error_rate']:>6.1%}")
+    if args.json_out:
+        args.json_out.write_text(json.dumps({"cpus": os.cpu_count(), "runs": rows}, indent=2) + "\n",
+                                 encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+Cold-start check: time from launching the server to ``/readyz`` answering 200.
+
+    python -m benchmarks.startup --budget 5
+
+Starts ``uvicorn backend.main:app`` twice: on a fresh SQLite database (tables
+created and demo data seeded), then again on the now-existing one (a normal
+restart). Prints the wall time and the server's own phase report for each,
+and exits with status 1 when either run exceeds the budget.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def cold_start(database_url: str, port: int, timeout_s: float = 60) -> tuple[float, dict]:
+    """Seconds until /readyz returns 200, and the startup report it carries."""
+    env = {**os.environ, "APP_ENV": "benchmark", "DATABASE_URL": database_url}
+    started = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    try:
+        while time.perf_counter() - started < timeout_s:
+            if proc.poll() is not None:
+                raise RuntimeError(f"server exited with status {proc.returncode}")
+            try:
+                response = httpx.get(f"http://127.0.0.1:{port}/readyz", timeout=1.0)
+                if response.status_code == 200:
+                    return time.perf_counter() - started, response.json()["startup"]
+            except httpx.HTTPError:
+                pass
+            time.sleep(0.02)
+        raise RuntimeError("server did not become ready")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=30)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Measure cold start to ready against a budget.")
+    parser.add_argument("--budget", type=float, default=5.0, help="seconds allowed per start (default 5)")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args(argv)
+
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = f"sqlite:///{tmp}/startup.db"
+        for label in ("fresh database", "restart"):
+            elapsed, report = cold_start(database_url, args.port)
+            phases = ", ".join(f"{name} {seconds * 1000:.0f}ms" for name, seconds in report["phases"].items())
+            status = "ok" if elapsed <= args.budget else f"OVER BUDGET ({args.budget:.1f}s)"
+            print(f"{label:<15} {elapsed:6.2f}s  {status}\n    {phases}")
+            failed |= elapsed > args.budget
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,6 +4,8 @@
 
 const API = '';
 let TOKEN = null;
+let REFRESH = null;  // only issued with signed access tokens
+let REFRESH_INFLIGHT = null;
 let ROLE = null;
 let USER = null;
 let NOTIF_INTERVAL = null;
@@ -11,13 +13,23 @@ let NOTIF_INTERVAL = null;
 /* ── Helpers ─── */
 const $ = (s, p = document) => p.querySelector(s);
 const $$ = (s, p = document) => [...p.querySelectorAll(s)];
-const api = async (path, opts = {}) => {
+const api = async (path, opts = {}, retry = true) => {
     const h = { 'Content-Type': 'application/json', ...(opts.headers || {}) };
     if (TOKEN) h['Authorization'] = `Bearer ${TOKEN}`;
     const r = await fetch(API + path, { ...opts, headers: h });
+    if (r.status === 401 && retry && REFRESH && await refreshTokens()) return api(path, opts, false);
     if (!r.ok) { const e = await r.json().catch(() => ({})); throw new Error(e.detail || r.statusText); }
     return r.json();
 };
+// Concurrent 401s share one refresh; the refresh token is rotated each time
+const refreshTokens = () => REFRESH_INFLIGHT ||= fetch(API + '/api/auth/refresh', {
+    method: 'POST', headers: { 'Content-Type': 'application/json' }, body: JSON.stringify({ refresh_token: REFRESH })
+}).then(async r => {
+    if (!r.ok) return false;
+    const d = await r.json();
+    TOKEN = d.token; REFRESH = d.refresh_token;
+    return true;
+}).catch(() => false).finally(() => { REFRESH_INFLIGHT = null; });
 const fmtDate = d => d ? new Date(d).toLocaleDateString('sv-SE') : '—';
 const fmtTime = d => { if (!d) return ''; const x = new Date(d), n = Date.now() - x.getTime(); if (n < 3600000) return `${Math.floor(n / 60000)} min sedan`; if (n < 86400000) return `${Math.floor(n / 3600000)}h sedan`; return x.toLocaleDateString('sv-SE'); };
 const toast = (msg, type = 'success') => {
@@ -32,6 +44,27 @@ const toast = (msg, type = 'success') => {
 const statusLabel = s => ({ submitted: 'Inskickad', assessed: 'Bedömd', in_progress: 'Pågående', completed: 'Klar', cancelled: 'Avbruten' }[s] || s);
 const statusBadge = s => `<span class="badge badge-${s === 'in_progress' ? 'progress' : s}">${statusLabel(s)}</span>`;
 
+/* ── Local store (delta sync) ─── */
+const SYNC_ENTITIES = ['requests', 'assessments', 'assignments', 'timeline', 'notifications'];
+const STORE = { cursor: 0 };
+SYNC_ENTITIES.forEach(k => STORE[k] = new Map());
+let SYNC_INFLIGHT = null;
+const resetStore = () => { STORE.cursor = 0; SYNC_ENTITIES.forEach(k => STORE[k].clear()); };
+const storeList = k => [...STORE[k].values()].sort((a, b) => new Date(b.created_at) - new Date(a.created_at));
+async function pullChanges() {
+    let more = true;
+    while (more) {
+        const d = await api(`/api/sync?since=${STORE.cursor}`);
+        if (d.full) SYNC_ENTITIES.forEach(k => STORE[k].clear());
+        SYNC_ENTITIES.forEach(k => d[k].forEach(x => STORE[k].set(x.id, x)));
+        d.deleted.forEach(x => STORE[x.entity]?.delete(x.id));
+        STORE.cursor = d.cursor;
+        more = d.has_more;
+    }
+}
+// Concurrent callers share one round of requests
+const syncStore = () => SYNC_INFLIGHT ||= pullChanges().finally(() => { SYNC_INFLIGHT = null; });
+
 /* ═══════════════════════════════════════════════════
    AUTH
    ═══════════════════════════════════════════════════ */
@@ -50,6 +83,7 @@ $('#login-form').addEventListener('submit', async e => {
             body: JSON.stringify({ email: $('#login-email').value, password: $('#login-password').value })
         });
         TOKEN = data.token;
+        REFRESH = data.refresh_token || null;
         ROLE = data.user.role;
         USER = data.user;
         enterApp();
@@ -69,7 +103,8 @@ function enterApp() {
 }
 
 function logout() {
-    TOKEN = null; ROLE = null; USER = null;
+    TOKEN = null; REFRESH = null; ROLE = null; USER = null;
+    resetStore();
     clearInterval(NOTIF_INTERVAL);
     $$('.view').forEach(v => v.classList.remove('active'));
     $('#view-login').classList.add('active');
@@ -207,7 +242,8 @@ async function loadDashboard() {
 
 async function loadOverviewRequests() {
     try {
-        const reqs = await api('/api/requests');
+        await syncStore();
+        const reqs = storeList('requests');
         const recent = reqs.slice(0, 5);
         const cont = $('#overview-requests');
         if (!recent.length) { cont.innerHTML = '<div class="empty-state-sm">Inga förfrågningar ännu</div>'; return; }
@@ -220,7 +256,8 @@ async function loadOverviewRequests() {
 
 async function loadActivityFeed() {
     try {
-        const notifs = await api('/api/notifications');
+        await syncStore();
+        const notifs = storeList('notifications');
         const feed = $('#activity-feed');
         if (!notifs.length) { feed.innerHTML = '<div class="empty-state-sm">Inga aktiviteter ännu</div>'; return; }
         feed.innerHTML = notifs.slice(0, 10).map(n => `
@@ -238,7 +275,8 @@ async function loadActivityFeed() {
 /* ── All Requests ─── */
 async function loadAllRequests(filter = 'all') {
     try {
-        const reqs = await api('/api/requests');
+        await syncStore();
+        const reqs = storeList('requests');
         let filtered = reqs;
         if (filter !== 'all') filtered = reqs.filter(r => r.status === filter);
         const cont = $('#all-requests');
@@ -304,6 +342,8 @@ async function openRequestDetail(id) {
                             </div>
                             <div class="match-title">${m.title || ''}</div>
                             <div class="match-skills">${(m.skills || []).map(s => `<span class="skill-tag">${s}</span>`).join('')}</div>
+                            ${ROLE !== 'customer' && (m.compliance_issues || []).length ? `
+                            <div class="match-compliance">${m.compliance_issues.map(i => `<span class="compliance-badge compliance-${i.severity}" title="${i.message}">${i.severity === 'blocking' ? '🚫' : '⚠️'} ${i.message}</span>`).join('')}</div>` : ''}
                             ${ROLE !== 'customer' ? `
                             <div class="match-actions">
                                 <button class="btn-primary btn-sm" onclick="assignConsultant('${id}', '${m.id}')">Tilldela</button>
@@ -579,7 +619,8 @@ function togglePanel(id) {
 
 async function loadNotifications() {
     try {
-        const notifs = await api('/api/notifications');
+        await syncStore();
+        const notifs = storeList('notifications').slice(0, 50);
         const unread = notifs.filter(n => !n.is_read).length;
 
         // Update badges
@@ -0,0 +1,37 @@
+"""
+Gunicorn settings for the multi-worker deployment (see README → Deployment).
+
+    python -m backend.prestart && gunicorn -c gunicorn.conf.py backend.main:app
+
+Reads the environment directly: the master must not import the app, so each
+forked worker builds its own engine, settings and background threads.
+"""
+
+import os
+from pathlib import Path
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", "1"))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = 30
+keepalive = 5
+
+# Restart workers now and then so slow leaks cannot accumulate
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
+
+# init_db/seed already ran in `python -m backend.prestart`
+raw_env = ["PRESTART_IN_LIFESPAN=false"]
+
+accesslog = "-"
+errorlog = "-"
+
+
+def child_exit(server, worker):
+    """Drop an exited worker's metrics dump so /metrics stops adding it in (see backend/metrics.py)."""
+    directory = os.environ.get("METRICS_MULTIPROC_DIR")
+    if directory:
+        for suffix in (".json", ".tmp"):
+            Path(directory, f"{worker.pid}{suffix}").unlink(missing_ok=True)
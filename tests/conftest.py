@@ -0,0 +1,24 @@
+"""Shared fixtures: the app against a throwaway, seeded SQLite database."""
+
+import os
+import tempfile
+
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/test.db"
+os.environ.setdefault("APP_ENV", "test")
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture
+def handler_headers(client):
+    r = client.post("/api/auth/login", json={"email": "handler@intelliplan.se", "password": "handler123"})
+    return {"Authorization": f"Bearer {r.json()['token']}"}
@@ -0,0 +1,20 @@
+"""Business-day arithmetic at and beyond the edges of the holiday table."""
+
+from datetime import date
+
+from backend.services.business_days import MAX_YEAR, BusinessCalendar
+
+
+def test_far_dates_count_weekdays_without_growing_the_table():
+    calendar = BusinessCalendar(2015, 2045)
+    assert calendar.business_days_between(date(9999, 12, 27), date(9999, 12, 31)) == 4
+    assert calendar.is_business_day(date(9999, 12, 31))
+    assert calendar._table[2] == MAX_YEAR
+
+
+def test_count_is_additive_across_the_table_edge():
+    calendar = BusinessCalendar(2015, 2045)
+    start, edge, end = date(MAX_YEAR - 1, 6, 1), date(MAX_YEAR + 1, 1, 1), date(MAX_YEAR + 3, 6, 1)
+    assert calendar.business_days_between(start, end) == (
+        calendar.business_days_between(start, edge) + calendar.business_days_between(edge, end)
+    )
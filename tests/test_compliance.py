@@ -0,0 +1,68 @@
+"""Compliance checks read the rules of the caller's database."""
+
+import json
+
+from backend.models import ComplianceRule, Consultant
+from backend.services.compliance import compliance_engine
+from benchmarks.fixtures import add_consultants, add_customers, add_request, memory_session
+
+
+def test_rules_come_from_the_callers_database():
+    db = memory_session()
+    try:
+        request = add_request(db, add_customers(db, 1)[0])
+        add_consultants(db, 20)
+        db.add(ComplianceRule(
+            name="Strict Budget", condition=json.dumps({"min_budget_ratio": 50}), severity="blocking",
+        ))
+        db.commit()
+
+        result = compliance_engine.check_request(request, db.query(Consultant).all(), db)
+        assert any(v.startswith("Strict Budget:") for v in result["violations"])
+        assert "Strict Budget" in {r.name for r in compliance_engine.rules_for(db)}
+        assert "Strict Budget" not in {r.name for r in compliance_engine.rules}
+    finally:
+        db.close()
+        db.get_bind().dispose()
+
+
+def _candidate_issues(db, rules):
+    request = add_request(db, add_customers(db, 1)[0])
+    add_consultants(db, 200)
+    db.add_all(rules)
+    db.commit()
+    consultants = db.query(Consultant).all()
+    return consultants, compliance_engine.check_assignments(request, consultants, db=db)
+
+
+def test_candidate_checks_follow_the_rule_table():
+    db = memory_session()
+    try:
+        consultants, results = _candidate_issues(db, [
+            ComplianceRule(name="Availability", condition=json.dumps({"require_available": True}), is_active=False),
+            ComplianceRule(name="Rates", condition=json.dumps({"min_budget_ratio": 0.5}), severity="blocking"),
+        ])
+        issues = [issue for result in results for issue in result["issues"]]
+        assert not [i for i in issues if i["rule"] == "availability"]  # deactivated
+        over_budget = [c.hourly_rate > 1100 for c in consultants]
+        assert any(over_budget)
+        assert [not r["compliant"] for r in results] == over_budget  # rate issues now block
+        assert {i["severity"] for i in issues if i["rule"] == "rate_cap"} == {"blocking"}
+    finally:
+        db.close()
+        db.get_bind().dispose()
+
+
+def test_built_in_candidate_checks_without_table_rows():
+    db = memory_session()
+    try:
+        consultants, results = _candidate_issues(db, [])
+        for consultant, result in zip(consultants, results):
+            kinds = {i["rule"]: i["severity"] for i in result["issues"]}
+            unavailable = consultant.status.name in ("ASSIGNED", "ON_LEAVE")
+            assert (kinds.get("availability") == "blocking") == unavailable
+            assert ("rate_cap" in kinds) == (consultant.hourly_rate > 1100)
+            assert result["compliant"] == (not unavailable)
+    finally:
+        db.close()
+        db.get_bind().dispose()
@@ -0,0 +1,13 @@
+"""Accept-Encoding negotiation."""
+
+from backend.middleware import accepted_encoding
+
+
+def test_q_zero_rules_an_encoding_out():
+    assert accepted_encoding("br;q=0, gzip") == "gzip"
+    assert accepted_encoding("gzip;q=0") is None
+
+
+def test_higher_q_wins():
+    assert accepted_encoding("gzip;q=0.9, br;q=0.5") == "gzip"
+    assert accepted_encoding("*;q=0, identity") is None
@@ -0,0 +1,25 @@
+"""Merged multi-worker metrics."""
+
+import json
+import os
+import subprocess
+import sys
+
+from backend.metrics import Registry
+
+
+def _dump(directory, pid: int, jobs: int) -> None:
+    worker = Registry()
+    worker.counter("jobs_total", "Jobs").inc(jobs)
+    (directory / f"{pid}.json").write_text(json.dumps({"jobs_total": worker._metrics["jobs_total"].snapshot()}))
+
+
+def test_dead_workers_dumps_are_skipped_and_removed(tmp_path):
+    exited = subprocess.run([sys.executable, "-c", "import os; print(os.getpid())"], capture_output=True, text=True)
+    _dump(tmp_path, int(exited.stdout), 5)
+    _dump(tmp_path, os.getppid(), 2)  # a live worker
+
+    merged = Registry()
+    merged.counter("jobs_total", "Jobs")
+    assert "jobs_total 2" in merged.render_merged(str(tmp_path))
+    assert sorted(p.name for p in tmp_path.iterdir()) == [f"{os.getppid()}.json"]
@@ -0,0 +1,43 @@
+"""The profiler only samples the event loop while the profiled request's coroutine runs."""
+
+import asyncio
+import sys
+import time
+
+from backend.profiling import RequestProfile
+
+
+def _spin(seconds: float) -> None:
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+async def _profiled(profile: RequestProfile) -> None:
+    profile.enter_thread(anchor=sys._getframe())
+    try:
+        for _ in range(5):
+            _spin(0.01)
+            await asyncio.sleep(0)
+    finally:
+        profile.leave_thread()
+
+
+async def _other_request() -> None:
+    for _ in range(5):
+        _spin(0.01)
+        await asyncio.sleep(0)
+
+
+def test_other_tasks_on_the_loop_are_not_attributed():
+    async def main():
+        await asyncio.gather(_profiled(profile), _other_request())
+
+    profile = RequestProfile("GET", "/api/x", sample_rate=1000)
+    profile.start()
+    asyncio.run(main())
+    profile.stop()
+
+    assert profile.stacks and profile.foreign_samples
+    assert all("_profiled" in stack for stack in profile.stacks)
+    assert not any("_other_request" in stack for stack in profile.stacks)
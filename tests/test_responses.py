@@ -0,0 +1,44 @@
+"""JSONText columns only hold well-formed JSON, so json_text can splice them unparsed."""
+
+import orjson
+from sqlalchemy import text
+
+from backend.database import _repair_json_text
+from backend.models import StaffingRequest
+from backend.responses import json_text
+from benchmarks.fixtures import add_customers, add_request, memory_session
+
+
+def test_well_formed_text_is_embedded_as_json():
+    assert orjson.loads(orjson.dumps({"v": json_text('["python", "java"]')})) == {"v": ["python", "java"]}
+
+
+def test_malformed_text_is_encoded_on_write():
+    db = memory_session()
+    try:
+        add_request(db, add_customers(db, 1)[0])
+        request = db.get(StaffingRequest, "req-bench")
+        request.required_skills = "[python, java"
+        db.commit()
+
+        stored = db.execute(text("SELECT required_skills FROM staffing_requests")).scalar_one()
+        assert orjson.loads(stored) == ["[python, java"]
+        assert orjson.loads(orjson.dumps({"v": json_text(stored, wrap_invalid=True)})) == {"v": ["[python, java"]}
+    finally:
+        db.close()
+        db.get_bind().dispose()
+
+
+def test_legacy_rows_are_repaired():
+    db = memory_session()
+    try:
+        add_request(db, add_customers(db, 1)[0])
+        db.execute(text("UPDATE staffing_requests SET required_skills = '{oops'"))
+        db.commit()
+
+        _repair_json_text(db.get_bind())
+        stored = db.execute(text("SELECT required_skills FROM staffing_requests")).scalar_one()
+        assert orjson.loads(stored) == ["{oops"]
+    finally:
+        db.close()
+        db.get_bind().dispose()
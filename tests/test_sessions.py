@@ -0,0 +1,43 @@
+"""Logouts and role changes reach the session cache of every worker."""
+
+from sqlalchemy import select
+
+from backend.database import SessionLocal
+from backend.models import User, UserRole
+from backend.sessions import MemorySessionBackend, SessionInvalidations, SessionStore
+
+
+def _workers(count: int = 2) -> list[SessionStore]:
+    backend = MemorySessionBackend()  # stands in for the shared database/redis backend
+    return [SessionStore(backend, 3600, 10, invalidations=SessionInvalidations(0, 10)) for _ in range(count)]
+
+
+def test_logout_on_one_worker_ends_the_cached_session_on_another(client):
+    a, b = _workers()
+    db = SessionLocal()
+    try:
+        user = db.scalars(select(User).where(User.email == "handler@intelliplan.se")).one()
+        token = a.create(user)
+        assert b.resolve(db, token).id == user.id  # now cached on b
+
+        a.revoke(token)
+        assert b.resolve(db, token) is None
+    finally:
+        db.close()
+
+
+def test_role_change_reloads_the_cached_user_on_other_workers(client):
+    (b,) = _workers(1)
+    db = SessionLocal()
+    try:
+        user = db.scalars(select(User).where(User.email == "handler@intelliplan.se")).one()
+        token = b.create(user)
+        assert b.resolve(db, token).role == UserRole.HANDLER
+
+        user.role = UserRole.CUSTOMER
+        db.commit()  # published by the commit hook of this process' store
+        assert b.resolve(db, token).role == UserRole.CUSTOMER
+    finally:
+        user.role = UserRole.HANDLER
+        db.commit()
+        db.close()
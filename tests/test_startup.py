@@ -0,0 +1,74 @@
+"""
+Cold start to ready, kept under a budget.
+
+The app's startup state lives in module singletons, so the cold start runs in
+a fresh interpreter: this file re-runs itself as a script against a temporary
+SQLite database and reports back as JSON.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+STARTUP_BUDGET_S = 5.0
+GATE = "test.gate"  # warm-up task holding readiness back until the test has probed /readyz
+
+
+def test_cold_start_is_ready_within_budget():
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ, "APP_ENV": "test", "DATABASE_URL": f"sqlite:///{tmp}/startup.db",
+            "PYTHONPATH": str(ROOT),
+        }
+        proc = subprocess.run(
+            [sys.executable, __file__], cwd=ROOT, env=env, capture_output=True, text=True, timeout=120,
+        )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    assert result["healthz"] == 200
+    assert result["readyz_before_ready"] == 503
+    assert result["readyz"] == 200
+    assert not result["startup"]["failed"]
+    phases = dict(result["startup"]["phases"])
+    gate_s = phases.pop(f"warmup.{GATE}")
+    assert sum(phases.values()) < STARTUP_BUDGET_S, phases
+    assert result["wall_s"] - gate_s < STARTUP_BUDGET_S, result["wall_s"]
+
+
+def _cold_start() -> dict:
+    import threading
+    import time
+
+    started = time.perf_counter()
+    from fastapi.testclient import TestClient
+
+    from backend.main import app
+    from backend.warmup import warmup_task
+
+    gate = threading.Event()
+    warmup_task(GATE)(lambda: gate.wait(30))
+
+    with TestClient(app) as client:
+        result = {
+            "healthz": client.get("/healthz").status_code,
+            "readyz_before_ready": client.get("/readyz").status_code,
+        }
+        gate.set()
+        deadline = time.perf_counter() + 60
+        response = client.get("/readyz")
+        while response.status_code != 200 and time.perf_counter() < deadline:
+            time.sleep(0.01)
+            response = client.get("/readyz")
+        result["readyz"] = response.status_code
+        result["startup"] = response.json().get("startup", {})
+        result["wall_s"] = time.perf_counter() - started
+    return result
+
+
+if __name__ == "__main__":
+    print(json.dumps(_cold_start()))
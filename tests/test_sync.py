@@ -0,0 +1,60 @@
+"""Delta sync must report every change the SPA's local store depends on."""
+
+
+def test_mark_all_read_reaches_delta_sync(client, handler_headers):
+    cursor = client.get("/api/sync", headers=handler_headers).json()["cursor"]
+    unread = [
+        n["id"] for n in client.get("/api/notifications", headers=handler_headers).json()
+        if not n["is_read"]
+    ]
+    assert unread, "seed data should leave the handler unread notifications"
+
+    assert client.post("/api/notifications/mark-all-read", headers=handler_headers).status_code == 200
+
+    changes = client.get("/api/sync", params={"since": cursor}, headers=handler_headers).json()
+    synced = {n["id"]: n["is_read"] for n in changes["notifications"]}
+    assert set(unread) <= set(synced)
+    assert all(synced[nid] for nid in unread)
+    assert client.get("/api/notifications/unread-count", headers=handler_headers).json() == {"count": 0}
+
+
+def test_cursor_never_skips_a_change_committed_out_of_order(client, handler_headers):
+    """Transaction A logs a change first but commits last; B must not become visible before it."""
+    import threading
+
+    from backend.database import SessionLocal
+    from backend.models import Notification
+
+    def sync(since):
+        return client.get("/api/sync", params={"since": since}, headers=handler_headers).json()
+
+    cursor = client.get("/api/sync", headers=handler_headers).json()["cursor"]
+    first = SessionLocal()
+    first.add(Notification(id="interleaved-a", user_id="user-handler-1", title="A", message="first"))
+    first.flush()  # change_log row written, transaction still open
+
+    b_committed = threading.Event()
+
+    def write_second():
+        db = SessionLocal()
+        try:
+            db.add(Notification(id="interleaved-b", user_id="user-handler-1", title="B", message="second"))
+            db.commit()
+            b_committed.set()
+        finally:
+            db.close()
+
+    second = threading.Thread(target=write_second)
+    second.start()
+    # B waits for A: it may not commit a change_log row while A's is pending
+    assert not b_committed.wait(0.5)
+    mid = sync(cursor)
+    assert not {n["id"] for n in mid["notifications"]} & {"interleaved-a", "interleaved-b"}
+
+    first.commit()
+    first.close()
+    second.join(5)
+    assert b_committed.is_set()
+
+    seen = {n["id"] for n in sync(mid["cursor"])["notifications"]}
+    assert {"interleaved-a", "interleaved-b"} <= seen